@@ -1,7 +1,9 @@
 from flask import Flask
 from app.config import Config
+import click
 from flask_jwt_extended import JWTManager
 import datetime
+import time
 
 from flask_cors import CORS
 
@@ -10,28 +12,111 @@ if sys.version_info >= (3, 13):
     import warnings
     warnings.filterwarnings("ignore", category=DeprecationWarning)
 
-from app.extensions import db, migrate
+from app.extensions import db, migrate, sock, cache
 
 jwt = JWTManager()
 
-def create_app():
+def _elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000.0, 2)
+
+def _call_with_app(config_overrides, func, args):
+    # Dijalankan di proses anak, lihat run_in_fresh_app
+    return func(create_app(config_overrides), *args)
+
+
+def run_in_fresh_app(config_overrides, func, *args):
+    """Jalankan `func(app_baru, *args)` di proses Python terpisah dan kembalikan hasilnya.
+
+    create_app() memanggil init_app() pada singleton tingkat modul (cache,
+    media_store, vocab_cache, video/image_ingestor, engine AI, ...). App kedua
+    di proses yang sama akan mengikat ulang semuanya ke konfigurasi sementara,
+    jadi perintah CLI yang butuh app dengan database lain memakai ini.
+    Hasil `func` harus bisa di-pickle.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return executor.submit(_call_with_app, config_overrides, func, args).result()
+
+
+def _bench_client(bench_app, corpus, levels, total):
+    """ai-bench --target client (di proses anak): {(imgsz, concurrency): baris laporan}."""
+    from app.services import ai_benchmark
+    from app.services.ai_engine import engine
+    from app.models.kosa_kata_model import KosaKata
+
+    with bench_app.app_context():
+        db.create_all()
+        if not engine.warmup(bench_app.config, timeout=bench_app.config["AI_WARMUP_TIMEOUT"]):
+            raise click.ClickException(f"Model gagal dimuat: {engine.error}")
+        names = getattr(engine.model, "names", None) or {}
+        existing = {k.text for k in KosaKata.query.all()}
+        for label in names.values():
+            if label not in existing:
+                db.session.add(KosaKata(text=label, video_file_path=f"/static/videos/{label}.mp4"))
+        db.session.commit()
+
+    send = ai_benchmark.client_sender(bench_app)
+    pids = getattr(engine.workers, "pids", [])
+    return {
+        (size, level): ai_benchmark.run_load(send, payloads, level, total, meter=ai_benchmark.ResourceMeter(pids))
+        for size, payloads in corpus.items() for level in levels
+    }
+
+
+def create_app(config_overrides=None):
+    # Rincian waktu startup, dilaporkan lewat GET /api/ai/ready
+    startup = {}
+    started = time.perf_counter()
+
     app = Flask(__name__)
     app.config.from_object(Config)
+    if config_overrides:
+        app.config.update(config_overrides)
 
     app.config["JWT_SECRET_KEY"] = app.config["SECRET_KEY"]
     app.config["JWT_ACCESS_TOKEN_EXPIRES"] = datetime.timedelta(hours=8)
     
+    step = time.perf_counter()
     jwt.init_app(app)
 
+    from app.services import db_routing
+    db_routing.configure(app)
     db.init_app(app)
     migrate.init_app(app, db)
+    sock.init_app(app)
+    cache.init_app(app)
+
+    from app.services.vocab_cache import vocab_cache
+    vocab_cache.init_app(app)
+
+    from app.services import query_counter
+    query_counter.init_app(app)
+
+    from app.services.auth import roles
+    roles.init_app(app)
+
+    from app.services.video_ingest import video_ingestor
+    video_ingestor.init_app(app)
+
+    from app.services.image_ingest import image_ingestor
+    image_ingestor.init_app(app)
+
+    from app.services import media, uploads
+    from app.services.media_store import media_store
+    media.init_app(app)
+    uploads.init_app(app)
+    media_store.init_app(app)
 
     CORS(app,
         resources={r"/api/*": {"origins": ["*","http://localhost:3000"]}},
         supports_credentials=True,
         allow_headers=["Content-Type", "Authorization"],
         methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"])
+    startup['extensions_ms'] = _elapsed_ms(step)
 
+    step = time.perf_counter()
     from app.routes.user_routes import user_bp
     app.register_blueprint(user_bp, url_prefix='/api/users')
     
@@ -47,6 +132,13 @@ def create_app():
     from app.routes.information_routes import information_bp
     app.register_blueprint(information_bp, url_prefix='/api/information')
 
+    from app.routes.stats_routes import stats_bp
+    app.register_blueprint(stats_bp, url_prefix='/api/stats')
+
+    from app.services.dashboard_stats import dashboard_stats
+    dashboard_stats.init_app(app)
+    startup['blueprints_ms'] = _elapsed_ms(step)
+
     @app.cli.command("create-db")
     def create_db_command():
         """Membuat tabel database."""
@@ -54,8 +146,289 @@ def create_app():
             from app.models.user_model import User
             from app.models.kosa_kata_model import KosaKata
             from app.models.information_model import Information
+            from app.models.cache_version_model import CacheVersion
+            from app.models.role_revocation_model import RoleRevocation
+            from app.models.transcription_job_model import TranscriptionJob
             
             db.create_all()
         print("Database tables created!")
 
+    @app.cli.command("video-ingest")
+    @click.option("--id", "item_id", type=int, default=None, help="Hanya kosa kata dengan ID ini.")
+    @click.option("--retry-failed", is_flag=True, help="Ulangi juga video yang sebelumnya gagal.")
+    def video_ingest_command(item_id, retry_failed):
+        """Transcode video kosa kata yang belum diproses (upload lama / server restart saat proses)."""
+        from app.models.kosa_kata_model import KosaKata
+        from app.services.video_ingest import FAILED, PROCESSING, video_ingestor
+
+        if not video_ingestor.enabled:
+            raise click.ClickException(f"Transcoding nonaktif (VIDEO_TRANSCODE / {app.config['FFMPEG_BIN']} tidak ditemukan)")
+        statuses = [PROCESSING] + ([FAILED] if retry_failed else [])
+        query = KosaKata.query.filter(db.or_(KosaKata.video_status.is_(None), KosaKata.video_status.in_(statuses)))
+        if item_id is not None:
+            query = KosaKata.query.filter_by(id=item_id)
+        for item_id, video_url in [(item.id, item.video_file_path) for item in query.order_by(KosaKata.id)]:
+            started = time.perf_counter()
+            status = video_ingestor.process(item_id, video_url)
+            print(f"  #{item_id:<5} {status or 'dilewati':<10} {_elapsed_ms(started):>10} ms  {video_url}")
+
+    @app.cli.command("image-ingest")
+    def image_ingest_command():
+        """Buat thumbnail foto profil & gambar informasi yang belum diproses (upload lama)."""
+        from app.models.information_model import Information
+        from app.models.user_model import User
+        from app.services.image_ingest import image_ingestor
+
+        if not image_ingestor.enabled:
+            raise click.ClickException("Thumbnail gambar nonaktif (IMAGE_THUMBNAILS)")
+        print(f"Format: {', '.join(image_ingestor.formats)}")
+        for collection, url_column, variants_column in (
+                ("foto_profile", User.profile_pic_url, User.profile_pic_variants),
+                ("info_images", Information.image_url, Information.image_variants)):
+            query = db.session.query(url_column).filter(url_column.isnot(None), variants_column.is_(None)).distinct()
+            for url in sorted(url for url, in query):
+                started = time.perf_counter()
+                ok = image_ingestor.process(collection, url)
+                print(f"  {collection:<13} {'ok' if ok else 'dilewati':<9} {_elapsed_ms(started):>9} ms  {url}")
+
+    @app.cli.command("media-gc")
+    @click.option("--dry-run", is_flag=True, help="Hanya laporkan, jangan hapus apa pun.")
+    @click.option("--min-age", type=int, default=None, help="Umur minimal file yatim dalam detik (default: MEDIA_GC_MIN_AGE).")
+    @click.option("--verbose", is_flag=True, help="Tampilkan semua file yatim dan file yang hilang.")
+    def media_gc_command(dry_run, min_age, verbose):
+        """Hapus file media yang tidak lagi dirujuk database dan laporkan byte yang dibebaskan."""
+        from app.services.media_store import media_store
+
+        report = media_store.collect_garbage(dry_run=dry_run, min_age=min_age)
+        mb = 1024 * 1024
+        print(f"  Diperiksa   {report['scanned_files']:>7} file  {report['scanned_bytes'] / mb:>10.1f} MB")
+        print(f"  Dirujuk DB  {report['referenced_files']:>7} file")
+        print(f"  Yatim       {report['orphan_files']:>7} file  {report['reclaimed_bytes'] / mb:>10.1f} MB")
+        print(f"  Masih baru  {report['skipped_recent']:>7} file  (< {min_age if min_age is not None else media_store.min_age} detik, dilewati)")
+        if verbose:
+            for rel in report['orphans']:
+                print(f"    yatim   {rel}")
+            for rel in report['missing']:
+                print(f"    hilang  {rel}")
+        if report['missing']:
+            print(f"PERINGATAN: {len(report['missing'])} file dirujuk database tetapi tidak ada di disk")
+        action = "akan dibebaskan (dry run)" if dry_run else "dibebaskan"
+        print(f"{report['reclaimed_bytes']} byte {action}, {report['removed_dirs']} folder kosong dihapus.")
+
+    @app.cli.command("check-query-scaling")
+    @click.option("--sizes", default="5,50", help="Jumlah baris per tabel yang diuji, dipisah koma.")
+    def check_query_scaling_command(sizes):
+        """Pastikan jumlah query endpoint list tidak naik bersama jumlah baris (deteksi N+1)."""
+        import os
+        import tempfile
+        from app.services.query_counter import check_query_scaling
+
+        path = os.path.join(tempfile.mkdtemp(prefix="bahasaku_queries_"), "check.sqlite")
+        size_list = [int(v) for v in sizes.split(",") if v.strip()]
+
+        # App dengan SQLite sementara dibuat di proses terpisah agar singleton app ini tidak ikut berubah
+        results, problems = run_in_fresh_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}", "QUERY_COUNTER": True, "CACHE_BACKEND": "null", "DATABASE_REPLICA_URLS": [], "AI_WARMUP_ON_START": False},
+                                             check_query_scaling, size_list)
+        for endpoint, counts in results.items():
+            print(f"  {endpoint:<28} " + "  ".join(f"{size} baris: {count} query" for size, count in zip(size_list, counts)))
+        if problems:
+            for problem in problems:
+                print(f"N+1: {problem}")
+            raise SystemExit(1)
+        print("Jumlah query semua endpoint konstan.")
+
+    @app.cli.command("check-query-plans")
+    @click.option("--rows", type=int, default=500, help="Jumlah baris per tabel yang diisi sebelum EXPLAIN.")
+    @click.option("--database-url", default=None, help="Database KOSONG untuk diuji (default: SQLite sementara).")
+    @click.option("--verbose", is_flag=True, help="Tampilkan plan semua query, bukan hanya yang bermasalah.")
+    def check_query_plans_command(rows, database_url, verbose):
+        """EXPLAIN query utama tiap route dan tandai full table scan."""
+        import os
+        import tempfile
+        from app.services.query_plan import check_query_plans, format_plans
+
+        if not database_url:
+            path = os.path.join(tempfile.mkdtemp(prefix="bahasaku_plans_"), "plans.sqlite")
+            database_url = f"sqlite:///{path}"
+        report = run_in_fresh_app({"SQLALCHEMY_DATABASE_URI": database_url, "CACHE_BACKEND": "null", "DATABASE_REPLICA_URLS": [], "AI_WARMUP_ON_START": False},
+                                  check_query_plans, rows)
+        print(format_plans(report, verbose))
+        if any(entry.get("problems") or any(query["problems"] for query in entry["queries"]) for entry in report):
+            raise SystemExit(1)
+        print("Tidak ada full table scan pada query yang difilter/diurutkan.")
+
+    @app.cli.command("ai-warmup")
+    def ai_warmup_command():
+        """Muat & panaskan model, lalu tampilkan rincian waktunya."""
+        from app.services.ai_engine import engine
+
+        from app.services.vocab_cache import vocab_cache
+
+        with app.app_context():
+            engine.warmup(app.config, timeout=app.config["AI_WARMUP_TIMEOUT"])
+            print(f"Kosa kata di-cache: {vocab_cache.warm()}")
+        status = engine.status()
+        print(f"State: {status['state']} (mode: {status['mode']}, backend: {status['backend']})")
+        if status['error']:
+            print(f"Error: {status['error']}")
+        for name, value in {**startup, **status['timings']}.items():
+            print(f"  {name:<24} {value:>10} ms")
+
+    @app.cli.command("ai-export")
+    @click.option("--format", "fmt", type=click.Choice(["onnx", "openvino"]), default="onnx", help="Format hasil export.")
+    @click.option("--int8", is_flag=True, help="Kuantisasi INT8 untuk CPU.")
+    @click.option("--imgsz", type=int, default=640, help="Ukuran input model.")
+    @click.option("--data", default=None, help="File yaml dataset untuk kalibrasi INT8 OpenVINO.")
+    def ai_export_command(fmt, int8, imgsz, data):
+        """Export best.pt ke ONNX / OpenVINO untuk inferensi CPU."""
+        from app.services.inference_backends import export_model
+
+        path = export_model(app.config["AI_MODEL_DIR"], fmt=fmt, int8=int8, imgsz=imgsz, data=data)
+        print(f"Model exported: {path}")
+        print(f"Aktifkan dengan AI_BACKEND={fmt}" + (" dan AI_INT8=true" if int8 else ""))
+
+    @app.cli.command("ai-compare")
+    @click.option("--images", "images_dir", required=True, type=click.Path(exists=True, file_okay=False), help="Folder berisi frame contoh (jpg/png).")
+    @click.option("--backends", default="torch,onnx,openvino", help="Daftar backend, dipisah koma.")
+    @click.option("--int8", is_flag=True, help="Bandingkan model INT8 (untuk onnx/openvino).")
+    @click.option("--conf", type=float, default=0.60, help="Ambang confidence, sama dengan /api/ai/predict.")
+    @click.option("--output", default=None, help="Simpan laporan sebagai JSON.")
+    def ai_compare_command(images_dir, backends, int8, conf, output):
+        """Bandingkan latency & akurasi backend inferensi terhadap PyTorch."""
+        import json
+        import os
+        import cv2
+        from app.services.inference_backends import compare_backends, format_report
+
+        names = sorted(n for n in os.listdir(images_dir) if n.lower().endswith((".jpg", ".jpeg", ".png")))
+        images = [img for img in (cv2.imread(os.path.join(images_dir, n)) for n in names) if img is not None]
+        selected = [b.strip() for b in backends.split(",") if b.strip()]
+
+        report = compare_backends(images, selected, app.config["AI_MODEL_DIR"], conf=conf, int8=int8)
+        print(format_report(report))
+        if output:
+            with open(output, "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"Report saved: {output}")
+
+    @app.cli.command("ai-worker")
+    @click.option("--socket", "socket_path", default=None, help="Path Unix socket (default: AI_WORKER_SOCKET).")
+    @click.option("--workers", type=int, default=None, help="Jumlah proses inferensi (default: AI_WORKERS atau 1).")
+    @click.option("--threads", type=int, default=None, help="Thread per proses (default: AI_WORKER_THREADS).")
+    def ai_worker_command(socket_path, workers, threads):
+        """Jalankan pool proses inferensi terpisah di belakang Unix socket."""
+        from app.services.inference_pool import InferencePool, serve, worker_authkey
+
+        socket_path = socket_path or app.config["AI_WORKER_SOCKET"]
+        if not socket_path:
+            raise click.UsageError("Isi --socket atau AI_WORKER_SOCKET")
+        try:
+            authkey = worker_authkey(app.config["SECRET_KEY"])
+        except ValueError as e:
+            raise click.UsageError(str(e))
+
+        pool = InferencePool(
+            workers or app.config["AI_WORKERS"] or 1,
+            app.config["AI_BACKEND"],
+            app.config["AI_MODEL_DIR"],
+            int8=app.config["AI_INT8"],
+            threads=threads or app.config["AI_WORKER_THREADS"],
+            pin_cpus=app.config["AI_WORKER_PIN_CPUS"],
+        )
+        print(f"Inference worker: {pool.workers} proses x {pool.options['threads']} thread, socket {socket_path}")
+        try:
+            serve(pool, socket_path, authkey)
+        finally:
+            pool.close()
+
+    @app.cli.command("ai-bench")
+    @click.option("--images", "images_dir", required=True, type=click.Path(exists=True, file_okay=False), help="Folder berisi frame isyarat rekaman (jpg/png).")
+    @click.option("--target", type=click.Choice(["direct", "client", "http"]), default="direct", help="direct = model di proses ini, client = Flask test client, http = server berjalan.")
+    @click.option("--url", default="http://127.0.0.1:8080/api/ai/predict", help="Endpoint untuk --target http.")
+    @click.option("--concurrency", default="1,4,8", help="Level concurrency, dipisah koma.")
+    @click.option("--requests", "total", type=int, default=200, help="Jumlah frame per level concurrency.")
+    @click.option("--sizes", default="0", help="Sisi panjang frame dalam piksel, dipisah koma (0 = ukuran asli).")
+    @click.option("--backends", default=None, help="Backend untuk --target direct, dipisah koma (default: AI_BACKEND).")
+    @click.option("--threads", "thread_list", default=None, help="Thread inferensi untuk --target direct, dipisah koma (default: AI_WORKER_THREADS).")
+    @click.option("--sqlite", "sqlite_path", default=None, help="File SQLite pengganti database untuk --target client (default: file sementara).")
+    @click.option("--output", default=None, help="Simpan laporan sebagai JSON (bisa dipakai sebagai --baseline).")
+    @click.option("--baseline", default=None, type=click.Path(exists=True, dir_okay=False), help="Laporan JSON sebelumnya untuk gate regresi.")
+    @click.option("--max-regression", type=float, default=10.0, help="Toleransi penurunan throughput / kenaikan p95, dalam persen.")
+    def ai_bench_command(images_dir, target, url, concurrency, total, sizes, backends, thread_list,
+                         sqlite_path, output, baseline, max_regression):
+        """Benchmark throughput & latency inferensi AI, dengan gate regresi terhadap baseline."""
+        import json
+        import os
+        import tempfile
+        from app.services import ai_benchmark
+        from app.services.ai_engine import AIEngine
+        from app.services.inference_pool import _pin_threads
+
+        def int_list(value):
+            return [int(v) for v in value.split(",") if v.strip()]
+
+        levels = int_list(concurrency)
+        corpus = ai_benchmark.load_corpus(images_dir, int_list(sizes))
+        report = []
+
+        def record(rows, backend, threads):
+            for size, payloads in corpus.items():
+                for level in levels:
+                    row = rows(size, payloads, level)
+                    row.update({"target": target, "backend": backend, "threads": threads, "imgsz": size})
+                    report.append(row)
+                    print(f"  {backend} x{threads} imgsz={size or 'asli'} conc={level}: "
+                          f"{row['throughput_fps']} fps, p95 {row['p95_ms']} ms, {row['errors']} error")
+
+        if target == "direct":
+            # Tiap kombinasi backend x thread memakai engine baru dengan konfigurasi sendiri
+            for backend in (backends or app.config["AI_BACKEND"]).split(","):
+                for threads in int_list(thread_list or str(app.config["AI_WORKER_THREADS"])):
+                    config = {**app.config, "AI_BACKEND": backend.strip(), "AI_WORKER_THREADS": threads}
+                    bench_engine = AIEngine()
+                    if not config["AI_WORKERS"] and not config["AI_WORKER_SOCKET"]:
+                        _pin_threads(threads)
+                    if not bench_engine.warmup(config, timeout=app.config["AI_WARMUP_TIMEOUT"]):
+                        raise click.ClickException(f"Model {backend} gagal dimuat: {bench_engine.error}")
+                    pids = getattr(bench_engine.workers, "pids", [])
+                    send = ai_benchmark.direct_sender(bench_engine, app.config["AI_DECODE_MIN_SIDE"], app.config["AI_PREDICT_TIMEOUT"])
+                    try:
+                        record(lambda size, payloads, level: ai_benchmark.run_load(
+                            send, payloads, level, total, meter=ai_benchmark.ResourceMeter(pids)), backend.strip(), threads)
+                    finally:
+                        bench_engine.close()
+        elif target == "client":
+            # App kedua dengan SQLite pengganti (di proses terpisah), agar benchmark
+            # tidak menyentuh database asli maupun singleton app ini
+            path = sqlite_path or os.path.join(tempfile.mkdtemp(prefix="bahasaku_bench_"), "bench.sqlite")
+            rows = run_in_fresh_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}", "DATABASE_REPLICA_URLS": [], "AI_WARMUP_ON_START": False},
+                                    _bench_client, corpus, levels, total)
+            record(lambda size, payloads, level: rows[(size, level)], app.config["AI_BACKEND"], app.config["AI_WORKER_THREADS"])
+        else:
+            # CPU & RSS di sini hanya milik proses benchmark, bukan server yang diuji
+            send = ai_benchmark.http_sender(url)
+            record(lambda size, payloads, level: ai_benchmark.run_load(send, payloads, level, total), "server", 0)
+
+        print(ai_benchmark.format_bench(report))
+        if output:
+            with open(output, "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"Report saved: {output}")
+
+        if baseline:
+            problems = ai_benchmark.compare_to_baseline(report, ai_benchmark.load_report(baseline), max_regression)
+            if problems:
+                for problem in problems:
+                    print(f"REGRESI: {problem}")
+                raise SystemExit(1)
+            print(f"Tidak ada regresi > {max_regression}% terhadap {baseline}")
+
+    startup['create_app_ms'] = _elapsed_ms(started)
+    app.extensions['startup_timings'] = startup
+
+    # Warmup hanya untuk server web, bukan perintah CLI (db upgrade, create-db, dll.)
+    if app.config['AI_WARMUP_ON_START'] and click.get_current_context(silent=True) is None:
+        from app.services.ai_engine import engine
+        engine.start_background_warmup(app)
+
     return app
\ No newline at end of file
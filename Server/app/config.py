@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -7,4 +8,199 @@ class Config:
     #Mengambil konfigurasi dari file .env
     SECRET_KEY = os.getenv("SECRET_KEY")
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # --- Pool koneksi database (diabaikan untuk SQLite) ---
+    # Total koneksi per proses = DB_POOL_SIZE + DB_MAX_OVERFLOW; kalikan dengan
+    # jumlah worker gunicorn dan pastikan masih di bawah max_connections server.
+    # DB_POOL_RECYCLE harus lebih kecil dari wait_timeout MySQL/timeout proxy.
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 280))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+    # --- Read replica ---
+    # Daftar URL replika dipisah koma. Query di request GET/HEAD dibaca dari
+    # replika (round-robin); request tulis, CLI & thread background tetap ke primary.
+    DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+
+    # --- Role di JWT ---
+    # Claim role di token dipercaya selama ROLE_CLAIM_TTL detik sejak token
+    # dibuat, kecuali role user itu berubah sesudahnya (tabel role_revocations,
+    # dicek semua worker). Setelah itu (atau untuk token lama tanpa claim) role
+    # dicek ke DB sekali dan di-cache selama ROLE_CLAIM_TTL.
+    ROLE_CLAIM_TTL = float(os.getenv("ROLE_CLAIM_TTL", 300))
+
+    # --- Cache respons GET (list/detail semua blueprint) ---
+    # memory = LRU in-process (per worker, dibatasi CACHE_MAX_ENTRIES & CACHE_MAX_BYTES),
+    # redis = dibagi semua worker lewat CACHE_REDIS_URL (butuh `pip install redis`), null = nonaktif.
+    # Invalidasi per tag dilakukan handler create/update/delete; CACHE_DEFAULT_TTL
+    # membatasi umur entri (dan keterlambatan antar worker untuk backend memory).
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_DEFAULT_TTL = float(os.getenv("CACHE_DEFAULT_TTL", 60))
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 1024))
+    CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", 32 * 1024 * 1024))
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "bahasaku")
+    # Dengan DATABASE_REPLICA_URLS, selama sekian detik setelah invalidasi
+    # sebuah tag, route bertag itu membaca dari primary dan hasilnya tidak
+    # di-cache (replika mungkin belum menerima tulisan terbaru).
+    CACHE_REPLICA_LAG = float(os.getenv("CACHE_REPLICA_LAG", 5))
+
+    # --- HTTP caching endpoint publik (kosa kata & informasi) ---
+    # Respons diberi ETag/Last-Modified; client memvalidasi ulang setelah
+    # HTTP_CACHE_MAX_AGE detik dan mendapat 304 jika data belum berubah.
+    HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", 0))
+
+    # --- Ringkasan dashboard admin (/api/stats) ---
+    # Dihitung ulang setelah ada perubahan data, atau paling lambat tiap STATS_CACHE_TTL detik.
+    STATS_CACHE_TTL = float(os.getenv("STATS_CACHE_TTL", 60))
+    STATS_SIGNUP_DAYS = int(os.getenv("STATS_SIGNUP_DAYS", 30))
+
+    # --- Penghitung query SQL per request ---
+    # Aktif otomatis di mode debug; header X-Query-Count ditambahkan ke respons
+    # dan request dengan lebih dari QUERY_COUNT_WARN query dicatat di log.
+    QUERY_COUNTER = os.getenv("QUERY_COUNTER", "false").lower() in ("1", "true", "yes")
+    QUERY_COUNT_WARN = int(os.getenv("QUERY_COUNT_WARN", 20))
+
+    # --- Cache label -> KosaKata untuk hasil prediksi ---
+    # Index dibangun ulang setelah create/update/delete kosa kata, atau paling
+    # lambat setiap VOCAB_CACHE_TTL detik (untuk perubahan dari proses lain).
+    VOCAB_CACHE_TTL = float(os.getenv("VOCAB_CACHE_TTL", 300))
+    # Panjang maksimal kalimat untuk /api/kosa-kata/translate
+    TRANSLATE_MAX_LENGTH = int(os.getenv("TRANSLATE_MAX_LENGTH", 1000))
+
+    # --- Transcoding video kosa kata (butuh ffmpeg) ---
+    # Upload diubah di background menjadi MP4 H.264 faststart (tinggi maks
+    # VIDEO_MAX_HEIGHT), WebM VP9, rendition bitrate rendah (VIDEO_RENDITIONS =
+    # "tinggi:kbps,...") dan poster. Tanpa ffmpeg video disajikan apa adanya.
+    VIDEO_TRANSCODE = os.getenv("VIDEO_TRANSCODE", "true").lower() in ("1", "true", "yes")
+    FFMPEG_BIN = os.getenv("FFMPEG_BIN", "ffmpeg")
+    VIDEO_INGEST_CONCURRENCY = int(os.getenv("VIDEO_INGEST_CONCURRENCY", 1))
+    VIDEO_MAX_HEIGHT = int(os.getenv("VIDEO_MAX_HEIGHT", 720))
+    VIDEO_CRF = int(os.getenv("VIDEO_CRF", 26))
+    VIDEO_PRESET = os.getenv("VIDEO_PRESET", "medium")
+    VIDEO_RENDITIONS = os.getenv("VIDEO_RENDITIONS", "480:800,360:450,240:250")
+    VIDEO_WEBM = os.getenv("VIDEO_WEBM", "true").lower() in ("1", "true", "yes")
+    VIDEO_KEEP_AUDIO = os.getenv("VIDEO_KEEP_AUDIO", "false").lower() in ("1", "true", "yes")
+    VIDEO_POSTER_AT = float(os.getenv("VIDEO_POSTER_AT", 0.5))
+    VIDEO_TRANSCODE_TIMEOUT = float(os.getenv("VIDEO_TRANSCODE_TIMEOUT", 900))
+
+    # --- Thumbnail foto profil & gambar informasi (Pillow) ---
+    # Upload diubah di background menjadi beberapa ukuran (sisi terpanjang, px)
+    # dalam tiap IMAGE_FORMATS (AVIF dilewati jika Pillow tidak mendukungnya;
+    # JPEG selalu dibuat), tanpa EXIF/metadata. File asli lalu diganti JPEG
+    # ukuran terbesar.
+    IMAGE_THUMBNAILS = os.getenv("IMAGE_THUMBNAILS", "true").lower() in ("1", "true", "yes")
+    IMAGE_FORMATS = os.getenv("IMAGE_FORMATS", "avif,webp,jpeg")
+    IMAGE_PROFILE_SIZES = os.getenv("IMAGE_PROFILE_SIZES", "96,256,512")
+    IMAGE_INFO_SIZES = os.getenv("IMAGE_INFO_SIZES", "320,768,1600")
+    IMAGE_INGEST_CONCURRENCY = int(os.getenv("IMAGE_INGEST_CONCURRENCY", 2))
+
+    # --- Batas ukuran upload ---
+    # MAX_CONTENT_LENGTH berlaku untuk semua request; endpoint upload memakai
+    # batas per file di bawah (request yang Content-Length-nya lebih besar
+    # langsung ditolak 413 sebelum body dibaca). File upload ditulis per chunk
+    # ke UPLOAD_TMP_DIR (default app/static/.uploads) lalu di-rename ke tujuan.
+    MAX_CONTENT_LENGTH = int(os.getenv("MAX_CONTENT_LENGTH", 16 * 1024 * 1024))
+    UPLOAD_TMP_DIR = os.getenv("UPLOAD_TMP_DIR")
+    UPLOAD_MAX_VIDEO_BYTES = int(os.getenv("UPLOAD_MAX_VIDEO_BYTES", 200 * 1024 * 1024))
+    UPLOAD_MAX_JOB_VIDEO_BYTES = int(os.getenv("UPLOAD_MAX_JOB_VIDEO_BYTES", 500 * 1024 * 1024))
+    UPLOAD_MAX_PHOTO_BYTES = int(os.getenv("UPLOAD_MAX_PHOTO_BYTES", 5 * 1024 * 1024))
+    UPLOAD_MAX_INFO_IMAGE_BYTES = int(os.getenv("UPLOAD_MAX_INFO_IMAGE_BYTES", 10 * 1024 * 1024))
+
+    # --- Penyajian file media (/static/videos, foto_profile, info_images) ---
+    # File upload bertimestamp di-cache browser/CDN selamanya (immutable),
+    # file lain MEDIA_MAX_AGE detik. MEDIA_SENDFILE:
+    #   none       = Flask mengirim file (Range didukung, sendfile lewat gunicorn)
+    #   x-accel    = nginx yang mengirim file; contoh konfigurasi nginx:
+    #                location /_media/ { internal; alias /app/app/static/; }
+    #   x-sendfile = Apache mod_xsendfile / lighttpd
+    MEDIA_SENDFILE = os.getenv("MEDIA_SENDFILE", "none")
+    MEDIA_ACCEL_PREFIX = os.getenv("MEDIA_ACCEL_PREFIX", "/_media/")
+    MEDIA_MAX_AGE = int(os.getenv("MEDIA_MAX_AGE", 3600))
+    MEDIA_IMMUTABLE_MAX_AGE = int(os.getenv("MEDIA_IMMUTABLE_MAX_AGE", 365 * 24 * 3600))
+
+    # --- Penyimpanan media & garbage collection ---
+    # Upload disimpan per isi file (static/<koleksi>/<sha[:2]>/<sha256>.<ext>),
+    # file yang sama hanya disimpan sekali. File yang tidak lagi dirujuk
+    # database dihapus `flask media-gc`; jalankan berkala, misalnya cron:
+    #   0 3 * * * cd /app && flask media-gc
+    # File yang lebih muda dari MEDIA_GC_MIN_AGE detik tidak pernah dihapus
+    # (upload / transcoding yang belum commit).
+    MEDIA_GC_MIN_AGE = int(os.getenv("MEDIA_GC_MIN_AGE", 3600))
+
+    # --- Backend inferensi AI ---
+    # torch = best.pt lewat PyTorch, onnx = ONNX Runtime, openvino = OpenVINO (CPU).
+    # File onnx/openvino dibuat dengan perintah `flask ai-export`.
+    AI_BACKEND = os.getenv("AI_BACKEND", "torch")
+    AI_MODEL_DIR = os.getenv("AI_MODEL_DIR", os.path.join(os.getcwd(), 'app', 'models_ml'))
+    AI_INT8 = os.getenv("AI_INT8", "false").lower() in ("1", "true", "yes")
+
+    # --- Lazy loading model ---
+    # Model dimuat saat prediksi pertama. AI_WARMUP_ON_START=true memuat dan
+    # memanaskan model di background saat server web start (tidak berlaku
+    # untuk perintah `flask ...` seperti db upgrade / create-db).
+    AI_WARMUP_ON_START = os.getenv("AI_WARMUP_ON_START", "false").lower() in ("1", "true", "yes")
+    AI_WARMUP_TIMEOUT = float(os.getenv("AI_WARMUP_TIMEOUT", 120))
+    # Setelah load model gagal, request berikutnya langsung ditolak (503/500)
+    # dan load baru dicoba lagi setelah AI_LOAD_RETRY_INTERVAL detik.
+    AI_LOAD_RETRY_INTERVAL = float(os.getenv("AI_LOAD_RETRY_INTERVAL", 30))
+
+    # --- Worker inferensi terpisah dari thread Flask ---
+    # AI_WORKERS > 0 -> proses API menjalankan pool proses inferensi sendiri.
+    # AI_WORKER_SOCKET diisi -> proses API mengirim frame ke `flask ai-worker`
+    # lewat Unix socket dan tidak memuat model sama sekali.
+    # Keduanya kosong -> inferensi langsung di proses API (perilaku lama).
+    AI_WORKERS = int(os.getenv("AI_WORKERS", 0))
+    AI_WORKER_THREADS = int(os.getenv("AI_WORKER_THREADS", 1))
+    AI_WORKER_PIN_CPUS = os.getenv("AI_WORKER_PIN_CPUS", "false").lower() in ("1", "true", "yes")
+    AI_WORKER_SOCKET = os.getenv("AI_WORKER_SOCKET")
+
+    # --- Inferensi AI (micro-batching) ---
+    # Frame dari request yang datang bersamaan digabung menjadi satu batch YOLO.
+    # Batch dijalankan saat jumlah frame mencapai AI_BATCH_MAX_SIZE atau
+    # AI_BATCH_MAX_WAIT_MS sudah lewat sejak frame pertama masuk antrian.
+    AI_BATCH_MAX_SIZE = int(os.getenv("AI_BATCH_MAX_SIZE", 8))
+    AI_BATCH_MAX_WAIT_MS = float(os.getenv("AI_BATCH_MAX_WAIT_MS", 15))
+    AI_PREDICT_TIMEOUT = float(os.getenv("AI_PREDICT_TIMEOUT", 10))
+    # Batch yang dikirim ke worker (AI_WORKERS) tetapi belum selesai setelah
+    # sekian detik digagalkan agar slot batch tidak habis oleh worker macet.
+    AI_BATCH_TIMEOUT = float(os.getenv("AI_BATCH_TIMEOUT", 30))
+
+    # --- Smoothing hasil prediksi per sesi ---
+    # Label dianggap stabil jika muncul minimal AI_SMOOTHING_MIN_VOTES kali
+    # dalam AI_SMOOTHING_WINDOW frame terakhir. Frame yang perceptual hash-nya
+    # (dHash 256 bit) berbeda paling banyak AI_FRAME_HASH_DISTANCE bit dari
+    # frame sebelumnya tidak diinferensi ulang (-1 = nonaktif).
+    AI_SMOOTHING_WINDOW = int(os.getenv("AI_SMOOTHING_WINDOW", 5))
+    AI_SMOOTHING_MIN_VOTES = int(os.getenv("AI_SMOOTHING_MIN_VOTES", 3))
+    AI_FRAME_HASH_DISTANCE = int(os.getenv("AI_FRAME_HASH_DISTANCE", 6))
+    AI_MAX_SENTENCE_WORDS = int(os.getenv("AI_MAX_SENTENCE_WORDS", 50))
+    AI_SESSION_TTL = float(os.getenv("AI_SESSION_TTL", 300))
+
+    # --- Preprocessing frame sebelum inferensi ---
+    # JPEG yang jauh lebih besar dari input model didecode langsung di resolusi
+    # kecil (IMREAD_REDUCED_COLOR_2/4/8) selama sisi panjangnya tetap >=
+    # AI_DECODE_MIN_SIDE (0 = selalu decode full-size).
+    # AI_ROI_CROP=true memotong frame di sekitar posisi tangan terakhir dalam sesi.
+    AI_DECODE_MIN_SIDE = int(os.getenv("AI_DECODE_MIN_SIDE", 640))
+    AI_ROI_CROP = os.getenv("AI_ROI_CROP", "false").lower() in ("1", "true", "yes")
+    AI_ROI_MARGIN = float(os.getenv("AI_ROI_MARGIN", 0.75))
+    AI_ROI_MAX_MISSES = int(os.getenv("AI_ROI_MAX_MISSES", 3))
+
+    # --- Job transkripsi video (offline) ---
+    # Video diupload ke AI_JOB_UPLOAD_DIR, disampling AI_JOB_SAMPLE_FPS frame per
+    # detik, dan paling banyak AI_JOB_MAX_IN_FLIGHT frame menunggu inferensi
+    # (berprioritas lebih rendah dari frame realtime). Status job disimpan di
+    # tabel transcription_jobs dan dihapus AI_JOB_TTL detik setelah selesai.
+    AI_JOB_UPLOAD_DIR = os.getenv("AI_JOB_UPLOAD_DIR", os.path.join(tempfile.gettempdir(), 'bahasaku_jobs'))
+    AI_JOB_SAMPLE_FPS = float(os.getenv("AI_JOB_SAMPLE_FPS", 2))
+    AI_JOB_MAX_SAMPLE_FPS = float(os.getenv("AI_JOB_MAX_SAMPLE_FPS", 15))
+    AI_JOB_MAX_IN_FLIGHT = int(os.getenv("AI_JOB_MAX_IN_FLIGHT", 32))
+    AI_JOB_MIN_FRAMES = int(os.getenv("AI_JOB_MIN_FRAMES", 2))
+    # Job gagal jika hasil inferensi satu frame belum ada setelah sekian detik
+    AI_JOB_FRAME_TIMEOUT = float(os.getenv("AI_JOB_FRAME_TIMEOUT", 60))
+    AI_JOB_CONCURRENCY = int(os.getenv("AI_JOB_CONCURRENCY", 2))
+    AI_JOB_TTL = float(os.getenv("AI_JOB_TTL", 3600))
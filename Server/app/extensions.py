@@ -1,5 +1,10 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from flask_sock import Sock
+from app.services.db_routing import RoutingSession
+from app.services.response_cache import ResponseCache
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
+sock = Sock()
+cache = ResponseCache()
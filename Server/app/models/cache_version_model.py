@@ -0,0 +1,18 @@
+from app.extensions import db
+from sqlalchemy.sql import func
+
+
+class CacheVersion(db.Model):
+    """Nomor versi per tag cache, bagian dari ETag (lihat app/services/http_cache.py).
+
+    Kolom:
+    - tag: nama tag yang sama dengan `cache.invalidate(<tag>)`, misal 'kosa_kata'
+    - version: dinaikkan setiap kali tag itu di-invalidate
+    - updated_at: waktu invalidasi terakhir (ikut menentukan Last-Modified)
+    """
+
+    __tablename__ = 'cache_versions'
+
+    tag = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
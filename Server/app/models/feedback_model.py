@@ -21,12 +21,12 @@ class Feedback(db.Model):
     __tablename__ = "feedback"
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     message = db.Column(db.Text, nullable=False)
     
     # Menggunakan konstanta FEEDBACK_STATUS
-    status = db.Column(db.Enum(*FEEDBACK_STATUS, name='feedback_status_enum'), nullable=False, default='Baru')
-    created_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
+    status = db.Column(db.Enum(*FEEDBACK_STATUS, name='feedback_status_enum'), nullable=False, default='Baru', index=True)
+    created_at = db.Column(db.DateTime(timezone=True), server_default=func.now(), index=True)
 
     # Relasi ke model User (opsional, berguna untuk query join)
     user = db.relationship('User', backref=db.backref('feedbacks', lazy='dynamic'))
@@ -9,8 +9,10 @@ class Information(db.Model):
     title = db.Column(db.String(255), nullable=False)
     content = db.Column(db.Text, nullable=False)
     image_url = db.Column(db.String(255), nullable=True)
+    # Thumbnail gambar (lihat ImageIngestor): [{'src', 'type', 'width', 'height', 'bytes'}, ...]
+    image_variants = db.Column(db.JSON(none_as_null=True), nullable=True)
     
-    created_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
+    created_at = db.Column(db.DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = db.Column(db.DateTime(timezone=True), onupdate=func.now())
 
     # --- Relasi Pembuat ---
@@ -25,6 +27,7 @@ class Information(db.Model):
             'title': self.title,
             'content': self.content,
             'image_url': self.image_url,
+            'image_variants': self.image_variants or [],
             'created_at': self.created_at.strftime('%d-%m-%Y %H:%M') if self.created_at else '-',
             'created_by': self.created_by.full_name if self.created_by else 'Admin',
             
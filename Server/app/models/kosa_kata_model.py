@@ -19,9 +19,17 @@ class KosaKata(db.Model):
     - category: kategori kosa kata
     - added_by_admin_id: foreign key ke user (Admin) yang menambahkan
     - created_at: timestamp
+    - updated_at: timestamp perubahan terakhir (dipakai untuk ETag / Last-Modified)
+    - video_status: None (video asli), 'processing', 'ready' atau 'failed' (lihat video_ingest)
+    - video_poster_path: gambar poster hasil transcoding
+    - video_renditions: list {src, type, height, kbps, bytes} hasil transcoding
     """
 
     __tablename__ = 'kosa_kata'
+    __table_args__ = (
+        # Filter ?category= dengan urutan list (ORDER BY id DESC, lihat kosa_kata_routes)
+        db.Index('ix_kosa_kata_category_id', 'category', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     text = db.Column(db.String(50), unique=True, nullable=False)
@@ -29,6 +37,10 @@ class KosaKata(db.Model):
     category = db.Column(db.String(50), nullable=False, default='Lainnya') # String lebih fleksibel daripada Enum di sini
     added_by_admin_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
     created_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
+    updated_at = db.Column(db.DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    video_status = db.Column(db.String(20), nullable=True)
+    video_poster_path = db.Column(db.String(255), nullable=True)
+    video_renditions = db.Column(db.JSON, nullable=True)
 
     # Relasi ke User yang menambahkan (opsional)
     added_by_admin = db.relationship('User', backref=db.backref('kosa_kata_added', lazy='dynamic'))
@@ -42,6 +54,10 @@ class KosaKata(db.Model):
             'category': self.category,
             'added_by_admin_id': self.added_by_admin_id,
             'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'video_status': self.video_status,
+            'video_poster_path': self.video_poster_path,
+            'video_renditions': self.video_renditions or [],
         }
 
     def to_detail_dict(self):
@@ -56,4 +72,8 @@ class KosaKata(db.Model):
         return data
 
     def __repr__(self):
-        return f"<KosaKata id={self.id} text={self.text} category={self.category}>"
\ No newline at end of file
+        return f"<KosaKata id={self.id} text={self.text} category={self.category}>"
+
+
+# Filter awalan ?q= (rentang pada lower(text), lihat kosa_kata_routes)
+db.Index('ix_kosa_kata_text_lower', func.lower(KosaKata.text))
@@ -0,0 +1,18 @@
+from app.extensions import db
+
+
+class RoleRevocation(db.Model):
+    """Waktu terakhir role user berubah / user dihapus (lihat app/services/auth.py).
+
+    Dibaca semua worker sebelum mempercayai claim role di JWT. Baris yang
+    lebih tua dari ROLE_CLAIM_TTL tidak berpengaruh lagi dan dihapus.
+
+    Kolom:
+    - user_id: ID user (tanpa foreign key, baris tetap ada setelah user dihapus)
+    - revoked_at: waktu revoke (UTC, dari jam server aplikasi seperti claim `iat`)
+    """
+
+    __tablename__ = 'role_revocations'
+
+    user_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    revoked_at = db.Column(db.DateTime(timezone=True), nullable=False, index=True)
@@ -0,0 +1,62 @@
+from app.extensions import db
+import datetime
+
+
+def _epoch(value):
+    """DateTime dari database -> detik epoch (kolom tanpa zona waktu dianggap UTC)."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value.timestamp()
+
+
+class TranscriptionJob(db.Model):
+    """Job transkripsi video (lihat app/services/video_jobs.py).
+
+    Disimpan di database agar GET /api/ai/jobs/<id> bisa dilayani worker
+    gunicorn mana pun, bukan hanya worker yang menjalankan job-nya.
+
+    Kolom:
+    - id: UUID hex
+    - owner_id: user yang mengupload video
+    - status: 'queued', 'running', 'done' atau 'failed'
+    - progress / frames_read: kemajuan decode video
+    - options: parameter transkripsi (sample_fps, dst.)
+    - result: hasil transcribe_video (segmen & teks) setelah selesai
+    - error: pesan error jika gagal
+    - created_at / started_at / finished_at: waktu (UTC)
+    """
+
+    __tablename__ = 'transcription_jobs'
+
+    id = db.Column(db.String(32), primary_key=True)
+    owner_id = db.Column(db.Integer, nullable=False, index=True)
+    status = db.Column(db.String(20), nullable=False)
+    progress = db.Column(db.Float, nullable=False, default=0.0)
+    frames_read = db.Column(db.Integer, nullable=False, default=0)
+    options = db.Column(db.JSON, nullable=True)
+    result = db.Column(db.JSON, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime(timezone=True), nullable=False)
+    started_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    finished_at = db.Column(db.DateTime(timezone=True), nullable=True, index=True)
+
+    def to_dict(self):
+        """Bentuk respons GET /api/ai/jobs/<id> (waktu dalam detik epoch)."""
+        return {
+            'id': self.id,
+            'owner_id': self.owner_id,
+            'status': self.status,
+            'progress': self.progress,
+            'frames_read': self.frames_read,
+            'created_at': _epoch(self.created_at),
+            'started_at': _epoch(self.started_at),
+            'finished_at': _epoch(self.finished_at),
+            'options': self.options or {},
+            'result': self.result,
+            'error': self.error,
+        }
+
+    def __repr__(self):
+        return f"<TranscriptionJob id={self.id} status={self.status}>"
@@ -1,4 +1,5 @@
 from app.extensions import db
+from sqlalchemy.orm import validates
 from sqlalchemy.sql import func
 from werkzeug.security import generate_password_hash, check_password_hash
 import datetime
@@ -6,6 +7,22 @@ import datetime
 USER_TYPES = ('Tuli', 'Dengar', 'Umum')
 ROLES = ('User', 'Admin')
 
+
+def normalize_phone(value):
+    """Bentuk baku nomor telepon untuk pencarian & cek unik: hanya digit, awalan 62.
+
+    "0812-3456 789", "+62 812 3456789" dan "812 3456789" semuanya menjadi
+    "628123456789". Nilai kosong menjadi None.
+    """
+    digits = ''.join(ch for ch in (value or '') if ch.isdigit())
+    if not digits:
+        return None
+    if digits.startswith('0'):
+        digits = '62' + digits[1:]
+    elif digits.startswith('8'):
+        digits = '62' + digits
+    return digits[:20]
+
 class User(db.Model):
     __tablename__ = "users"
 
@@ -20,15 +37,24 @@ class User(db.Model):
     location = db.Column(db.String(255), nullable=True)
 
     phone_number = db.Column(db.String(20), nullable=True)
+    # Diisi otomatis dari phone_number (lihat normalize_phone); dipakai login & cek unik
+    phone_number_normalized = db.Column(db.String(20), nullable=True, unique=True, index=True)
     
     birth_date = db.Column(db.Date, nullable=True)
     
     profile_pic_url = db.Column(db.String(255), default='default.png')
+    # Thumbnail foto profil (lihat ImageIngestor): [{'src', 'type', 'width', 'height', 'bytes'}, ...]
+    profile_pic_variants = db.Column(db.JSON(none_as_null=True), nullable=True)
     
     role = db.Column(db.Enum(*ROLES, name='role_enum'), nullable=False, default='User')
     
     created_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
 
+    @validates('phone_number')
+    def _sync_phone_number(self, key, value):
+        self.phone_number_normalized = normalize_phone(value)
+        return value
+
     # ========= Fungsi Keamanan =========
 
     def set_password(self, password_mentah):
@@ -52,6 +78,7 @@ class User(db.Model):
             "phone_number": self.phone_number,
             "birth_date": self.birth_date.isoformat() if self.birth_date else None,
             "profile_pic_url": self.profile_pic_url,
+            "profile_pic_variants": self.profile_pic_variants or [],
             "role": self.role,
             "created_at": self.created_at.isoformat() if self.created_at else None
         }
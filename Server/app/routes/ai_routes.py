@@ -1,26 +1,165 @@
-from flask import Blueprint, request, jsonify
-from ultralytics import YOLO
-from app.models.kosa_kata_model import KosaKata
-import cv2
-import numpy as np
+from flask import Blueprint, request, jsonify, current_app, url_for
+from app.services.ai_engine import engine
+from app.services.db_routing import use_primary
+from app.services.frame_preprocess import PipelineStats, StageTimer, crop_to_roi, decode_frame, shift_box
+from app.services.inference_batcher import BACKGROUND
+from app.services.recognition_session import RecognitionSession, SessionStore
+from app.services.uploads import save_upload, streamed_upload
+from app.services.video_jobs import JobManager
+from app.services.vocab_cache import vocab_cache
+from app.extensions import db, sock
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from werkzeug.exceptions import HTTPException
+from werkzeug.utils import secure_filename
+import datetime
+import functools
+import json
 import os
+import threading
 
 ai_bp = Blueprint('ai_bp', __name__)
 
-# Mengatur path model
-MODEL_PATH = os.path.join(os.getcwd(), 'app', 'models_ml', 'best.pt') 
+# Model TIDAK dimuat saat blueprint diimport. Stack ML (cv2, numpy, torch)
+# baru dimuat saat prediksi pertama atau lewat warmup (lihat ai_engine.py).
+
+_sessions = None
+_sessions_lock = threading.Lock()
+pipeline_stats = PipelineStats()
+_jobs = None
+
+VIDEO_EXTENSIONS = {'mp4', 'avi', 'mov', 'mkv', 'webm'}
+
+
+def model_ready():
+    """Pastikan model sudah dimuat (lazy), lalu cek apakah siap dipakai."""
+    engine.load(current_app.config)
+    return engine.ready
+
+
+def find_kosa_kata(label):
+    """Cari detail KosaKata untuk label hasil deteksi (None jika tidak ada di database).
+
+    Dibaca dari index in-memory, jadi jalur prediksi tidak menjalankan SQL.
+    """
+    return vocab_cache.get(label)
+
+
+def detect(img):
+    return engine.detect(img, timeout=current_app.config['AI_PREDICT_TIMEOUT'])
+
+
+def session_options(config):
+    return {
+        'window': config['AI_SMOOTHING_WINDOW'],
+        'min_votes': config['AI_SMOOTHING_MIN_VOTES'],
+        'hash_distance': config['AI_FRAME_HASH_DISTANCE'],
+        'max_words': config['AI_MAX_SENTENCE_WORDS'],
+        'roi_max_misses': config['AI_ROI_MAX_MISSES'],
+    }
+
+
+def new_session():
+    return RecognitionSession(**session_options(current_app.config))
+
+
+def get_sessions():
+    """Registry sesi untuk client HTTP yang mengirim `session_id`."""
+    global _sessions
+    if _sessions is None:
+        with _sessions_lock:
+            if _sessions is None:
+                config = current_app.config
+                _sessions = SessionStore(ttl=config['AI_SESSION_TTL'], **session_options(config))
+    return _sessions
+
+
+def predict_image(img, timer):
+    """Prediksi satu frame tanpa sesi, lalu cocokkan dengan database."""
+    with timer.stage('infer'):
+        detection = detect(img)
+
+    with timer.stage('postprocess'):
+        if not detection:
+            return {'text': '', 'found_in_db': False}
+
+        db_detail = find_kosa_kata(detection['text'])
+        return {
+            'text': detection['text'],
+            'confidence': detection['confidence'],
+            'found_in_db': bool(db_detail),
+            'db_detail': db_detail
+        }
+
+
+def predict_in_session(session, img, timer):
+    """Prediksi satu frame dengan smoothing per sesi.
+
+    Frame yang hash-nya hampir sama dengan sebelumnya memakai ulang deteksi
+    terakhir, frame lain bisa di-crop di sekitar posisi tangan terakhir, dan
+    detail kosa kata dibaca dari vocab_cache (tanpa SQL). `text` berisi label
+    yang sudah stabil (hasil voting), bukan hasil mentah frame ini.
+    """
+    config = current_app.config
+    with session.lock:
+        with timer.stage('preprocess'):
+            skipped = session.is_similar(img)
+            offset = (0, 0)
+            cropped = False
+            if not skipped and config['AI_ROI_CROP']:
+                frame = img
+                img, offset = crop_to_roi(frame, session.roi_box(), margin=config['AI_ROI_MARGIN'])
+                cropped = img.shape[:2] != frame.shape[:2]
+
+        with timer.stage('infer'):
+            detection = session.last_detection if skipped else detect(img)
+
+        with timer.stage('postprocess'):
+            if not skipped:
+                detection = shift_box(detection, offset)
+            committed = session.observe(detection, skipped=skipped)
+
+            label = session.stable
+            db_detail = find_kosa_kata(label) if label else None
+            payload = {
+                'text': label or '',
+                'confidence': detection['confidence'] if detection and detection['text'] == label else None,
+                'raw_text': detection['text'] if detection else '',
+                'found_in_db': bool(db_detail),
+                'db_detail': db_detail,
+                'committed': committed,
+                'sentence': session.sentence,
+                'skipped_inference': skipped,
+            }
+        return payload, skipped, cropped
+
+
+def process_frame(data, session=None):
+    """Pipeline lengkap satu frame: decode -> preprocess -> infer -> postprocess.
+
+    Mengembalikan payload JSON (dengan `timings_ms` per tahap), atau None jika
+    bytes bukan gambar yang valid.
+    """
+    timer = StageTimer()
+    with timer.stage('decode'):
+        img, _ = decode_frame(data, min_side=current_app.config['AI_DECODE_MIN_SIDE'])
+    if img is None:
+        return None
+
+    skipped = cropped = False
+    if session is None:
+        payload = predict_image(img, timer)
+    else:
+        payload, skipped, cropped = predict_in_session(session, img, timer)
+
+    pipeline_stats.record(timer, skipped=skipped, cropped=cropped)
+    payload['timings_ms'] = timer.as_dict()
+    return payload
 
-try:
-    # Load model sekali saat aplikasi start
-    model = YOLO(MODEL_PATH)
-    print("YOLOv8 Model Loaded Successfully!")
-except Exception as e:
-    print(f"Error loading YOLO model: {e}")
-    model = None
 
 @ai_bp.route('/predict', methods=['POST'])
 def predict_sign():
-    if not model:
+    if not model_ready():
         return jsonify({'error': 'Model ML belum siap'}), 500
         
     if 'image' not in request.files:
@@ -28,45 +167,192 @@ def predict_sign():
         
     try:
         file = request.files['image']
-        
-        # 1. Baca gambar dari request
-        img_bytes = file.read()
-        nparr = np.frombuffer(img_bytes, np.uint8)
-        img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        
-        # 2. Prediksi menggunakan YOLO
-        # conf=0.60   -> Hanya ambil jika yakin > 60% (Filter gerakan ragu-ragu)
-        # verbose=False -> Matikan log di terminal agar lebih cepat
-        # max_det DIHAPUS -> Agar gerakan 2 tangan (seperti huruf A di SIBI) tetap terdeteksi utuh
-        results = model(img, conf=0.60, verbose=False) 
-        
-        detected_text = None
-        confidence = 0
-        
-        # Ambil hasil prediksi
-        # Kita ambil deteksi dengan confidence tertinggi
-        for result in results:
-            if result.boxes:
-                # result.boxes[0] otomatis adalah box dengan confidence tertinggi di YOLO
-                box = result.boxes[0] 
-                class_id = int(box.cls[0])
-                confidence = float(box.conf[0])
-                detected_text = model.names[class_id]
-                break # Ambil yang paling akurat saja
-                
-        if not detected_text:
-            return jsonify({'text': '', 'found_in_db': False}), 200
-            
-        # 3. Cek Database
-        db_item = KosaKata.query.filter(KosaKata.text.ilike(detected_text)).first()
-        
-        return jsonify({
-            'text': detected_text,
-            'confidence': confidence,
-            'found_in_db': bool(db_item),
-            'db_detail': db_item.to_detail_dict() if db_item else None
-        })
 
+        # Jika client mengirim session_id, hasil dihaluskan dan dirangkai menjadi kalimat
+        session_id = request.form.get('session_id')
+        session = get_sessions().get(session_id) if session_id else None
+
+        # 1. Baca gambar, 2. Prediksi menggunakan YOLO, 3. Cek Database
+        payload = process_frame(file.read(), session)
+        if payload is None:
+            return jsonify({'error': 'Gambar tidak valid'}), 400
+        return jsonify(payload), 200
+
+    except FutureTimeoutError:
+        return jsonify({'error': 'Antrian prediksi penuh, coba lagi'}), 503
     except Exception as e:
         print(f"Error during prediction: {e}")
-        return jsonify({'error': 'Internal server error processing image'}), 500
\ No newline at end of file
+        return jsonify({'error': 'Internal server error processing image'}), 500
+
+
+@ai_bp.route('/sessions/<session_id>', methods=['DELETE'])
+def end_session(session_id):
+    """Akhiri sesi HTTP (kalimat yang sudah dirangkai ikut dihapus)."""
+    if not get_sessions().discard(session_id):
+        return jsonify({'error': 'Sesi tidak ditemukan'}), 404
+    return jsonify({'message': f'Sesi {session_id} dihapus'}), 200
+
+
+def handle_stream_control(ws, session, message):
+    """Pesan teks pada stream adalah perintah JSON, misal {"type": "reset"}."""
+    try:
+        command = json.loads(message).get('type')
+    except (ValueError, AttributeError):
+        command = None
+
+    if command == 'reset':
+        with session.lock:
+            session.reset()
+        ws.send(json.dumps({'type': 'reset', 'sentence': ''}))
+    else:
+        ws.send(json.dumps({'error': 'Perintah tidak dikenal. Frame harus dikirim sebagai pesan biner (JPEG)'}))
+
+
+@sock.route('/stream', bp=ai_bp)
+def stream_predict(ws):
+    """Streaming prediksi lewat WebSocket.
+
+    Client mengirim frame JPEG sebagai pesan biner secara terus-menerus dalam
+    satu koneksi, server membalas hasil prediksi (JSON) setiap kali selesai.
+    Jika client mengirim lebih cepat dari kemampuan server, frame lama yang
+    belum sempat diproses dibuang dan hanya frame terbaru yang diprediksi.
+    Setiap koneksi punya sesi sendiri untuk smoothing dan perangkaian kalimat.
+    """
+    if not model_ready():
+        ws.send(json.dumps({'error': 'Model ML belum siap'}))
+        return
+
+    session = new_session()
+    seq = 0
+    dropped = 0
+    while True:
+        data = ws.receive()
+        if data is None:
+            break
+
+        # Ambil semua pesan yang sudah masuk: perintah diproses,
+        # sedangkan frame hanya yang paling baru (frame basi dibuang)
+        frame = None
+        while data is not None:
+            if isinstance(data, str):
+                handle_stream_control(ws, session, data)
+            else:
+                if frame is not None:
+                    dropped += 1
+                frame = data
+            data = ws.receive(timeout=0)
+
+        if frame is None:
+            continue
+
+        seq += 1
+        try:
+            payload = process_frame(frame, session) or {'error': 'Gambar tidak valid'}
+        except FutureTimeoutError:
+            payload = {'error': 'Antrian prediksi penuh, coba lagi'}
+        except Exception as e:
+            print(f"Error during stream prediction: {e}")
+            payload = {'error': 'Internal server error processing image'}
+        finally:
+            # Koneksi bisa hidup lama; jangan tahan transaksi baca antar frame
+            db.session.remove()
+
+        payload['seq'] = seq
+        payload['dropped'] = dropped
+        payload['stats'] = session.stats()
+        ws.send(json.dumps(payload))
+
+
+def get_jobs():
+    global _jobs
+    if _jobs is None:
+        with _sessions_lock:
+            if _jobs is None:
+                config = current_app.config
+                _jobs = JobManager(current_app._get_current_object(), max_concurrent=config['AI_JOB_CONCURRENCY'],
+                                   ttl=config['AI_JOB_TTL'])
+    return _jobs
+
+
+@ai_bp.route('/jobs', methods=['POST'])
+@jwt_required()
+@streamed_upload('video', 'UPLOAD_MAX_JOB_VIDEO_BYTES')
+def create_transcription_job():
+    """Upload video untuk ditranskripsi di background. Status dipantau lewat GET /jobs/<id>."""
+    current_user_id = int(get_jwt_identity())
+    config = current_app.config
+
+    if 'video' not in request.files:
+        return jsonify({'error': 'Video file is required'}), 400
+
+    file = request.files['video']
+    if file.filename == '' or '.' not in file.filename or file.filename.rsplit('.', 1)[1].lower() not in VIDEO_EXTENSIONS:
+        return jsonify({'error': 'Format file tidak didukung. Gunakan mp4/avi/mov/mkv/webm.'}), 400
+
+    sample_fps = request.form.get('sample_fps', type=float) or config['AI_JOB_SAMPLE_FPS']
+    if sample_fps <= 0 or sample_fps > config['AI_JOB_MAX_SAMPLE_FPS']:
+        return jsonify({'error': f"sample_fps harus di antara 0 dan {config['AI_JOB_MAX_SAMPLE_FPS']}"}), 400
+
+    if not model_ready():
+        return jsonify({'error': 'Model ML belum siap'}), 500
+
+    os.makedirs(config['AI_JOB_UPLOAD_DIR'], exist_ok=True)
+    filename = secure_filename(f"{current_user_id}_{int(datetime.datetime.utcnow().timestamp())}_{file.filename}")
+    save_path = os.path.join(config['AI_JOB_UPLOAD_DIR'], filename)
+    try:
+        save_upload(file, save_path)
+    except HTTPException:
+        raise
+    except Exception as e:
+        return jsonify({'error': f'Gagal menyimpan file: {str(e)}'}), 500
+
+    job = get_jobs().submit(
+        save_path,
+        current_user_id,
+        # Frame job kalah prioritas dari /predict dan /stream di antrian batch
+        functools.partial(engine.batcher.submit, priority=BACKGROUND),
+        sample_fps=sample_fps,
+        max_side=config['AI_DECODE_MIN_SIDE'],
+        max_in_flight=config['AI_JOB_MAX_IN_FLIGHT'],
+        min_frames=config['AI_JOB_MIN_FRAMES'],
+        frame_timeout=config['AI_JOB_FRAME_TIMEOUT'],
+    )
+    return jsonify({
+        'message': 'Job transkripsi dibuat',
+        'job_id': job['id'],
+        'status': job['status'],
+        'status_url': url_for('ai_bp.get_transcription_job', job_id=job['id']),
+    }), 202
+
+
+@ai_bp.route('/jobs/<job_id>', methods=['GET'])
+@jwt_required()
+def get_transcription_job(job_id):
+    current_user_id = int(get_jwt_identity())
+    # Job baru saja dibuat / diperbarui di primary; replika bisa tertinggal
+    use_primary()
+    job = get_jobs().get(job_id)
+    if not job or job['owner_id'] != current_user_id:
+        return jsonify({'error': 'Job tidak ditemukan'}), 404
+    return jsonify(job), 200
+
+
+@ai_bp.route('/stats', methods=['GET'])
+def batch_stats():
+    """Statistik micro-batch (ukuran batch yang tercapai, waktu tunggu antrian)."""
+    if engine.batcher is None:
+        return jsonify({'error': 'Model ML belum dimuat', 'state': engine.state}), 503
+    stats = engine.batcher.stats()
+    stats['pipeline'] = pipeline_stats.snapshot()
+    stats['http_sessions'] = len(get_sessions())
+    stats['vocab_cache'] = vocab_cache.stats()
+    stats['workers'] = engine.workers.stats() if engine.workers else {'mode': 'inline'}
+    return jsonify(stats), 200
+
+
+@ai_bp.route('/ready', methods=['GET'])
+def readiness():
+    """Readiness probe: status model (tanpa memicu load) dan rincian waktu startup."""
+    status = engine.status()
+    status['startup'] = current_app.extensions.get('startup_timings', {})
+    return jsonify(status), 200 if status['ready'] else 503
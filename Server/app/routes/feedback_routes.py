@@ -1,17 +1,14 @@
 from flask import Blueprint, request, jsonify, abort
 from marshmallow import ValidationError
 from app.models.feedback_model import Feedback
-from app.extensions import db
+from app.extensions import db, cache
 from app.schemas import feedback_schema
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models.user_model import User
+from app.services.auth import admin_required
+from sqlalchemy.orm import joinedload
 
 feedback_bp = Blueprint('feedback_bp', __name__)
 
-def is_admin(user_id):
-    user = User.query.get(user_id)
-    return user and user.role == 'Admin'
-
 
 @feedback_bp.route('/', methods=['POST'])
 @jwt_required() # 1. Wajibkan Login
@@ -35,6 +32,7 @@ def create_feedback():
         fb = Feedback(**data)
         db.session.add(fb)
         db.session.commit()
+        cache.invalidate('feedback')
         
         return jsonify({
             'message': 'Feedback created successfully',
@@ -47,45 +45,32 @@ def create_feedback():
 
 
 @feedback_bp.route('/', methods=['GET'])
+@cache.cached(tags=('feedback', 'users'))
 def list_feedback():
-    feedback = Feedback.query.order_by(Feedback.created_at.desc()).all()
+    # User di-join dalam query yang sama (bukan 1 query per feedback)
+    feedback = Feedback.query.options(joinedload(Feedback.user)).order_by(Feedback.created_at.desc()).all()
     return jsonify([f.to_profile_dict() for f in feedback])
 
 
 @feedback_bp.route('/<int:feedback_id>', methods=['GET'])
+@cache.cached(tags=('feedback', 'users'))
 def get_feedback(feedback_id):
-    fb = Feedback.query.get_or_404(feedback_id)
+    fb = Feedback.query.options(joinedload(Feedback.user)).filter_by(id=feedback_id).first_or_404()
     return jsonify(fb.to_profile_dict())
 
 
 @feedback_bp.route('/<int:feedback_id>', methods=['DELETE'])
-@jwt_required()
+@admin_required
 def delete_feedback(feedback_id):
-    try:
-        current_user_id = int(get_jwt_identity())
-    except Exception:
-        return jsonify({"error": "Invalid token identity."}), 401
-
-    if not is_admin(current_user_id):
-        return jsonify({"error": "Akses ditolak. Diperlukan hak Admin."}), 403
-
     fb = Feedback.query.get_or_404(feedback_id)
     db.session.delete(fb)
     db.session.commit()
+    cache.invalidate('feedback')
     return jsonify({'message': f'Feedback with ID {feedback_id} deleted'}), 200
 
 @feedback_bp.route('/<int:feedback_id>', methods=['PUT'])
-@jwt_required()
+@admin_required  # Pastikan hanya Admin yang bisa update status
 def update_feedback_status(feedback_id):
-    try:
-        current_user_id = int(get_jwt_identity())
-    except Exception:
-        return jsonify({"error": "Invalid token identity."}), 401
-
-    # Pastikan hanya Admin yang bisa update status
-    if not is_admin(current_user_id):
-        return jsonify({"error": "Akses ditolak. Diperlukan hak Admin."}), 403
-
     fb = Feedback.query.get_or_404(feedback_id)
     data = request.get_json()
     new_status = data.get('status')
@@ -97,6 +82,7 @@ def update_feedback_status(feedback_id):
 
     fb.status = new_status
     db.session.commit()
+    cache.invalidate('feedback')
 
     return jsonify({
         'message': f'Status feedback updated to {new_status}',
@@ -1,11 +1,13 @@
-from flask import Blueprint, request, jsonify, current_app, url_for
+from flask import Blueprint, request, jsonify, abort
 from app.models.information_model import Information
-from app.extensions import db
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models.user_model import User
-import os
-import datetime
-from werkzeug.utils import secure_filename
+from app.extensions import db, cache
+from app.services.auth import admin_required, current_user_id
+from app.services.http_cache import cached_response, row_version, table_version
+from app.services.image_ingest import image_ingestor
+from app.services.media_store import media_store
+from app.services.uploads import streamed_upload
+from sqlalchemy.orm import joinedload
+from werkzeug.exceptions import HTTPException
 
 information_bp = Blueprint('information_bp', __name__)
 
@@ -14,17 +16,23 @@ ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'webp'}
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def is_admin(user_id):
-    user = User.query.get(user_id)
-    return user and user.role == 'Admin'
-
 # --- GET ALL (Bisa limit untuk Dashboard) ---
 @information_bp.route('/', methods=['GET'])
+@cache.cached(tags=('information', 'users'))
 def get_informations():
+    # Client yang sudah punya versi terbaru mendapat 304 tanpa query list / serialisasi
+    parts, last_modified = table_version(Information, tags=('information', 'users'))
+    return cached_response(parts, last_modified, build_information_list)
+
+def build_information_list():
     # Ambil parameter limit dari URL. Contoh: /api/information?limit=2
     limit = request.args.get('limit', type=int)
     
-    query = Information.query.order_by(Information.created_at.desc())
+    # Pembuat & pengubah di-join sekaligus (bukan 2 query per informasi)
+    query = Information.query.options(
+        joinedload(Information.created_by),
+        joinedload(Information.updated_by),
+    ).order_by(Information.created_at.desc())
     
     if limit:
         items = query.limit(limit).all()
@@ -35,18 +43,27 @@ def get_informations():
 
 # --- GET DETAIL (Saat diklik) ---
 @information_bp.route('/<int:id>', methods=['GET'])
+@cache.cached(tags=('information', 'users'))
 def get_information_detail(id):
-    item = Information.query.get_or_404(id)
-    return jsonify(item.to_dict()), 200
+    parts, last_modified = row_version(Information, id, tags=('information', 'users'))
+    if parts is None:
+        abort(404)
+
+    def build():
+        item = Information.query.options(
+            joinedload(Information.created_by),
+            joinedload(Information.updated_by),
+        ).filter_by(id=id).first_or_404()
+        return jsonify(item.to_dict()), 200
+    return cached_response(parts, last_modified, build)
 
 # --- CREATE (Admin Only) ---
 @information_bp.route('/', methods=['POST'])
-@jwt_required()
+@admin_required
+@streamed_upload('image', 'UPLOAD_MAX_INFO_IMAGE_BYTES')
 def create_information():
     try:
-        user_id = int(get_jwt_identity())
-        if not is_admin(user_id):
-            return jsonify({"error": "Unauthorized"}), 403
+        user_id = current_user_id()
             
         data = request.form
         title = data.get('title')
@@ -55,44 +72,49 @@ def create_information():
         if not title or not content:
             return jsonify({"error": "Judul dan Konten wajib diisi"}), 400
             
-        # Handle Upload Gambar
-        image_url = None
-        if 'image' in request.files:
-            file = request.files['image']
-            if file and allowed_file(file.filename):
-                filename = secure_filename(f"info_{int(datetime.datetime.utcnow().timestamp())}_{file.filename}")
-                save_dir = os.path.join(current_app.root_path, 'static', 'info_images')
-                os.makedirs(save_dir, exist_ok=True)
-                file.save(os.path.join(save_dir, filename))
-                
-                # Buat URL localhost
-                image_url = url_for('static', filename=f'info_images/{filename}')
-                # Jika ingin full URL: f"http://localhost:5000{url_for(...)}"
-        
         new_info = Information(
             title=title,
             content=content,
-            image_url=image_url,
             created_by_id=user_id
         )
+
+        # Handle Upload Gambar
+        stored = None
+        if 'image' in request.files:
+            file = request.files['image']
+            if file and allowed_file(file.filename):
+                stored = media_store.put(file, 'info_images')
+                # Jika ingin full URL: f"http://localhost:5000{stored['url']}"
+                shared = image_ingestor.assign('info_images', new_info, stored['url'])
         
         db.session.add(new_info)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            if stored:
+                media_store.release(stored['url'])
+            raise
+        cache.invalidate('information')
+        if stored:
+            image_ingestor.after_commit('info_images', new_info.image_url, stored, shared)
         
         return jsonify({"message": "Informasi berhasil dibuat", "data": new_info.to_dict()}), 201
 
+    except HTTPException:
+        # 404 / 413 / 415 dst. diteruskan apa adanya
+        raise
     except Exception as e:
         return jsonify({"error": str(e)}), 500
     
 
 #Update (Admin Only) ---
 @information_bp.route('/<int:id>', methods=['PUT'])
-@jwt_required()
+@admin_required
+@streamed_upload('image', 'UPLOAD_MAX_INFO_IMAGE_BYTES')
 def update_information(id):
     try:
-        user_id = int(get_jwt_identity())
-        if not is_admin(user_id):
-            return jsonify({"error": "Unauthorized"}), 403
+        user_id = current_user_id()
             
         info = Information.query.get_or_404(id)
         
@@ -106,61 +128,51 @@ def update_information(id):
         if content: info.content = content
         
         # Update Image (Jika ada file baru)
+        old_image_url = info.image_url
+        stored = None
         if 'image' in request.files:
             file = request.files['image']
             if file and file.filename != '' and allowed_file(file.filename):
-                # 1. Hapus gambar lama
-                if info.image_url:
-                    try:
-                        old_filename = info.image_url.split('/')[-1]
-                        old_path = os.path.join(current_app.root_path, 'static', 'info_images', old_filename)
-                        if os.path.exists(old_path):
-                            os.remove(old_path)
-                    except Exception:
-                        pass # Lanjut saja jika gagal hapus
-
-                # 2. Simpan gambar baru
-                filename = secure_filename(f"info_{int(datetime.datetime.utcnow().timestamp())}_{file.filename}")
-                save_dir = os.path.join(current_app.root_path, 'static', 'info_images')
-                os.makedirs(save_dir, exist_ok=True)
-                file.save(os.path.join(save_dir, filename))
-                
-                info.image_url = url_for('static', filename=f'info_images/{filename}')
+                stored = media_store.put(file, 'info_images')
+                shared = image_ingestor.assign('info_images', info, stored['url'])
 
         # Update Jejak Audit
         info.updated_by_id = user_id
         # updated_at otomatis terisi oleh database (onupdate=func.now())
         
-        db.session.commit()
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            if stored:
+                media_store.release(stored['url'])
+            raise
+        cache.invalidate('information')
+        # Gambar lama dihapus setelah commit, jika tidak dipakai informasi lain
+        if old_image_url != info.image_url:
+            media_store.release(old_image_url)
+        if stored:
+            image_ingestor.after_commit('info_images', info.image_url, stored, shared)
         return jsonify({"message": "Informasi berhasil diupdate", "data": info.to_dict()}), 200
 
+    except HTTPException:
+        raise
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 # --- DELETE (Admin Only) ---
 @information_bp.route('/<int:id>', methods=['DELETE'])
-@jwt_required()
+@admin_required
 def delete_information(id):
     try:
-        user_id = int(get_jwt_identity())
-        if not is_admin(user_id):
-            return jsonify({"error": "Unauthorized"}), 403
-            
         info = Information.query.get_or_404(id)
-        
-        # Hapus file gambar fisik jika ada
-        if info.image_url:
-            try:
-                # Ambil nama file dari URL
-                filename = info.image_url.split('/')[-1]
-                path = os.path.join(current_app.root_path, 'static', 'info_images', filename)
-                if os.path.exists(path):
-                    os.remove(path)
-            except Exception:
-                pass
+        image_url = info.image_url
                 
         db.session.delete(info)
         db.session.commit()
+        cache.invalidate('information')
+        # File gambar fisik dihapus setelah commit, jika tidak dipakai informasi lain
+        media_store.release(image_url)
         
         return jsonify({"message": "Informasi berhasil dihapus"}), 200
         
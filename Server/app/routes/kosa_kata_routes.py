@@ -1,37 +1,84 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, abort
 from app.models.kosa_kata_model import KosaKata
-from app.extensions import db
+from app.extensions import db, cache
 from sqlalchemy.exc import IntegrityError
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models.user_model import User
-import os
-from werkzeug.utils import secure_filename
-from flask import current_app, url_for
-import datetime
+from app.services.auth import admin_required, current_user_id
+from app.services.http_cache import cached_response, row_version, table_version
+from app.services.text_to_sign import translate
+from app.services.media_store import media_store
+from app.services.uploads import streamed_upload
+from app.services.video_ingest import video_ingestor
+from app.services.vocab_cache import vocab_cache
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
+import base64
+import binascii
+import json
+import time
+from werkzeug.exceptions import HTTPException
+from flask import current_app
 
 ALLOWED_EXTENSIONS = {'mp4', 'avi', 'mov', 'mkv'}  # Format video yang diizinkan
 
+# Field yang boleh diminta lewat ?fields= (sama dengan key to_detail_dict)
+LIST_FIELDS = ('id', 'text', 'video_file_path', 'category', 'added_by_admin_id', 'created_at', 'updated_at',
+               'video_status', 'video_poster_path', 'video_renditions', 'added_by_admin')
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def is_admin(user_id):
-    user = User.query.get(user_id)
-    return user and user.role == 'Admin'
+def set_video(item, stored):
+    """Pasang video hasil MediaStore.put ke `item`.
+
+    Jika kosa kata lain sudah memakai isi video yang sama, hasil
+    transcoding-nya ikut dipakai dan True dikembalikan (tidak perlu
+    di-transcode ulang); selain itu video asli dipasang untuk diproses.
+    """
+    twin = KosaKata.query.filter(KosaKata.id != item.id, media_store.same_content(KosaKata.video_file_path, stored['url'])) \
+        .order_by(KosaKata.id).first()
+    if twin is not None:
+        item.video_file_path = twin.video_file_path
+        item.video_status = twin.video_status
+        item.video_poster_path = twin.video_poster_path
+        item.video_renditions = twin.video_renditions
+        return True
+    item.video_file_path = stored['url']
+    item.video_status = video_ingestor.initial_status()
+    item.video_poster_path = None
+    item.video_renditions = None
+    return False
+
+def encode_cursor(item):
+    """Cursor keyset = id baris terakhir di halaman, dalam base64.
+
+    Hanya id (bukan created_at): nilainya sama persis di Python dan database,
+    sedangkan created_at dari server_default bisa berbeda format/presisi
+    (mis. teks CURRENT_TIMESTAMP di SQLite) sehingga perbandingannya meleset.
+    """
+    raw = json.dumps([item.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """Kebalikan encode_cursor. Mengembalikan id atau raise ValueError."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        # Cursor lama berbentuk [created_at, id]; id selalu elemen terakhir
+        return int(json.loads(raw)[-1])
+    except (binascii.Error, ValueError, TypeError, IndexError, KeyError):
+        raise ValueError('cursor tidak valid')
+
+def escape_like(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
 
 kosa_kata_bp = Blueprint('kosa_kata_bp', __name__)
 
 
 @kosa_kata_bp.route('/', methods=['POST'])
-@jwt_required()
+@admin_required
+@streamed_upload('video', 'UPLOAD_MAX_VIDEO_BYTES')
 def create_kosa_kata():
-    try:
-        current_user_id = int(get_jwt_identity())
-    except Exception:
-        return jsonify({"error": "Invalid token identity."}), 401
-
-    if not is_admin(current_user_id):
-        return jsonify({"error": "Akses ditolak. Diperlukan hak Admin."}), 403
-
     data = request.form or {}
     text = data.get('text')
     category = data.get('category', 'Lainnya')
@@ -49,80 +96,206 @@ def create_kosa_kata():
     if not allowed_file(file.filename):
         return jsonify({'error': 'Format file tidak didukung. Gunakan mp4/avi/mov/mkv.'}), 400
 
-    filename = secure_filename(f"{text}_{int(datetime.datetime.utcnow().timestamp())}_{file.filename}")
-    save_dir = os.path.join(current_app.root_path, 'static', 'videos')
-    os.makedirs(save_dir, exist_ok=True)
-    save_path = os.path.join(save_dir, filename)
-
     try:
-        file.save(save_path)
+        stored = media_store.put(file, 'videos')
+    except HTTPException:
+        raise
     except Exception as e:
         return jsonify({'error': f'Gagal menyimpan file: {str(e)}'}), 500
 
-    video_url = url_for('static', filename=f'videos/{filename}')
-
-    kk = KosaKata(text=text, video_file_path=video_url, category=category, added_by_admin_id=current_user_id)
+    kk = KosaKata(text=text, category=category, added_by_admin_id=current_user_id())
+    shared = set_video(kk, stored)
     db.session.add(kk)
     try:
         db.session.commit()
     except IntegrityError:
         db.session.rollback()
-        try:
-            if os.path.exists(save_path):
-                os.remove(save_path)
-        except Exception:
-            pass
+        media_store.release(stored['url'])
         return jsonify({'error': 'text must be unique'}), 400
 
+    vocab_cache.invalidate()
+    cache.invalidate('kosa_kata')
+    # Transcoding di background; sementara itu video asli tetap bisa diputar
+    if not shared:
+        video_ingestor.submit(kk.id, kk.video_file_path)
+    elif not stored['deduplicated'] and kk.video_file_path != stored['url']:
+        # Sudah ada hasil transcoding dengan isi sama; file asli yang baru ditulis tidak diperlukan
+        media_store.release(stored['url'], min_age=0)
     return jsonify({'message': 'KosaKata created', 'kosa_kata': kk.to_detail_dict()}), 201
 
 
 @kosa_kata_bp.route('/', methods=['GET'])
+@cache.cached(tags=('kosa_kata', 'users'))
 def list_kosa_kata():
-    items = KosaKata.query.order_by(KosaKata.created_at.desc()).all()
-    return jsonify([i.to_detail_dict() for i in items])
+    # Client yang sudah punya versi terbaru mendapat 304 tanpa query list / serialisasi
+    parts, last_modified = table_version(KosaKata, tags=('kosa_kata', 'users'))
+    return cached_response(parts, last_modified, build_kosa_kata_list)
+
+
+def build_kosa_kata_list():
+    """Daftar kosa kata, terbaru dulu.
+
+    Query string (semua opsional):
+    - category: filter kategori
+    - q: filter awalan teks (tidak peka huruf besar/kecil)
+    - fields: daftar field dipisah koma, misal `id,text,video_file_path`
+    - limit / cursor: pagination keyset pada id (urut sesuai waktu dibuat). Jika salah satu
+      diisi, respons berbentuk {items, next_cursor, has_more}; tanpa keduanya
+      respons tetap berupa array penuh seperti sebelumnya.
+    """
+    args = request.args
+    fields = [f.strip() for f in args.get('fields', '').split(',') if f.strip()]
+    unknown = [f for f in fields if f not in LIST_FIELDS]
+    if unknown:
+        return jsonify({'error': f"Field tidak dikenal: {', '.join(unknown)}", 'allowed': list(LIST_FIELDS)}), 400
+
+    query = KosaKata.query
+    # Admin di-join dalam query yang sama, bukan satu query per baris
+    if not fields or 'added_by_admin' in fields:
+        query = query.options(joinedload(KosaKata.added_by_admin))
+
+    category = args.get('category')
+    if category:
+        query = query.filter(KosaKata.category == category)
+    prefix = args.get('q', '').strip()
+    if prefix:
+        query = query.filter(KosaKata.text.ilike(escape_like(prefix) + '%', escape='\\'))
+        # Rentang yang sama pada lower(text) agar memakai ix_kosa_kata_text_lower;
+        # hasil tetap ditentukan ILIKE. Hanya untuk awalan ASCII karena lower()
+        # di SQLite tidak mengubah huruf non-ASCII.
+        if prefix.isascii():
+            lowered = prefix.lower()
+            upper_bound = lowered[:-1] + chr(ord(lowered[-1]) + 1)
+            query = query.filter(func.lower(KosaKata.text) >= lowered, func.lower(KosaKata.text) < upper_bound)
+
+    # id autoincrement mengikuti urutan insert, jadi sama dengan urutan created_at
+    query = query.order_by(KosaKata.id.desc())
+
+    paginate = 'limit' in args or 'cursor' in args
+    if paginate:
+        try:
+            limit = min(max(int(args.get('limit', DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        except ValueError:
+            return jsonify({'error': 'limit harus berupa angka'}), 400
+
+        cursor = args.get('cursor')
+        if cursor:
+            try:
+                last_id = decode_cursor(cursor)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            query = query.filter(KosaKata.id < last_id)
+        # Ambil satu baris ekstra untuk tahu apakah masih ada halaman berikutnya
+        items = query.limit(limit + 1).all()
+        has_more = len(items) > limit
+        items = items[:limit]
+    else:
+        items = query.all()
+
+    def serialize(item):
+        data = item.to_detail_dict() if 'added_by_admin' in fields or not fields else item.to_dict()
+        if fields:
+            data = {key: data.get(key) for key in fields}
+        return data
+
+    results = [serialize(i) for i in items]
+    if not paginate:
+        return jsonify(results)
+    return jsonify({
+        'items': results,
+        'next_cursor': encode_cursor(items[-1]) if has_more else None,
+        'has_more': has_more,
+    })
+
+
+@kosa_kata_bp.route('/search', methods=['GET'])
+def search_kosa_kata():
+    """Pencarian kosa kata untuk typeahead (awalan, awalan per kata, dan toleran typo).
+
+    Query string: q (wajib), category, limit (default 10, maks 50),
+    distance (maks salah ketik; default otomatis dari panjang q, 0 = tanpa fuzzy).
+    Dilayani dari index in-memory, tanpa query database.
+    """
+    q = request.args.get('q', '').strip()
+    if not q:
+        return jsonify({'error': 'q is required'}), 400
+    try:
+        limit = min(max(int(request.args.get('limit', 10)), 1), 50)
+        distance = request.args.get('distance')
+        distance = min(max(int(distance), 0), 3) if distance is not None else None
+    except ValueError:
+        return jsonify({'error': 'limit dan distance harus berupa angka'}), 400
+
+    started = time.perf_counter()
+    matches = vocab_cache.search(q, category=request.args.get('category'), limit=limit, max_distance=distance)
+    took_ms = round((time.perf_counter() - started) * 1000.0, 3)
+
+    results = [{**item, 'match': kind, 'distance': dist} for item, kind, dist in matches]
+    return jsonify({'query': q, 'results': results, 'took_ms': took_ms})
+
+
+@kosa_kata_bp.route('/translate', methods=['GET', 'POST'])
+def translate_text():
+    """Terjemahkan satu kalimat menjadi playlist video isyarat dalam satu request.
+
+    Input: JSON/form `text` (POST) atau query string `?text=` (GET).
+    Frasa dicocokkan longest-match, kata yang tidak ada dieja per huruf.
+    """
+    if request.method == 'POST':
+        data = request.get_json(silent=True) or request.form or {}
+    else:
+        data = request.args
+    text = (data.get('text') or '').strip()
+
+    if not text:
+        return jsonify({'error': 'text is required'}), 400
+    max_length = current_app.config['TRANSLATE_MAX_LENGTH']
+    if len(text) > max_length:
+        return jsonify({'error': f'text maksimal {max_length} karakter'}), 400
+
+    result = translate(text, vocab_cache.entries())
+    return jsonify({'text': text, **result})
 
 
 @kosa_kata_bp.route('/<int:item_id>', methods=['GET'])
+@cache.cached(tags=('kosa_kata', 'users'))
 def get_kosa_kata(item_id):
-    item = KosaKata.query.get_or_404(item_id)
-    return jsonify(item.to_detail_dict())
+    parts, last_modified = row_version(KosaKata, item_id, tags=('kosa_kata', 'users'))
+    if parts is None:
+        abort(404)
+
+    def build():
+        item = KosaKata.query.options(joinedload(KosaKata.added_by_admin)).filter_by(id=item_id).first_or_404()
+        return jsonify(item.to_detail_dict())
+    return cached_response(parts, last_modified, build)
 
 
 @kosa_kata_bp.route('/<int:item_id>', methods=['PUT', 'PATCH'])
-@jwt_required()
+@admin_required
+@streamed_upload('video', 'UPLOAD_MAX_VIDEO_BYTES')
 def update_kosa_kata(item_id):
-    try:
-        current_user_id = int(get_jwt_identity())
-    except Exception:
-        return jsonify({"error": "Invalid token identity."}), 401
-
-    if not is_admin(current_user_id):
-        return jsonify({"error": "Akses ditolak. Diperlukan hak Admin."}), 403
-
     item = KosaKata.query.get_or_404(item_id)
     data = request.form or {}
     text = data.get('text')
     category = data.get('category')
 
     old_video_path = None
+    stored = None
+    shared = False
     if 'video' in request.files:
         file = request.files['video']
         if file.filename != '':
             if not allowed_file(file.filename):
                 return jsonify({'error': 'Format file tidak didukung. Gunakan mp4/avi/mov/mkv.'}), 400
 
-            filename = secure_filename(f"{text or item.text}_{int(datetime.datetime.utcnow().timestamp())}_{file.filename}")
-            save_dir = os.path.join(current_app.root_path, 'static', 'videos')
-            os.makedirs(save_dir, exist_ok=True)
-            save_path = os.path.join(save_dir, filename)
-
             try:
-                file.save(save_path)
-                old_video_path = item.video_file_path
-                item.video_file_path = url_for('static', filename=f'videos/{filename}')
+                stored = media_store.put(file, 'videos')
+            except HTTPException:
+                raise
             except Exception as e:
                 return jsonify({'error': f'Gagal menyimpan file: {str(e)}'}), 500
+            old_video_path = item.video_file_path
+            shared = set_video(item, stored)
 
     if text:
         item.text = text
@@ -133,43 +306,34 @@ def update_kosa_kata(item_id):
         db.session.commit()
     except IntegrityError:
         db.session.rollback()
+        if stored:
+            media_store.release(stored['url'])
         return jsonify({'error': 'text must be unique'}), 400
 
-    # Hapus video lama jika ada
-    if old_video_path:
-        try:
-            old_filename = old_video_path.split('/videos/')[-1]
-            old_path = os.path.join(current_app.root_path, 'static', 'videos', old_filename)
-            if os.path.exists(old_path):
-                os.remove(old_path)
-        except Exception:
-            pass
+    vocab_cache.invalidate()
+    cache.invalidate('kosa_kata')
+
+    # Video lama (beserta rendition & poster-nya) dihapus jika tidak dipakai kosa kata lain
+    if old_video_path and old_video_path != item.video_file_path:
+        media_store.release(old_video_path)
+        if not shared:
+            video_ingestor.submit(item.id, item.video_file_path)
+        elif not stored['deduplicated'] and item.video_file_path != stored['url']:
+            media_store.release(stored['url'], min_age=0)
 
     return jsonify({'message': 'KosaKata updated', 'kosa_kata': item.to_detail_dict()})
 
 
 @kosa_kata_bp.route('/<int:item_id>', methods=['DELETE'])
-@jwt_required()
+@admin_required
 def delete_kosa_kata(item_id):
-    try:
-        current_user_id = int(get_jwt_identity())
-    except Exception:
-        return jsonify({"error": "Invalid token identity."}), 401
-
-    if not is_admin(current_user_id):
-        return jsonify({"error": "Akses ditolak. Diperlukan hak Admin."}), 403
-
     item = KosaKata.query.get_or_404(item_id)
-
-    # Hapus file video
-    try:
-        video_filename = item.video_file_path.split('/videos/')[-1]
-        video_path = os.path.join(current_app.root_path, 'static', 'videos', video_filename)
-        if os.path.exists(video_path):
-            os.remove(video_path)
-    except Exception:
-        pass
+    video_url = item.video_file_path
 
     db.session.delete(item)
     db.session.commit()
+    vocab_cache.invalidate()
+    cache.invalidate('kosa_kata')
+    # File video (beserta rendition & poster-nya) dihapus setelah commit, jika tidak dipakai kosa kata lain
+    media_store.release(video_url)
     return jsonify({'message': f'KosaKata with ID {item_id} deleted'}), 200
@@ -0,0 +1,66 @@
+from flask import Blueprint, jsonify
+from app.extensions import cache, db
+from app.services.auth import admin_required
+from app.services.dashboard_stats import dashboard_stats
+from app.services.db_routing import pool_stats
+from app.services.image_ingest import image_ingestor
+from app.services.video_ingest import video_ingestor
+
+stats_bp = Blueprint('stats_bp', __name__)
+
+
+# ==================== Ringkasan dashboard admin ====================
+@stats_bp.route('/', methods=['GET'])
+@admin_required
+def get_stats():
+    """Semua angka DashboardSummary dalam satu request (lihat DashboardStats)."""
+    return jsonify(dashboard_stats.get()), 200
+
+
+# ==================== Metrik cache respons ====================
+@stats_bp.route('/cache', methods=['GET'])
+@admin_required
+def get_cache_stats():
+    """Hit/miss/eviction cache respons (per proses untuk backend memory)."""
+    return jsonify(cache.stats()), 200
+
+
+# ==================== Metrik pool koneksi database ====================
+@stats_bp.route('/db', methods=['GET'])
+@admin_required
+def get_db_stats():
+    """Pemakaian pool & waktu tunggu checkout koneksi per engine (primary dan replika)."""
+    return jsonify(pool_stats(db)), 200
+
+
+# ==================== Status transcoding video ====================
+@stats_bp.route('/video', methods=['GET'])
+@admin_required
+def get_video_stats():
+    """Jumlah video per status transcoding, plus hitungan proses ini."""
+    from sqlalchemy import func
+    from app.models.kosa_kata_model import KosaKata
+
+    rows = db.session.query(KosaKata.video_status, func.count(KosaKata.id)).group_by(KosaKata.video_status).all()
+    by_status = {status or 'original': count for status, count in rows}
+    return jsonify({'by_status': by_status, **video_ingestor.stats()}), 200
+
+
+# ==================== Status thumbnail gambar ====================
+@stats_bp.route('/images', methods=['GET'])
+@admin_required
+def get_image_stats():
+    """Jumlah foto profil & gambar informasi yang sudah/belum punya thumbnail."""
+    from sqlalchemy import func
+    from app.models.information_model import Information
+    from app.models.user_model import User
+
+    def count(url_column, variants_column):
+        total, ready = db.session.query(func.count(url_column), func.count(variants_column)).one()
+        return {'with_image': total, 'with_thumbnails': ready}
+
+    return jsonify({
+        'profile_photos': count(User.profile_pic_url, User.profile_pic_variants),
+        'information_images': count(Information.image_url, Information.image_variants),
+        **image_ingestor.stats(),
+    }), 200
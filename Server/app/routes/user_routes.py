@@ -1,13 +1,15 @@
 from flask import Blueprint, jsonify, request
 from app.models.user_model import User
-from app.extensions import db
+from app.extensions import db, cache
 from sqlalchemy.exc import IntegrityError
+from werkzeug.exceptions import HTTPException
 from sqlalchemy import or_ 
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, verify_jwt_in_request
-from flask import current_app, url_for
-import os
-from werkzeug.utils import secure_filename
-from app.models.user_model import ROLES
+from app.models.user_model import ROLES, normalize_phone
+from app.services.auth import admin_required, is_admin, role_claims, roles
+from app.services.image_ingest import image_ingestor
+from app.services.media_store import media_store
+from app.services.uploads import streamed_upload
 import datetime
 
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg'}
@@ -17,25 +19,18 @@ def allowed_file(filename):
 
 user_bp = Blueprint('user_bp', __name__)
 
-def is_admin(user_id):
-    """Mengecek apakah user dengan user_id yang diberikan memiliki role 'Admin'."""
-    user = User.query.get(user_id)
-    return user and user.role == 'Admin'
-
 # ==================== Register ====================
 @user_bp.route('/register', methods=['POST'])
 def register_user():
     data = request.get_json()
 
-    current_user_id = None
     is_registering_admin = False
     
     # Cek ada token Authorization di header kaga
     if request.headers.get('Authorization'):
         try:
             verify_jwt_in_request() 
-            current_user_id = int(get_jwt_identity())
-            is_registering_admin = is_admin(current_user_id)
+            is_registering_admin = is_admin()
         except Exception as e:
             print(f"Token check failed: {e}") 
             pass
@@ -70,14 +65,15 @@ def register_user():
         if User.query.filter_by(email=new_user.email).first():
             return jsonify({"error": "Email sudah terdaftar"}), 409
             
-        if new_user.phone_number and User.query.filter_by(phone_number=new_user.phone_number).first():
+        if new_user.phone_number_normalized and User.query.filter_by(phone_number_normalized=new_user.phone_number_normalized).first():
             return jsonify({"error": "Nomor telepon sudah terdaftar"}), 409
 
         new_user.set_password(data.get('password'))
         db.session.add(new_user)
         db.session.commit()
+        cache.invalidate('users')
 
-        access_token = create_access_token(identity=str(new_user.id))
+        access_token = create_access_token(identity=str(new_user.id), additional_claims=role_claims(new_user))
         return jsonify({
             "message": "Registrasi berhasil",
             "access_token": access_token,
@@ -106,7 +102,7 @@ def login_user():
 
     # Cari Email ATAU Nomor Telepon User
     user = User.query.filter(
-        or_(User.email == identifier, User.phone_number == identifier)
+        or_(User.email == identifier, User.phone_number_normalized == normalize_phone(identifier))
     ).first()
 
     if not user or not user.check_password(password):
@@ -116,9 +112,11 @@ def login_user():
     if remember_me: 
         expires_delta = datetime.timedelta(days=1)
 
+    # Role ikut disimpan di token agar pengecekan Admin tidak perlu query DB
     access_token = create_access_token(
         identity=str(user.id),
-        expires_delta=expires_delta
+        expires_delta=expires_delta,
+        additional_claims=role_claims(user)
     )
     
     return jsonify({
@@ -129,21 +127,16 @@ def login_user():
 
 # ==================== Ambil semua data user ====================
 @user_bp.route('/', methods=['GET'])
-@jwt_required()
+@admin_required
+@cache.cached(tags=('users',))
 def get_users():
-    try:
-        current_user_id = int(get_jwt_identity())
-    except Exception:
-        return jsonify({"error": "Invalid token identity."}), 401
-    if not is_admin(current_user_id):
-        return jsonify({"error": "Akses ditolak. Diperlukan hak Admin."}), 403
-    
     users = User.query.all()
     return jsonify([user.to_profile_dict() for user in users])
 
 # ==================== Up foto profile user ====================
 @user_bp.route('/<int:user_id>/photo', methods=['POST'])
 @jwt_required()
+@streamed_upload('image', 'UPLOAD_MAX_PHOTO_BYTES')
 def upload_profile_photo(user_id):
     try:
         current_user_id = int(get_jwt_identity())
@@ -164,50 +157,31 @@ def upload_profile_photo(user_id):
     if not allowed_file(file.filename):
         return jsonify({"error": "Format file tidak didukung. Gunakan png/jpg/jpeg/gif."}), 400
 
-    filename = secure_filename(f"{user_id}_{int(datetime.datetime.utcnow().timestamp())}_{file.filename}")
-    save_dir = os.path.join(current_app.root_path, 'static', 'foto_profile')
-    os.makedirs(save_dir, exist_ok=True)
-    save_path = os.path.join(save_dir, filename)
+    user = User.query.get_or_404(user_id)
 
     try:
-        file.save(save_path)
+        stored = media_store.put(file, 'foto_profile')
+    except HTTPException:
+        raise
     except Exception as e:
         return jsonify({"error": f"Gagal menyimpan file sementara: {str(e)}"}), 500
 
-    relative_url = url_for('static', filename=f'foto_profile/{filename}')
-    absolute_url = f"http://localhost:5000{relative_url}"
-
-    user = User.query.get_or_404(user_id)
-    old_url = user.profile_pic_url or ''
-    old_filename = None
-    if old_url and ('/foto_profile/' in old_url):
-        old_filename = old_url.split('/foto_profile/')[-1]
-
+    old_url = user.profile_pic_url
     try:
-        user.profile_pic_url = absolute_url
+        shared = image_ingestor.assign('foto_profile', user, f"http://localhost:5000{stored['url']}")
         db.session.commit()
-
-        if old_filename:
-            try:
-                old_path = os.path.join(current_app.root_path, 'static', 'foto_profile', old_filename)
-                save_dir_norm = os.path.normpath(os.path.join(current_app.root_path, 'static', 'foto_profile'))
-                old_path_norm = os.path.normpath(old_path)
-                if old_path_norm.startswith(save_dir_norm) and os.path.exists(old_path_norm) and old_path_norm != save_path:
-                    os.remove(old_path_norm)
-            except Exception:
-                pass
-
-        return jsonify({"message": "Foto profil berhasil diupload", "user": user.to_profile_dict()}), 200
-
     except Exception as e:
-        try:
-            if os.path.exists(save_path):
-                os.remove(save_path)
-        except Exception:
-            pass
         db.session.rollback()
+        media_store.release(stored['url'])
         return jsonify({"error": f"Gagal memperbarui database: {str(e)}"}), 500
 
+    cache.invalidate('users')
+    # Foto lama dihapus jika tidak dipakai user lain; thumbnail dibuat di background
+    if old_url != user.profile_pic_url:
+        media_store.release(old_url)
+    image_ingestor.after_commit('foto_profile', user.profile_pic_url, stored, shared)
+    return jsonify({"message": "Foto profil berhasil diupload", "user": user.to_profile_dict()}), 200
+
 # ==================== Ambil 1 user sesuai ID ====================
 @user_bp.route('/<int:user_id>', methods=['GET'])
 @jwt_required()
@@ -220,7 +194,7 @@ def get_user(user_id):
     user = User.query.get_or_404(user_id)
     print(f"[GET] User {user_id}, Current: {current_user_id}")
 
-    if user.id != current_user_id and not is_admin(current_user_id):
+    if user.id != current_user_id and not is_admin():
         return jsonify({"error": "Akses ditolak. Anda tidak berhak melihat profil ini."}), 403
 
     profile = user.to_profile_dict()
@@ -236,24 +210,23 @@ def update_user(user_id):
     except Exception:
         return jsonify({"error": "Invalid token identity."}), 401
     
+    # Hak akses dicek dari claim JWT dulu, sebelum user target dimuat
+    is_current_admin = is_admin()
+    if user_id != current_user_id and not is_current_admin:
+        return jsonify({"error": "Akses ditolak."}), 403
+
     user = User.query.get_or_404(user_id)
     data = request.get_json()
-
-    try:
-        current_user = User.query.get(int(current_user_id))
-    except Exception:
-        current_user = None
-
-    is_current_admin = current_user and current_user.role == 'Admin'
-
-    if user.id != current_user_id and not is_current_admin:
-        return jsonify({"error": "Akses ditolak."}), 403
+    old_role = user.role
 
     try:
         user.full_name = data.get('full_name', user.full_name)
         user.location = data.get('location', user.location)
 
         if 'phone_number' in data:
+            phone = normalize_phone(data.get('phone_number'))
+            if phone and phone != user.phone_number_normalized and User.query.filter_by(phone_number_normalized=phone).first():
+                return jsonify({"error": "Nomor telepon sudah terdaftar"}), 409
             user.phone_number = data.get('phone_number')
 
         if 'birth_date' in data:
@@ -282,6 +255,10 @@ def update_user(user_id):
             user.set_password(data.get('password'))
 
         db.session.commit()
+        # Nama/email user juga tampil di list kosa kata, feedback & informasi (tag 'users')
+        cache.invalidate('users')
+        if user.role != old_role:
+            roles.revoke(user.id)
         return jsonify({
             "message": "Profil berhasil diperbarui",
             "user": user.to_profile_dict()
@@ -299,23 +276,20 @@ def update_user(user_id):
 
 # ==================== Delete User ====================
 @user_bp.route('/<int:user_id>', methods=['DELETE'])
-@jwt_required()
+@admin_required
 def delete_user(user_id):
-    try:
-        current_user_id = int(get_jwt_identity())
-    except Exception:
-        return jsonify({"error": "Invalid token identity."}), 401
-
-    if not is_admin(current_user_id):
-        return jsonify({"error": "Akses ditolak. Diperlukan hak Admin."}), 403
-    
+    current_user_id = int(get_jwt_identity())
     user = User.query.get_or_404(user_id)
     
     if user.id == current_user_id: 
         return jsonify({"error": "Admin tidak dapat menghapus akunnya sendiri melalui rute ini."}), 400
 
+    photo_url = user.profile_pic_url
     db.session.delete(user)
     db.session.commit()
+    cache.invalidate('users')
+    roles.revoke(user_id)
+    media_store.release(photo_url)
     return jsonify({"message": f"User dengan ID {user_id} berhasil dihapus."}), 200
 
 # ==================== Ganti Password ====================
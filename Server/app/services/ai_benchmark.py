@@ -0,0 +1,268 @@
+import itertools
+import json
+import os
+import statistics
+import threading
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+# Kolom yang menentukan "baris yang sama" saat membandingkan dengan baseline
+ROW_KEY = ('target', 'backend', 'threads', 'imgsz', 'concurrency')
+
+
+def load_corpus(images_dir, sizes=(0,), quality=85):
+    """Baca frame contoh dan encode ulang ke JPEG untuk tiap ukuran di `sizes`.
+
+    Ukuran adalah sisi panjang dalam piksel (0 = ukuran asli). Mengembalikan
+    dict {ukuran: [bytes JPEG, ...]} agar semua target memakai payload yang sama
+    persis dengan yang dikirim kamera browser.
+    """
+    import cv2
+
+    names = sorted(n for n in os.listdir(images_dir) if n.lower().endswith(IMAGE_EXTENSIONS))
+    images = [img for img in (cv2.imread(os.path.join(images_dir, n)) for n in names) if img is not None]
+    if not images:
+        raise ValueError(f'Tidak ada gambar di {images_dir}')
+
+    corpus = {}
+    for size in sizes:
+        payloads = []
+        for img in images:
+            height, width = img.shape[:2]
+            if size and max(height, width) != size:
+                scale = size / float(max(height, width))
+                img = cv2.resize(img, (max(1, int(width * scale)), max(1, int(height * scale))), interpolation=cv2.INTER_AREA)
+            ok, encoded = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, quality])
+            if ok:
+                payloads.append(encoded.tobytes())
+        corpus[size] = payloads
+    return corpus
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+# ========= Pengukuran CPU & memori =========
+
+def _proc_cpu_seconds(pid):
+    """Total CPU (user + system) sebuah proses dari /proc, None jika tidak tersedia."""
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        # Setelah nama proses: utime = field ke-12, stime = field ke-13 (0-based)
+        return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _proc_rss_mb(pid):
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024.0
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+class ResourceMeter:
+    """Ukur CPU (% dari satu core) dan RSS untuk proses ini plus proses worker inferensi."""
+
+    def __init__(self, pids=()):
+        self.pids = [os.getpid()] + [pid for pid in pids if pid]
+
+    def _cpu(self):
+        total = 0.0
+        for pid in self.pids:
+            value = _proc_cpu_seconds(pid)
+            if value is None and pid == os.getpid():
+                times = os.times()
+                value = times.user + times.system
+            total += value or 0.0
+        return total
+
+    def _rss(self):
+        values = [_proc_rss_mb(pid) for pid in self.pids]
+        if values[0] is None:
+            import resource
+            # ru_maxrss dalam KB di Linux (puncak, bukan nilai saat ini)
+            values[0] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+        return sum(value for value in values if value)
+
+    def start(self):
+        self._wall = time.perf_counter()
+        self._cpu_started = self._cpu()
+        self.peak_rss = self._rss()
+        return self
+
+    def sample(self):
+        self.peak_rss = max(self.peak_rss, self._rss())
+
+    def stop(self):
+        wall = time.perf_counter() - self._wall
+        cpu = self._cpu() - self._cpu_started
+        self.sample()
+        return {
+            'cpu_percent': round(cpu / wall * 100.0, 1) if wall > 0 else 0.0,
+            'rss_mb': round(self.peak_rss, 1),
+        }
+
+
+# ========= Target yang diuji =========
+
+def direct_sender(engine, min_side=0, timeout=None):
+    """Panggil model di proses ini (decode + micro-batch + YOLO), tanpa HTTP."""
+    from app.services.frame_preprocess import decode_frame
+
+    def send(data):
+        img, _ = decode_frame(data, min_side)
+        if img is None:
+            raise ValueError('Gambar tidak valid')
+        engine.detect(img, timeout=timeout)
+    return send
+
+
+def client_sender(app, path='/api/ai/predict'):
+    """POST ke endpoint prediksi lewat Flask test client (tanpa socket)."""
+    import io
+
+    def send(data):
+        response = app.test_client().post(
+            path,
+            data={'image': (io.BytesIO(data), 'frame.jpg')},
+            content_type='multipart/form-data',
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f'HTTP {response.status_code}')
+    return send
+
+
+def http_sender(url, timeout=30):
+    """POST multipart ke server yang sedang berjalan, misal http://127.0.0.1:8080/api/ai/predict."""
+    def send(data):
+        boundary = uuid.uuid4().hex
+        body = b''.join([
+            f'--{boundary}\r\n'.encode(),
+            b'Content-Disposition: form-data; name="image"; filename="frame.jpg"\r\n',
+            b'Content-Type: image/jpeg\r\n\r\n',
+            data,
+            f'\r\n--{boundary}--\r\n'.encode(),
+        ])
+        req = urllib.request.Request(url, data=body, method='POST', headers={
+            'Content-Type': f'multipart/form-data; boundary={boundary}',
+        })
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            response.read()
+    return send
+
+
+def run_load(send, payloads, concurrency=1, requests=200, warmup=5, meter=None):
+    """Kirim `requests` frame dengan `concurrency` client paralel, lalu ringkas hasilnya.
+
+    Tiap client mengambil frame berikutnya dari corpus secara bergiliran,
+    jadi semua level concurrency memproses urutan frame yang sama.
+    """
+    for data in payloads[:warmup]:
+        send(data)
+
+    counter = itertools.count()
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def client():
+        while True:
+            index = next(counter)
+            if index >= requests:
+                return
+            started = time.perf_counter()
+            try:
+                send(payloads[index % len(payloads)])
+            except Exception as e:
+                with lock:
+                    errors.append(str(e))
+                continue
+            elapsed = (time.perf_counter() - started) * 1000.0
+            with lock:
+                latencies.append(elapsed)
+
+    meter = meter or ResourceMeter()
+    meter.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(client) for _ in range(concurrency)]
+        while not all(future.done() for future in futures):
+            meter.sample()
+            time.sleep(0.05)
+    wall = time.perf_counter() - started
+    resources = meter.stop()
+
+    return {
+        'concurrency': concurrency,
+        'requests': requests,
+        'errors': len(errors),
+        'first_error': errors[0] if errors else None,
+        'throughput_fps': round(len(latencies) / wall, 2) if wall > 0 else 0.0,
+        'mean_ms': round(statistics.mean(latencies), 2) if latencies else 0.0,
+        'p50_ms': round(_percentile(latencies, 50), 2),
+        'p95_ms': round(_percentile(latencies, 95), 2),
+        'p99_ms': round(_percentile(latencies, 99), 2),
+        **resources,
+    }
+
+
+# ========= Laporan & gate regresi =========
+
+def row_key(row):
+    return tuple(row.get(name) for name in ROW_KEY)
+
+
+def compare_to_baseline(report, baseline, max_regression=10.0):
+    """Bandingkan hasil dengan baseline; kembalikan daftar pesan regresi (kosong = lolos).
+
+    Baris dianggap regresi jika throughput turun atau p95 naik lebih dari
+    `max_regression` persen, atau jika muncul error yang di baseline tidak ada.
+    """
+    previous = {row_key(row): row for row in baseline}
+    problems = []
+    for row in report:
+        old = previous.get(row_key(row))
+        if old is None:
+            continue
+        label = ' '.join(f'{name}={value}' for name, value in zip(ROW_KEY, row_key(row)))
+        if old['throughput_fps'] and row['throughput_fps'] < old['throughput_fps'] * (1 - max_regression / 100.0):
+            problems.append(f"{label}: throughput {old['throughput_fps']} -> {row['throughput_fps']} fps")
+        if old['p95_ms'] and row['p95_ms'] > old['p95_ms'] * (1 + max_regression / 100.0):
+            problems.append(f"{label}: p95 {old['p95_ms']} -> {row['p95_ms']} ms")
+        if row['errors'] and not old.get('errors'):
+            problems.append(f"{label}: {row['errors']} error ({row['first_error']})")
+    return problems
+
+
+def load_report(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def format_bench(report):
+    """Tabel teks sederhana dari hasil benchmark."""
+    header = (f"{'target':<7} {'backend':<9} {'thr':>3} {'imgsz':>5} {'conc':>4} {'fps':>8} "
+              f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'cpu %':>7} {'rss MB':>7} {'err':>4}")
+    lines = [header, '-' * len(header)]
+    for row in report:
+        lines.append(
+            f"{row['target']:<7} {row['backend']:<9} {row['threads']:>3} {row['imgsz'] or 'asli':>5} "
+            f"{row['concurrency']:>4} {row['throughput_fps']:>8} {row['p50_ms']:>8} {row['p95_ms']:>8} "
+            f"{row['p99_ms']:>8} {row['cpu_percent']:>7} {row['rss_mb']:>7} {row['errors']:>4}"
+        )
+    return '\n'.join(lines)
@@ -0,0 +1,233 @@
+import threading
+import time
+
+from app.services.inference_batcher import InferenceBatcher
+
+# conf=0.60 -> Hanya ambil jika yakin > 60% (Filter gerakan ragu-ragu)
+CONFIDENCE = 0.60
+
+# Status siklus hidup model
+NOT_LOADED = 'not_loaded'
+LOADING = 'loading'
+READY = 'ready'
+ERROR = 'error'
+
+
+def _elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000.0, 2)
+
+
+class AIEngine:
+    """Pemilik model YOLO, pool worker dan antrian micro-batch untuk satu proses.
+
+    Tidak ada library ML (numpy, cv2, ultralytics/torch) yang diimport sampai
+    `load()` dipanggil, baik saat prediksi pertama maupun lewat warmup eksplisit.
+    Dengan begitu `flask db upgrade`, `flask create-db` dan boot worker web
+    tidak ikut menanggung waktu import torch dan load model.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.state = NOT_LOADED
+        self.error = None
+        self.mode = None
+        self.backend = None
+        self.model = None
+        self.workers = None
+        self.batcher = None
+        self.timings = {}
+        self.loaded_at = None
+        self.failed_at = None
+        self.retry_interval = 0.0
+
+    # ========= Load & warmup =========
+
+    def load(self, config):
+        """Load stack ML sesuai konfigurasi (idempotent & thread-safe).
+
+        Setelah load gagal, panggilan berikutnya langsung kembali (state ERROR)
+        sampai AI_LOAD_RETRY_INTERVAL detik berlalu, agar model yang rusak
+        tidak membuat setiap request mengulang import torch dan load model.
+        """
+        if self.state == READY or self._backing_off():
+            return self
+        with self._lock:
+            if self.state == READY or self._backing_off():
+                return self
+            self.state = LOADING
+            self.error = None
+            self.retry_interval = float(config['AI_LOAD_RETRY_INTERVAL'])
+            try:
+                self._load(config)
+                self.state = READY
+                self.loaded_at = time.time()
+                self.failed_at = None
+            except Exception as e:
+                self.state = ERROR
+                self.error = str(e)
+                self.failed_at = time.time()
+                print(f"Error loading YOLO model: {e}")
+        return self
+
+    def _backing_off(self):
+        return self.state == ERROR and self.failed_at is not None and \
+            time.time() - self.failed_at < self.retry_interval
+
+    def _load(self, config):
+        timings = {}
+        self.backend = config['AI_BACKEND']
+
+        started = time.perf_counter()
+        import numpy  # noqa: F401
+        timings['import_numpy_ms'] = _elapsed_ms(started)
+
+        started = time.perf_counter()
+        import cv2  # noqa: F401
+        timings['import_cv2_ms'] = _elapsed_ms(started)
+
+        if config['AI_WORKER_SOCKET']:
+            from app.services.inference_pool import RemoteInferenceClient, worker_authkey
+
+            self.mode = 'remote'
+            self.workers = RemoteInferenceClient(config['AI_WORKER_SOCKET'], worker_authkey(config['SECRET_KEY']))
+        elif config['AI_WORKERS'] > 0:
+            from app.services.inference_pool import InferencePool
+
+            self.mode = 'pool'
+            started = time.perf_counter()
+            self.workers = InferencePool(
+                config['AI_WORKERS'],
+                config['AI_BACKEND'],
+                config['AI_MODEL_DIR'],
+                int8=config['AI_INT8'],
+                threads=config['AI_WORKER_THREADS'],
+                conf=CONFIDENCE,
+                pin_cpus=config['AI_WORKER_PIN_CPUS'],
+            )
+            timings['start_workers_ms'] = _elapsed_ms(started)
+        else:
+            self.mode = 'inline'
+            started = time.perf_counter()
+            import ultralytics  # noqa: F401
+            timings['import_ultralytics_ms'] = _elapsed_ms(started)
+
+            from app.services.inference_backends import load_model
+
+            started = time.perf_counter()
+            # Load model sekali per proses, sesuai backend yang dipilih (AI_BACKEND)
+            self.model = load_model(config['AI_BACKEND'], config['AI_MODEL_DIR'], int8=config['AI_INT8'])
+            timings['load_model_ms'] = _elapsed_ms(started)
+            print(f"YOLOv8 Model Loaded Successfully! (backend: {config['AI_BACKEND']})")
+
+        if self.workers is None:
+            self.batcher = InferenceBatcher(
+                self.run_batch,
+                max_batch_size=config['AI_BATCH_MAX_SIZE'],
+                max_wait_ms=config['AI_BATCH_MAX_WAIT_MS'],
+            )
+        else:
+            # Satu batch per worker bisa berjalan bersamaan
+            self.batcher = InferenceBatcher(
+                submit_batch=self.workers.submit,
+                max_batch_size=config['AI_BATCH_MAX_SIZE'],
+                max_wait_ms=config['AI_BATCH_MAX_WAIT_MS'],
+                max_in_flight=max(1, config['AI_WORKERS']) * 2,
+                batch_timeout=config['AI_BATCH_TIMEOUT'],
+            )
+        self.timings = timings
+
+    def warmup(self, config, timeout=None):
+        """Load (jika belum) lalu jalankan satu frame kosong agar inferensi pertama tidak lambat."""
+        self.load(config)
+        if self.state != READY:
+            return False
+
+        import numpy as np
+
+        started = time.perf_counter()
+        try:
+            self.detect(np.zeros((480, 640, 3), dtype=np.uint8), timeout=timeout)
+        except Exception as e:
+            print(f"Warmup model gagal: {e}")
+            return False
+        self.timings['warmup_ms'] = _elapsed_ms(started)
+        return True
+
+    def start_background_warmup(self, app):
+        """Warmup di thread terpisah agar boot server tidak tertahan.
+
+        Index label -> KosaKata juga dibangun agar prediksi pertama tidak menunggu query.
+        """
+        def run():
+            from app.services.vocab_cache import vocab_cache
+
+            with app.app_context():
+                self.warmup(app.config, timeout=app.config['AI_WARMUP_TIMEOUT'])
+                try:
+                    vocab_cache.warm()
+                except Exception as e:
+                    print(f"Warmup kosa kata gagal: {e}")
+
+        thread = threading.Thread(target=run, name='ai-warmup', daemon=True)
+        thread.start()
+        return thread
+
+    def close(self):
+        """Hentikan pool worker (jika ada) dan kembali ke status belum dimuat."""
+        with self._lock:
+            if self.workers is not None and hasattr(self.workers, 'close'):
+                self.workers.close()
+            self._reset()
+
+    # ========= Inferensi =========
+
+    @property
+    def ready(self):
+        if self.state != READY:
+            return False
+        if self.workers is not None:
+            return self.workers.ready
+        return self.model is not None
+
+    def run_batch(self, images):
+        """Jalankan YOLO untuk sekumpulan frame sekaligus.
+
+        Mengembalikan list sepanjang `images`, berisi deteksi dengan confidence
+        tertinggi per frame (dict) atau None jika tidak ada yang terdeteksi.
+        """
+        from app.services.inference_backends import top_detection
+
+        # verbose=False -> Matikan log di terminal agar lebih cepat
+        # max_det DIHAPUS -> Agar gerakan 2 tangan (seperti huruf A di SIBI) tetap terdeteksi utuh
+        results = self.model(images, conf=CONFIDENCE, verbose=False)
+        return [top_detection(self.model, result) for result in results]
+
+    def detect(self, img, timeout=None):
+        """Jalankan satu frame lewat antrian micro-batch.
+
+        Frame dari request lain yang datang bersamaan ikut diproses dalam satu batch.
+        """
+        return self.batcher.submit(img).result(timeout=timeout)
+
+    # ========= Laporan =========
+
+    def status(self):
+        data = {
+            'state': self.state,
+            'ready': self.ready,
+            'mode': self.mode,
+            'backend': self.backend,
+            'error': self.error,
+            'loaded_at': self.loaded_at,
+            'retry_at': self.failed_at + self.retry_interval if self.state == ERROR and self.failed_at else None,
+            'timings': dict(self.timings),
+        }
+        if self.workers is not None:
+            data['workers'] = self.workers.stats()
+        return data
+
+
+engine = AIEngine()
@@ -0,0 +1,131 @@
+import datetime
+import threading
+import time
+from functools import wraps
+
+from flask import current_app, jsonify
+from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models.role_revocation_model import RoleRevocation
+
+ADMIN = 'Admin'
+
+
+def role_claims(user):
+    """Claim tambahan untuk `create_access_token(additional_claims=...)`."""
+    return {'role': user.role}
+
+
+class RoleRegistry:
+    """Sumber role user untuk pengecekan hak akses, tanpa memuat user di jalur utama.
+
+    - Role dibaca dari claim `role` di JWT selama token masih "segar" (umur
+      token < ttl) dan role user tersebut tidak berubah sejak token dibuat.
+    - Jika role diubah / user dihapus, `revoke()` mencatat waktunya di tabel
+      `role_revocations` (primary). Tabel ini dicek tiap request dengan satu
+      lookup primary key, jadi claim lama langsung tidak dipercaya lagi di
+      semua proses (worker gunicorn), bukan hanya di proses yang mengubahnya.
+    - Token lama (tanpa claim, atau lebih tua dari ttl) dicek ke database
+      sekali lalu hasilnya di-cache selama ttl, kecuali ada revoke sesudahnya.
+    """
+
+    def __init__(self, ttl=300):
+        self.ttl = float(ttl)
+        self._lock = threading.Lock()
+        self._cache = {}
+        self.lookups = 0
+
+    def init_app(self, app):
+        self.ttl = float(app.config['ROLE_CLAIM_TTL'])
+
+    def revoke(self, user_id):
+        """Panggil setelah perubahan role / penghapusan user di-commit."""
+        now = time.time()
+        table = RoleRevocation.__table__
+        revoked_at = _utc(now)
+        update = table.update().where(table.c.user_id == int(user_id)).values(revoked_at=revoked_at)
+        try:
+            with db.engine.begin() as conn:
+                # Revoke yang lebih tua dari ttl tidak memengaruhi claim maupun cache lagi
+                conn.execute(table.delete().where(table.c.revoked_at < _utc(now - self.ttl)))
+                if not conn.execute(update).rowcount:
+                    conn.execute(table.insert().values(user_id=int(user_id), revoked_at=revoked_at))
+        except IntegrityError:
+            # Proses lain baru saja me-revoke user yang sama
+            with db.engine.begin() as conn:
+                conn.execute(update)
+        with self._lock:
+            self._cache.pop(int(user_id), None)
+
+    def revoked_at(self, user_id):
+        """Waktu revoke terakhir user ini (epoch detik), dibaca dari primary; None jika tidak ada."""
+        table = RoleRevocation.__table__
+        with db.engine.connect() as conn:
+            value = conn.execute(db.select(table.c.revoked_at).where(table.c.user_id == user_id)).scalar()
+        if value is None:
+            return None
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return value.timestamp()
+
+    def role_for(self, user_id, claims):
+        now = time.time()
+        issued_at = claims.get('iat', 0)
+        role = claims.get('role')
+        revoked_at = self.revoked_at(user_id)
+        if role and now - issued_at < self.ttl and (revoked_at is None or issued_at > revoked_at):
+            return role
+
+        cached = self._cache.get(user_id)
+        if cached and cached[1] > now and (revoked_at is None or cached[1] - self.ttl > revoked_at):
+            return cached[0]
+
+        from app.models.user_model import User
+
+        self.lookups += 1
+        user = User.query.get(user_id)
+        role = user.role if user else None
+        with self._lock:
+            # Buang entri kedaluwarsa agar cache tidak tumbuh terus
+            for key in [key for key, (_, expires) in self._cache.items() if expires <= now]:
+                del self._cache[key]
+            self._cache[user_id] = (role, now + self.ttl)
+        return role
+
+
+def _utc(timestamp):
+    return datetime.datetime.fromtimestamp(timestamp, tz=datetime.timezone.utc)
+
+
+roles = RoleRegistry()
+
+
+def current_user_id():
+    """ID user dari JWT request ini (int), atau None jika identity tidak valid."""
+    try:
+        return int(get_jwt_identity())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_admin():
+    """True jika pemilik JWT request ini adalah Admin. JWT harus sudah diverifikasi."""
+    user_id = current_user_id()
+    if user_id is None:
+        return False
+    return roles.role_for(user_id, get_jwt()) == ADMIN
+
+
+def admin_required(fn):
+    """Pengganti `@jwt_required()` untuk route khusus Admin."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        verify_jwt_in_request()
+        if current_user_id() is None:
+            return jsonify({"error": "Invalid token identity."}), 401
+        if not is_admin():
+            return jsonify({"error": "Akses ditolak. Diperlukan hak Admin."}), 403
+        return current_app.ensure_sync(fn)(*args, **kwargs)
+    return wrapper
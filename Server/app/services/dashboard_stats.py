@@ -0,0 +1,156 @@
+import datetime
+import threading
+import time
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session, joinedload
+
+from app.extensions import db
+from app.models.feedback_model import Feedback
+from app.models.information_model import Information
+from app.models.kosa_kata_model import KosaKata
+from app.models.user_model import User
+from app.services.db_routing import use_primary
+
+# Perubahan pada model-model ini membuat ringkasan dashboard kedaluwarsa
+TRACKED_MODELS = (User, Feedback, KosaKata, Information)
+
+
+class DashboardStats:
+    """Ringkasan angka untuk dashboard admin, dihitung dengan GROUP BY lalu di-cache.
+
+    Cache dibuang otomatis setiap kali ada commit yang menambah, mengubah atau
+    menghapus User/Feedback/KosaKata/Information (lewat event session
+    SQLAlchemy), dan paling lama berumur `ttl` detik untuk perubahan dari
+    proses lain. Biaya per request dashboard: 0 query selama cache valid,
+    selalu 6 query saat dihitung ulang, berapa pun jumlah barisnya.
+    """
+
+    def __init__(self, ttl=60, signup_days=30, recent_feedback=5):
+        self.ttl = float(ttl)
+        self.signup_days = int(signup_days)
+        self.recent_feedback = int(recent_feedback)
+        # _lock: satu perhitungan ulang sekaligus. _state_lock: _summary,
+        # _expires_at dan _generation (dinaikkan setiap invalidate).
+        self._lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._summary = None
+        self._expires_at = 0.0
+        self._generation = 0
+        self.refreshes = 0
+
+    def init_app(self, app):
+        self.ttl = float(app.config['STATS_CACHE_TTL'])
+        self.signup_days = int(app.config['STATS_SIGNUP_DAYS'])
+
+    def invalidate(self):
+        with self._state_lock:
+            self._generation += 1
+            self._summary = None
+
+    def _cached(self):
+        with self._state_lock:
+            if self._summary is not None and time.monotonic() < self._expires_at:
+                return self._summary
+            return None
+
+    def get(self):
+        summary = self._cached()
+        if summary is not None:
+            return summary
+        with self._lock:
+            summary = self._cached()
+            if summary is not None:
+                return summary
+            with self._state_lock:
+                generation = self._generation
+            summary = self._compute()
+            self.refreshes += 1
+            with self._state_lock:
+                # Ada commit selama menghitung: hasil ini mungkin memakai angka
+                # sebelum commit, jadi tidak disimpan (request berikutnya menghitung ulang)
+                if generation == self._generation:
+                    self._summary = summary
+                    self._expires_at = time.monotonic() + self.ttl
+            return summary
+
+    def _compute(self):
+        # Hasilnya dipakai semua admin sampai ttl habis; jangan dari replika yang tertinggal
+        use_primary()
+        users = {'total': 0, 'by_role': {}, 'by_user_type': {}}
+        rows = db.session.query(User.role, User.user_type, func.count(User.id)).group_by(User.role, User.user_type)
+        for role, user_type, count in rows:
+            users['total'] += count
+            users['by_role'][role] = users['by_role'].get(role, 0) + count
+            users['by_user_type'][user_type] = users['by_user_type'].get(user_type, 0) + count
+
+        feedback_by_status = dict(
+            db.session.query(Feedback.status, func.count(Feedback.id)).group_by(Feedback.status).all()
+        )
+        vocab_by_category = dict(
+            db.session.query(KosaKata.category, func.count(KosaKata.id)).group_by(KosaKata.category).all()
+        )
+        information_total = db.session.query(func.count(Information.id)).scalar()
+
+        recent = (
+            Feedback.query.options(joinedload(Feedback.user))
+            .order_by(Feedback.created_at.desc())
+            .limit(self.recent_feedback)
+            .all()
+        )
+
+        return {
+            'users': users,
+            'feedback': {
+                'total': sum(feedback_by_status.values()),
+                'by_status': feedback_by_status,
+                'recent': [fb.to_profile_dict() for fb in recent],
+            },
+            'kosa_kata': {
+                'total': sum(vocab_by_category.values()),
+                'by_category': vocab_by_category,
+            },
+            'information': {'total': information_total},
+            'signups': self._signups(),
+            'generated_at': datetime.datetime.utcnow().isoformat() + 'Z',
+        }
+
+    def _signups(self):
+        """Jumlah pendaftar per hari selama `signup_days` hari terakhir (hari kosong = 0)."""
+        today = datetime.date.today()
+        since = today - datetime.timedelta(days=self.signup_days - 1)
+        day = func.date(User.created_at)
+        rows = (
+            db.session.query(day, func.count(User.id))
+            .filter(User.created_at >= datetime.datetime.combine(since, datetime.time.min))
+            .group_by(day)
+            .all()
+        )
+        counts = {str(date): count for date, count in rows}
+        return [
+            {'date': (since + datetime.timedelta(days=i)).isoformat(),
+             'count': counts.get((since + datetime.timedelta(days=i)).isoformat(), 0)}
+            for i in range(self.signup_days)
+        ]
+
+
+dashboard_stats = DashboardStats()
+
+
+@event.listens_for(Session, 'after_flush')
+def _mark_stats_dirty(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, TRACKED_MODELS):
+            session.info['dashboard_stats_dirty'] = True
+            return
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_stats(session):
+    if session.info.pop('dashboard_stats_dirty', False):
+        dashboard_stats.invalidate()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_stats_flag(session):
+    session.info.pop('dashboard_stats_dirty', None)
@@ -0,0 +1,149 @@
+import itertools
+import threading
+import time
+
+from flask import current_app, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+REPLICA_PREFIX = 'replica_'
+
+# Batas bucket histogram waktu tunggu checkout koneksi (milidetik)
+WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool yang mencatat berapa lama request menunggu koneksi dari pool.
+
+    Waktu tunggu tinggi berarti pool (pool_size + max_overflow) terlalu kecil
+    untuk jumlah thread/worker gunicorn yang memakainya.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            self._record_wait(time.perf_counter() - started)
+
+    def _record_wait(self, seconds):
+        ms = seconds * 1000.0
+        index = next((i for i, bound in enumerate(WAIT_BUCKETS_MS) if ms <= bound), len(WAIT_BUCKETS_MS))
+        with self._stats_lock:
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            self.wait_buckets[index] += 1
+
+    def wait_stats(self):
+        with self._stats_lock:
+            labels = [f'<={bound}ms' for bound in WAIT_BUCKETS_MS] + [f'>{WAIT_BUCKETS_MS[-1]}ms']
+            return {
+                'size': self.size(),
+                'checked_out': self.checkedout(),
+                'overflow': self.overflow(),
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'wait_avg_ms': round(self.wait_total / self.checkouts * 1000.0, 3) if self.checkouts else 0.0,
+                'wait_max_ms': round(self.wait_max * 1000.0, 3),
+                'wait_histogram': dict(zip(labels, self.wait_buckets)),
+            }
+
+
+def engine_options(config, uri):
+    """Opsi engine SQLAlchemy dari Config. SQLite memakai default Flask-SQLAlchemy."""
+    if not uri or uri.startswith('sqlite'):
+        return {}
+    return {
+        'poolclass': TimedQueuePool,
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': config['DB_POOL_PRE_PING'],
+    }
+
+
+def configure(app):
+    """Isi SQLALCHEMY_ENGINE_OPTIONS & SQLALCHEMY_BINDS (replika). Panggil sebelum db.init_app."""
+    config = app.config
+    config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {})
+    for key, value in engine_options(config, config['SQLALCHEMY_DATABASE_URI']).items():
+        config['SQLALCHEMY_ENGINE_OPTIONS'].setdefault(key, value)
+
+    binds = dict(config.get('SQLALCHEMY_BINDS') or {})
+    replicas = []
+    for index, url in enumerate(config['DATABASE_REPLICA_URLS']):
+        key = f'{REPLICA_PREFIX}{index}'
+        binds[key] = {'url': url, **engine_options(config, url)}
+        replicas.append(key)
+    config['SQLALCHEMY_BINDS'] = binds
+    app.extensions['db_replicas'] = replicas
+
+
+class RoutingSession(Session):
+    """Session yang mengarahkan baca di request GET/HEAD ke replika (round-robin).
+
+    Semua yang lain ke primary: request tulis (POST/PUT/PATCH/DELETE), kode di
+    luar request (CLI, thread background), flush, dan semua query setelah
+    session ini pernah menulis, agar data yang baru ditulis langsung terbaca.
+    Route GET yang harus membaca data terbaru bisa memanggil `use_primary()`.
+    """
+
+    _counter = itertools.count()
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._read_from_replica():
+            replicas = current_app.extensions.get('db_replicas')
+            if replicas:
+                key = replicas[next(self._counter) % len(replicas)]
+                return self._db.engines[key]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _read_from_replica(self):
+        if self._flushing or self.info.get('use_primary'):
+            return False
+        if self.new or self.dirty or self.deleted:
+            return False
+        return has_request_context() and request.method in READ_METHODS
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _stick_to_primary(session, flush_context):
+    session.info['use_primary'] = True
+
+
+def use_primary(session=None):
+    """Paksa sisa request ini membaca dari primary."""
+    from app.extensions import db
+
+    (session or db.session()).info['use_primary'] = True
+
+
+def pool_stats(db):
+    """Statistik pool per engine (primary & replika) untuk /api/stats/db."""
+    stats = {}
+    for key, engine in db.engines.items():
+        name = key or 'primary'
+        pool = engine.pool
+        if isinstance(pool, TimedQueuePool):
+            stats[name] = pool.wait_stats()
+        else:
+            stats[name] = {'pool': type(pool).__name__, 'status': pool.status()}
+        stats[name]['url'] = engine.url.render_as_string(hide_password=True)
+    return stats
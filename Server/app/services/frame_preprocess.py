@@ -0,0 +1,175 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# Faktor pengecilan yang didukung decoder JPEG OpenCV (IMREAD_REDUCED_COLOR_*)
+REDUCTIONS = (8, 4, 2)
+
+# Marker JPEG SOF (Start Of Frame) yang menyimpan ukuran gambar
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+STAGES = ('decode', 'preprocess', 'infer', 'postprocess')
+
+
+def jpeg_size(data):
+    """Baca (lebar, tinggi) dari header JPEG tanpa decode. None jika bukan JPEG."""
+    if len(data) < 4 or data[0] != 0xFF or data[1] != 0xD8:
+        return None
+    i = 2
+    length = len(data)
+    while i + 9 < length:
+        if data[i] != 0xFF:
+            i += 1
+            continue
+        marker = data[i + 1]
+        if marker == 0xFF:
+            i += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            i += 2
+            continue
+        segment = (data[i + 2] << 8) | data[i + 3]
+        if marker in _SOF_MARKERS:
+            height = (data[i + 5] << 8) | data[i + 6]
+            width = (data[i + 7] << 8) | data[i + 8]
+            return width, height
+        i += 2 + segment
+    return None
+
+
+def pick_reduction(data, min_side):
+    """Faktor pengecilan terbesar yang sisi panjang hasilnya masih >= `min_side`."""
+    if not min_side:
+        return 1
+    size = jpeg_size(data)
+    if not size:
+        return 1
+    long_side = max(size)
+    for factor in REDUCTIONS:
+        if long_side // factor >= min_side:
+            return factor
+    return 1
+
+
+def decode_frame(data, min_side=0):
+    """Decode JPEG/PNG ke BGR, langsung di resolusi kecil jika gambar jauh lebih besar dari input model.
+
+    YOLO akan meresize ke ukuran inputnya sendiri, jadi decode full-size untuk
+    frame 1280x720 ke atas hanya membuang waktu. Mengembalikan (img, factor).
+    """
+    import cv2
+    import numpy as np
+
+    factor = pick_reduction(data, min_side)
+    flags = {
+        1: cv2.IMREAD_COLOR,
+        2: cv2.IMREAD_REDUCED_COLOR_2,
+        4: cv2.IMREAD_REDUCED_COLOR_4,
+        8: cv2.IMREAD_REDUCED_COLOR_8,
+    }[factor]
+    img = cv2.imdecode(np.frombuffer(data, np.uint8), flags)
+    return img, factor
+
+
+def dhash(img, hash_size=16):
+    """Perceptual difference hash (dHash) sebagai integer `hash_size * hash_size` bit."""
+    import cv2
+    import numpy as np
+
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+    small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+
+def crop_to_roi(img, box, margin=0.75, min_size=96):
+    """Potong frame di sekitar `box` (x1, y1, x2, y2) yang diperlebar sebesar `margin`.
+
+    Mengembalikan (crop, (offset_x, offset_y)). Jika tidak ada box, frame utuh dikembalikan.
+    """
+    if not box:
+        return img, (0, 0)
+
+    height, width = img.shape[:2]
+    x1, y1, x2, y2 = box
+    pad_x = max((x2 - x1) * margin, min_size / 2.0)
+    pad_y = max((y2 - y1) * margin, min_size / 2.0)
+
+    left = max(0, int(x1 - pad_x))
+    top = max(0, int(y1 - pad_y))
+    right = min(width, int(x2 + pad_x))
+    bottom = min(height, int(y2 + pad_y))
+    if right - left < min_size or bottom - top < min_size:
+        return img, (0, 0)
+    return img[top:bottom, left:right], (left, top)
+
+
+def shift_box(detection, offset):
+    """Kembalikan koordinat box hasil deteksi pada crop ke koordinat frame utuh."""
+    if not detection or not detection.get('box') or offset == (0, 0):
+        return detection
+    ox, oy = offset
+    x1, y1, x2, y2 = detection['box']
+    return {**detection, 'box': [x1 + ox, y1 + oy, x2 + ox, y2 + oy]}
+
+
+class StageTimer:
+    """Pencatat durasi tiap tahap (decode, preprocess, infer, postprocess) untuk satu frame."""
+
+    def __init__(self):
+        self.durations = {}
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] = self.durations.get(name, 0.0) + (time.perf_counter() - started)
+
+    def as_dict(self):
+        return {name: round(value * 1000.0, 3) for name, value in self.durations.items()}
+
+
+class PipelineStats:
+    """Akumulasi durasi per tahap untuk semua frame di proses ini."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._count = {}
+        self._total = {}
+        self._max = {}
+        self.frames = 0
+        self.skipped = 0
+        self.cropped = 0
+
+    def record(self, timer, skipped=False, cropped=False):
+        with self._lock:
+            self.frames += 1
+            self.skipped += int(skipped)
+            self.cropped += int(cropped)
+            for name, value in timer.durations.items():
+                self._count[name] = self._count.get(name, 0) + 1
+                self._total[name] = self._total.get(name, 0.0) + value
+                self._max[name] = max(self._max.get(name, 0.0), value)
+
+    def snapshot(self):
+        with self._lock:
+            stages = {
+                name: {
+                    'count': self._count[name],
+                    'avg_ms': round(self._total[name] / self._count[name] * 1000.0, 3),
+                    'max_ms': round(self._max[name] * 1000.0, 3),
+                }
+                for name in STAGES if name in self._count
+            }
+            return {
+                'frames': self.frames,
+                'skipped_inferences': self.skipped,
+                'roi_cropped': self.cropped,
+                'stages': stages,
+            }
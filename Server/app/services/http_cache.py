@@ -0,0 +1,114 @@
+import datetime
+import hashlib
+
+from flask import current_app, request
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models.cache_version_model import CacheVersion
+
+
+def _as_utc(value):
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=datetime.timezone.utc)
+    return value.astimezone(datetime.timezone.utc)
+
+
+def tags_version(tags):
+    """(jumlah versi semua `tags`, waktu invalidasi terakhir); (0, None) jika belum pernah."""
+    if not tags:
+        return 0, None
+    return tuple(db.session.execute(
+        db.select(func.coalesce(func.sum(CacheVersion.version), 0), func.max(CacheVersion.updated_at))
+        .where(CacheVersion.tag.in_(tags))
+    ).one())
+
+
+def table_version(model, *filters, tags=()):
+    """Token versi murah untuk isi tabel: (jumlah baris, id terbesar, waktu perubahan terakhir, versi tag).
+
+    Satu query agregat tanpa memuat baris, plus satu lookup versi tag. Jumlah
+    & id terbesar menangkap insert/delete, max(created_at/updated_at)
+    menangkap update. Versi `tags` (lihat bump_versions) menangkap yang tidak
+    terlihat dari tabel ini: perubahan tabel yang di-join (nama admin) dan
+    dua update dalam detik yang sama (DATETIME MySQL tanpa pecahan detik).
+    Mengembalikan (parts, last_modified).
+    """
+    stamps = [model.created_at] + ([model.updated_at] if hasattr(model, 'updated_at') else [])
+    columns = [func.count(model.id), func.max(model.id)] + [func.max(column) for column in stamps]
+    row = db.session.query(*columns).filter(*filters).one()
+    version, bumped_at = tags_version(tags)
+    return tuple(row) + (version,), _last_modified(row[2:] + (bumped_at,))
+
+
+def row_version(model, item_id, tags=()):
+    """Token versi satu baris; (None, None) jika baris tidak ada."""
+    stamps = [model.created_at] + ([model.updated_at] if hasattr(model, 'updated_at') else [])
+    row = db.session.query(model.id, *stamps).filter(model.id == item_id).first()
+    if row is None:
+        return None, None
+    version, bumped_at = tags_version(tags)
+    return tuple(row) + (version,), _last_modified(row[1:] + (bumped_at,))
+
+
+def _last_modified(values):
+    stamps = [_as_utc(value) for value in values if value is not None]
+    return max(stamps) if stamps else None
+
+
+def bump_versions(*tags):
+    """Naikkan versi tiap tag. Dipanggil `cache.invalidate()` setelah commit.
+
+    Memakai koneksi sendiri ke primary, terpisah dari transaksi session request.
+    """
+    table = CacheVersion.__table__
+    for tag in tags:
+        increment = table.update().where(table.c.tag == tag).values(version=table.c.version + 1,
+                                                                    updated_at=func.now())
+        try:
+            with db.engine.begin() as conn:
+                if not conn.execute(increment).rowcount:
+                    conn.execute(table.insert().values(tag=tag, version=1, updated_at=func.now()))
+        except IntegrityError:
+            # Proses lain baru saja membuat baris tag ini
+            with db.engine.begin() as conn:
+                conn.execute(increment)
+
+
+def cached_response(parts, last_modified, build):
+    """Jawab GET secara kondisional (ETag + Last-Modified).
+
+    ETag dihitung dari token versi + path lengkap (filter/fields/cursor ikut
+    menentukan isi). Jika client mengirim If-None-Match / If-Modified-Since
+    yang masih cocok, langsung 304 tanpa memanggil `build()` (serializer).
+    """
+    digest = hashlib.sha1(repr((parts, request.full_path)).encode()).hexdigest()[:20]
+
+    if last_modified is not None:
+        # Header HTTP hanya presisi sampai detik
+        last_modified = last_modified.replace(microsecond=0)
+
+    not_modified = False
+    if request.if_none_match:
+        not_modified = request.if_none_match.contains_weak(digest)
+    elif request.if_modified_since and last_modified is not None:
+        not_modified = last_modified <= request.if_modified_since
+
+    if not_modified:
+        response = current_app.response_class(status=304)
+    else:
+        response = current_app.make_response(build())
+        if response.status_code != 200:
+            # Error (400 dsb.) tidak diberi ETag agar tidak ikut di-cache
+            return response
+
+    response.set_etag(digest, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config['HTTP_CACHE_MAX_AGE']
+    response.cache_control.must_revalidate = True
+    return response
@@ -0,0 +1,269 @@
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Format hasil -> (format Pillow, ekstensi, MIME, opsi encoder)
+FORMATS = {
+    'avif': ('AVIF', 'avif', 'image/avif', {'quality': 60, 'speed': 6}),
+    'webp': ('WEBP', 'webp', 'image/webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', 'image/jpeg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def parse_sizes(value):
+    """"96,256,512" -> [96, 256, 512] (sisi terpanjang dalam piksel), terkecil dulu."""
+    return sorted({int(part) for part in (value or '').split(',') if part.strip()})
+
+
+def available_formats(names):
+    """Format yang diminta dan didukung Pillow terpasang (AVIF butuh Pillow >= 11.3 / pillow-avif-plugin)."""
+    from PIL import features
+
+    formats = []
+    for name in names:
+        name = name.strip().lower()
+        if name in FORMATS and (name == 'jpeg' or features.check(name)):
+            formats.append(name)
+    if 'jpeg' not in formats:
+        # Selalu ada cadangan yang bisa dibuka semua browser
+        formats.append('jpeg')
+    return formats
+
+
+def _load(source, largest):
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as opened:
+        # JPEG besar didecode langsung di resolusi yang lebih kecil (DCT scaling)
+        opened.draft('RGB', (largest, largest))
+        opened.seek(0)  # GIF/WebP animasi: frame pertama
+        # Selalu salinan yang sudah dimuat (info/profil ICC ikut), file sumber langsung ditutup
+        image = ImageOps.exif_transpose(opened)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA') else 'RGB')
+    return image
+
+
+def render_variants(source, out_dir, stem, sizes, formats):
+    """Ubah satu gambar upload menjadi beberapa ukuran & format, tanpa metadata.
+
+    Hasil di `out_dir/stem/`:
+    - stem_<ukuran>.<ext>: tiap ukuran (sisi terpanjang) x tiap format
+    - stem.jpg: JPEG ukuran terbesar (pengganti file asli)
+
+    Hanya ukuran yang lebih kecil dari gambar asli yang dibuat (minimal
+    satu). EXIF/XMP/komentar dibuang, orientasi EXIF diterapkan dulu;
+    profil warna ICC dipertahankan. Ditulis ke folder sementara lalu
+    di-rename seperti transcode() video. Mengembalikan {'variants': [...], 'main': nama_file, ...}.
+    """
+    from PIL import Image
+
+    started = time.perf_counter()
+    source_bytes = os.path.getsize(source)
+    image = _load(source, max(sizes))
+    icc_profile = image.info.get('icc_profile')
+    # Semua metadata lain (EXIF, XMP, komentar) tidak ikut disimpan
+    image.info = {}
+    longest = max(image.size)
+    targets = [size for size in sizes if size < longest] or [longest]
+    if longest < max(sizes) and longest not in targets:
+        targets.append(longest)
+
+    staging = os.path.join(out_dir, f'.{stem}.partial')
+    final = os.path.join(out_dir, stem)
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    variants = []
+    try:
+        for size in targets:
+            resized = image.copy()
+            resized.thumbnail((size, size), resample=Image.Resampling.LANCZOS)
+            for name in formats:
+                fmt, ext, mime, options = FORMATS[name]
+                frame = resized
+                if fmt == 'JPEG' and frame.mode == 'RGBA':
+                    frame = _flatten(frame)
+                filename = f'{stem}.jpg' if fmt == 'JPEG' and size == targets[-1] else f'{stem}_{size}.{ext}'
+                frame.save(os.path.join(staging, filename), fmt, icc_profile=icc_profile, **options)
+                variants.append({'file': filename, 'type': mime, 'width': frame.width, 'height': frame.height,
+                                 'bytes': os.path.getsize(os.path.join(staging, filename))})
+
+        shutil.rmtree(final, ignore_errors=True)
+        os.replace(staging, final)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    return {
+        'variants': variants,
+        'main': f'{stem}.jpg',
+        'source_bytes': source_bytes,
+        'seconds': round(time.perf_counter() - started, 3),
+    }
+
+
+def _flatten(image):
+    from PIL import Image
+
+    background = Image.new('RGB', image.size, (255, 255, 255))
+    background.paste(image, mask=image.getchannel('A'))
+    return background
+
+
+class ImageIngestor:
+    """Buat thumbnail foto profil & gambar informasi di background thread.
+
+    Sama seperti VideoIngestor: route menyimpan file asli (langsung bisa
+    ditampilkan), lalu memanggil `submit()` setelah commit. Setelah selesai,
+    semua baris yang memakai file itu menunjuk ke JPEG tanpa metadata dan
+    kolom varian terisi; file asli (beserta EXIF/GPS-nya) dihapus.
+    """
+
+    # Koleksi media -> config daftar ukuran
+    SIZE_CONFIG = {'foto_profile': 'IMAGE_PROFILE_SIZES', 'info_images': 'IMAGE_INFO_SIZES'}
+
+    def __init__(self):
+        self.app = None
+        self.enabled = False
+        self.formats = []
+        self.sizes = {}
+        self._executor = None
+        self._lock = threading.Lock()
+        self.processed = 0
+        self.failed = 0
+
+    def init_app(self, app):
+        config = app.config
+        self.app = app
+        self.enabled = bool(config['IMAGE_THUMBNAILS'])
+        requested = config['IMAGE_FORMATS'].split(',')
+        self.formats = available_formats(requested)
+        skipped = sorted({name.strip().lower() for name in requested} - set(self.formats) - {''})
+        if self.enabled and skipped:
+            app.logger.warning('Format gambar tidak didukung Pillow terpasang, dilewati: %s', ', '.join(skipped))
+        self.sizes = {collection: parse_sizes(config[key]) for collection, key in self.SIZE_CONFIG.items()}
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=max(1, config['IMAGE_INGEST_CONCURRENCY']),
+                                                    thread_name_prefix='image-ingest')
+
+    def _target(self, collection):
+        """(model, kolom URL, kolom varian, tag cache) untuk koleksi media."""
+        from app.models.information_model import Information
+        from app.models.user_model import User
+
+        return {
+            'foto_profile': (User, User.profile_pic_url, User.profile_pic_variants, 'users'),
+            'info_images': (Information, Information.image_url, Information.image_variants, 'information'),
+        }[collection]
+
+    def assign(self, collection, item, url):
+        """Pasang gambar upload (`url` dari MediaStore.put) ke `item`.
+
+        Jika baris lain (atau `item` sendiri) sudah memakai isi gambar yang
+        sama, URL & thumbnail-nya ikut dipakai dan True dikembalikan.
+        """
+        from app.services.media_store import media_store
+
+        model, url_column, variants_column, _ = self._target(collection)
+        twin = model.query.filter(media_store.same_content(url_column, url)).order_by(model.id).first()
+        if twin is not None:
+            url, variants = getattr(twin, url_column.key), getattr(twin, variants_column.key)
+        else:
+            variants = None
+        setattr(item, url_column.key, url)
+        setattr(item, variants_column.key, variants)
+        return twin is not None
+
+    def after_commit(self, collection, item_url, stored, shared):
+        """Jadwalkan thumbnail untuk upload baru; jika memakai thumbnail yang
+        sudah ada, file asli yang baru ditulis put() tidak diperlukan lagi."""
+        from app.services.media_store import media_store
+
+        if not shared:
+            self.submit(collection, item_url)
+        elif not stored['deduplicated'] and media_store.relpath(item_url) != media_store.relpath(stored['url']):
+            media_store.release(stored['url'], min_age=0)
+
+    def submit(self, collection, url):
+        """Jadwalkan pembuatan thumbnail (panggil setelah commit). False jika nonaktif."""
+        if not self.enabled or not url:
+            return False
+        self._executor.submit(self._run_in_context, collection, url)
+        return True
+
+    def _run_in_context(self, collection, url):
+        with self.app.app_context():
+            try:
+                self.process(collection, url)
+            except Exception as e:
+                self.app.logger.exception('Thumbnail %s gagal: %s', url, e)
+
+    def process(self, collection, url):
+        """Proses sekarang (di thread ini). Butuh app context. True jika varian tersimpan."""
+        from app.services.media_store import media_store
+
+        rel = media_store.relpath(url)
+        if not rel:
+            return False
+        source = media_store.disk_path(rel)
+        stem = os.path.splitext(os.path.basename(source))[0]
+        out_dir = os.path.dirname(source)
+
+        try:
+            result = render_variants(source, out_dir, stem, self.sizes[collection], self.formats)
+        except Exception as e:
+            self.failed += 1
+            self.app.logger.warning('Thumbnail %s gagal: %s', url, e)
+            return False
+
+        prefix = f"{url.rsplit('/', 1)[0]}/{stem}"
+        variants = [
+            {'src': f"{prefix}/{variant['file']}", 'type': variant['type'], 'width': variant['width'],
+             'height': variant['height'], 'bytes': variant['bytes']}
+            for variant in result['variants']
+        ]
+        if not self._apply(collection, url, f"{prefix}/{result['main']}", variants):
+            shutil.rmtree(os.path.join(out_dir, stem), ignore_errors=True)
+            return False
+
+        self.processed += 1
+        try:
+            # Upload lain dengan isi sama bisa saja baru saja menunjuk ke file asli ini
+            if not media_store.references(url):
+                os.remove(source)
+        except OSError:
+            pass
+        smallest = min(variant['bytes'] for variant in variants)
+        self.app.logger.info('Gambar %s: %d byte -> %d varian (terkecil %d byte) dalam %.2f s', url,
+                             result['source_bytes'], len(variants), smallest, result['seconds'])
+        return True
+
+    def _apply(self, collection, url, main_url, variants):
+        """Simpan hasil ke semua baris yang masih memakai `url`."""
+        from app.extensions import cache, db
+
+        model, url_column, variants_column, tag = self._target(collection)
+        updated = db.session.execute(
+            db.update(model).where(url_column == url).values({url_column: main_url, variants_column: variants})
+        ).rowcount
+        if not updated:
+            db.session.rollback()
+            return False
+        db.session.commit()
+        cache.invalidate(tag)
+        return True
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'processed': self.processed,
+            'failed': self.failed,
+            'formats': self.formats,
+            'sizes': self.sizes,
+        }
+
+
+image_ingestor = ImageIngestor()
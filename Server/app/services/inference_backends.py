@@ -0,0 +1,165 @@
+import os
+import statistics
+import time
+
+# Backend inferensi yang didukung. Semua dijalankan lewat `ultralytics.YOLO`,
+# yang otomatis memakai ONNX Runtime / OpenVINO sesuai format file model,
+# sehingga format hasil (result.boxes, model.names) tetap sama.
+BACKENDS = ('torch', 'onnx', 'openvino')
+
+MODEL_NAME = 'best'
+
+
+def model_path_for(backend, model_dir, int8=False):
+    """Lokasi file/folder model untuk backend tertentu di dalam `model_dir`."""
+    if backend == 'torch':
+        return os.path.join(model_dir, f'{MODEL_NAME}.pt')
+    if backend == 'onnx':
+        return os.path.join(model_dir, f'{MODEL_NAME}.int8.onnx' if int8 else f'{MODEL_NAME}.onnx')
+    if backend == 'openvino':
+        suffix = '_int8_openvino_model' if int8 else '_openvino_model'
+        return os.path.join(model_dir, f'{MODEL_NAME}{suffix}')
+    raise ValueError(f"Backend '{backend}' tidak dikenal. Pilihan: {', '.join(BACKENDS)}")
+
+
+def load_model(backend='torch', model_dir=None, int8=False):
+    """Load model YOLO untuk backend yang dipilih (CPU)."""
+    from ultralytics import YOLO
+
+    path = model_path_for(backend, model_dir, int8=int8)
+    if not os.path.exists(path):
+        hint = '' if backend == 'torch' else " Jalankan 'flask ai-export' dulu."
+        raise FileNotFoundError(f"Model untuk backend '{backend}' tidak ditemukan: {path}.{hint}")
+
+    # task harus disebut eksplisit untuk format hasil export (onnx/openvino)
+    return YOLO(path, task='detect')
+
+
+def export_model(model_dir, fmt='onnx', int8=False, imgsz=640, data=None):
+    """Export `best.pt` ke ONNX atau OpenVINO. Mengembalikan path hasil export.
+
+    - ONNX diexport dengan batch dinamis agar bisa dipakai micro-batching.
+      INT8 untuk ONNX memakai dynamic quantization dari ONNX Runtime
+      (tidak butuh data kalibrasi).
+    - OpenVINO INT8 memakai kuantisasi NNCF dari ultralytics; `data`
+      (file yaml dataset) dipakai sebagai data kalibrasi jika diberikan.
+    """
+    from ultralytics import YOLO
+
+    if fmt not in ('onnx', 'openvino'):
+        raise ValueError("Format export harus 'onnx' atau 'openvino'")
+
+    source = model_path_for('torch', model_dir)
+    model = YOLO(source)
+
+    if fmt == 'onnx':
+        exported = model.export(format='onnx', imgsz=imgsz, dynamic=True, simplify=True)
+        if not int8:
+            return exported
+
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        target = model_path_for('onnx', model_dir, int8=True)
+        quantize_dynamic(exported, target, weight_type=QuantType.QUInt8)
+        return target
+
+    options = {'format': 'openvino', 'imgsz': imgsz, 'dynamic': True, 'int8': int8}
+    if int8 and data:
+        options['data'] = data
+    exported = model.export(**options)
+
+    # Samakan nama folder dengan yang dicari model_path_for
+    target = model_path_for('openvino', model_dir, int8=int8)
+    if os.path.abspath(exported) != os.path.abspath(target) and not os.path.exists(target):
+        os.replace(exported, target)
+    return target
+
+
+def top_detection(model, result):
+    """Deteksi dengan confidence tertinggi pada satu hasil YOLO (atau None)."""
+    if not result.boxes:
+        return None
+    # result.boxes[0] otomatis adalah box dengan confidence tertinggi di YOLO
+    box = result.boxes[0]
+    class_id = int(box.cls[0])
+    return {
+        'class_id': class_id,
+        'text': model.names[class_id],
+        'confidence': float(box.conf[0]),
+        # Koordinat (x1, y1, x2, y2) pada gambar input, dipakai untuk crop ROI frame berikutnya
+        'box': [round(float(v), 1) for v in box.xyxy[0].tolist()],
+    }
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def compare_backends(images, backends, model_dir, conf=0.60, int8=False, warmup=3):
+    """Bandingkan latency dan kecocokan hasil tiap backend terhadap PyTorch.
+
+    `images` adalah list array BGR. Hasil PyTorch dipakai sebagai acuan:
+    `label_agreement` = persentase frame dengan label (atau "tidak ada deteksi")
+    yang sama, `max_conf_delta` = selisih confidence terbesar pada frame yang cocok.
+    """
+    if not images:
+        raise ValueError('Tidak ada gambar untuk dibandingkan')
+
+    order = ['torch'] + [name for name in backends if name != 'torch']
+    reference = None
+    report = []
+
+    for backend in order:
+        use_int8 = int8 and backend != 'torch'
+        model = load_model(backend, model_dir, int8=use_int8)
+
+        for img in images[:warmup]:
+            model(img, conf=conf, verbose=False)
+
+        latencies = []
+        detections = []
+        for img in images:
+            started = time.perf_counter()
+            results = model(img, conf=conf, verbose=False)
+            latencies.append((time.perf_counter() - started) * 1000.0)
+            detections.append(top_detection(model, results[0]))
+
+        if reference is None:
+            reference = detections
+
+        matches = 0
+        conf_deltas = []
+        for ours, ref in zip(detections, reference):
+            if (ours and ours['text']) == (ref and ref['text']):
+                matches += 1
+                if ours and ref:
+                    conf_deltas.append(abs(ours['confidence'] - ref['confidence']))
+
+        report.append({
+            'backend': backend,
+            'int8': use_int8,
+            'frames': len(images),
+            'mean_ms': round(statistics.mean(latencies), 2),
+            'p50_ms': round(_percentile(latencies, 50), 2),
+            'p95_ms': round(_percentile(latencies, 95), 2),
+            'fps': round(1000.0 / statistics.mean(latencies), 2),
+            'detected_frames': sum(1 for d in detections if d),
+            'label_agreement': round(matches / len(images) * 100.0, 2),
+            'max_conf_delta': round(max(conf_deltas), 4) if conf_deltas else 0.0,
+        })
+
+    return report
+
+
+def format_report(report):
+    """Tabel teks sederhana dari hasil `compare_backends`."""
+    header = f"{'backend':<10} {'int8':<5} {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8} {'fps':>7} {'detected':>9} {'agree %':>8} {'max dconf':>10}"
+    lines = [header, '-' * len(header)]
+    for row in report:
+        lines.append(
+            f"{row['backend']:<10} {str(row['int8']):<5} {row['mean_ms']:>8} {row['p50_ms']:>8} {row['p95_ms']:>8} "
+            f"{row['fps']:>7} {row['detected_frames']:>9} {row['label_agreement']:>8} {row['max_conf_delta']:>10}"
+        )
+    return '\n'.join(lines)
@@ -0,0 +1,198 @@
+import itertools
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+
+# Prioritas frame di antrian: frame realtime (/predict, /stream) selalu
+# diambil lebih dulu daripada frame job transkripsi video.
+REALTIME = 0
+BACKGROUND = 1
+
+
+class InferenceBatcher:
+    """Penjadwal micro-batch untuk inferensi YOLO.
+
+    Frame dari banyak request dikumpulkan sampai `max_batch_size` frame atau
+    sampai `max_wait_ms` milidetik berlalu sejak frame pertama masuk, lalu
+    dijalankan sekaligus lewat `run_batch(images)`. Hasil per-frame
+    dikembalikan ke masing-masing request melalui `Future`.
+
+    Jika `submit_batch` diberikan (fungsi yang mengembalikan `Future`, misal
+    milik pool proses inferensi), batch dikirim tanpa ditunggu sehingga
+    sampai `max_in_flight` batch bisa diproses paralel oleh worker berbeda.
+    Batch yang belum selesai setelah `batch_timeout` detik digagalkan dengan
+    TimeoutError agar slot-nya kembali walaupun worker macet.
+
+    Frame ber-`priority` BACKGROUND (job video) hanya mengisi batch saat tidak
+    ada frame REALTIME yang menunggu, jadi upload panjang tidak menahan
+    rekognisi realtime.
+    """
+
+    def __init__(self, run_batch=None, max_batch_size=8, max_wait_ms=15, submit_batch=None, max_in_flight=1,
+                 batch_timeout=30):
+        if run_batch is None and submit_batch is None:
+            raise ValueError('run_batch atau submit_batch wajib diisi')
+        self._run_batch = run_batch
+        self._submit_batch = submit_batch
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self._in_flight = threading.BoundedSemaphore(max(1, int(max_in_flight)))
+        self.batch_timeout = float(batch_timeout) if batch_timeout else None
+
+        self._queue = queue.PriorityQueue()
+        # Urutan masuk untuk frame berprioritas sama (FIFO)
+        self._sequence = itertools.count()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+        # --- Statistik untuk tuning throughput vs latency ---
+        self._stats_lock = threading.Lock()
+        self._batch_sizes = Counter()
+        self._frames = 0
+        self._batches = 0
+        self._errors = 0
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+        self._infer_total = 0.0
+
+    def submit(self, image, priority=REALTIME):
+        """Masukkan satu frame ke antrian. Mengembalikan `Future` berisi hasilnya."""
+        self._ensure_started()
+        future = Future()
+        self._queue.put((priority, next(self._sequence), (image, future, time.perf_counter())))
+        return future
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name='inference-batcher', daemon=True)
+                self._thread.start()
+
+    def _collect(self):
+        """Tunggu frame pertama, lalu kumpulkan sisanya sampai batch penuh atau waktu habis."""
+        batch = [self._queue.get()[2]]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining)[2])
+            except queue.Empty:
+                break
+        # Frame yang sudah dibatalkan pemanggilnya (misal job video gagal) tidak diinferensi
+        return [item for item in batch if not item[1].cancelled()]
+
+    def _loop(self):
+        while True:
+            batch = self._collect()
+            if not batch:
+                continue
+            images = [item[0] for item in batch]
+
+            # Batasi jumlah batch yang sedang diproses (backpressure ke antrian)
+            self._in_flight.acquire()
+            started = time.perf_counter()
+
+            if self._submit_batch is not None:
+                try:
+                    pending = self._submit_batch(images)
+                except Exception as e:
+                    self._finish(batch, started, error=e)
+                    continue
+                self._watch(pending, batch, started)
+                continue
+
+            try:
+                results = self._run_batch(images)
+            except Exception as e:
+                self._finish(batch, started, error=e)
+                continue
+            self._finish(batch, started, results=results)
+
+    def _watch(self, pending, batch, started):
+        """Selesaikan batch saat `pending` selesai atau saat batch_timeout lewat,
+        mana yang lebih dulu; slot in-flight dilepas tepat sekali."""
+        once = threading.Lock()
+        timer = None
+
+        def finish(**outcome):
+            if not once.acquire(blocking=False):
+                return
+            if timer is not None:
+                timer.cancel()
+            self._finish(batch, started, **outcome)
+
+        def on_done(future):
+            if future.cancelled():
+                finish(error=RuntimeError('Batch inferensi dibatalkan'))
+            elif future.exception() is not None:
+                finish(error=future.exception())
+            else:
+                finish(results=future.result())
+
+        def on_timeout():
+            # `pending` milik pool: jangan dibatalkan, cukup berhenti menunggu.
+            # Jawaban worker yang datang terlambat diabaikan oleh `finish`.
+            finish(error=TimeoutError(f'Batch inferensi tidak selesai dalam {self.batch_timeout:g} detik'))
+
+        if self.batch_timeout:
+            timer = threading.Timer(self.batch_timeout, on_timeout)
+            timer.daemon = True
+            timer.start()
+        pending.add_done_callback(on_done)
+
+    def _finish(self, batch, started, results=None, error=None):
+        """Bagikan hasil batch ke masing-masing request yang menunggu."""
+        try:
+            if error is None and len(results) != len(batch):
+                error = RuntimeError(f'Jumlah hasil ({len(results)}) tidak sama dengan jumlah frame ({len(batch)})')
+
+            for index, (_, future, _) in enumerate(batch):
+                # Request yang sudah dibatalkan pemanggilnya dilewati
+                if not future.set_running_or_notify_cancel():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(results[index])
+            self._record(batch, started, failed=error is not None)
+        finally:
+            self._in_flight.release()
+
+    def _record(self, batch, started, failed=False):
+        finished = time.perf_counter()
+        with self._stats_lock:
+            self._batches += 1
+            self._frames += len(batch)
+            self._batch_sizes[len(batch)] += 1
+            self._infer_total += finished - started
+            if failed:
+                self._errors += 1
+            for _, _, enqueued in batch:
+                wait = started - enqueued
+                self._queue_wait_total += wait
+                self._queue_wait_max = max(self._queue_wait_max, wait)
+
+    def stats(self):
+        """Ringkasan ukuran batch yang tercapai dan waktu tunggu antrian."""
+        with self._stats_lock:
+            batches = self._batches
+            frames = self._frames
+            return {
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait * 1000.0,
+                'batches': batches,
+                'frames': frames,
+                'errors': self._errors,
+                'pending': self._queue.qsize(),
+                'avg_batch_size': round(frames / batches, 3) if batches else 0,
+                'batch_size_histogram': {str(size): count for size, count in sorted(self._batch_sizes.items())},
+                'avg_queue_wait_ms': round(self._queue_wait_total / frames * 1000.0, 3) if frames else 0,
+                'max_queue_wait_ms': round(self._queue_wait_max * 1000.0, 3),
+                'avg_batch_infer_ms': round(self._infer_total / batches * 1000.0, 3) if batches else 0,
+            }
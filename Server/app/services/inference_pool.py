@@ -0,0 +1,387 @@
+import itertools
+import multiprocessing as mp
+import os
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+# Variabel lingkungan yang membatasi jumlah thread library numerik di worker
+THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'NUMEXPR_NUM_THREADS')
+
+# Exit code worker yang gagal load model; tidak dijalankan ulang
+LOAD_FAILED_EXIT = 3
+
+
+def _resolve(future, ok, payload):
+    """Isi hasil `future` kecuali sudah selesai atau dibatalkan lebih dulu
+    (misal batch-nya sudah kena timeout di batcher atau digagalkan monitor)."""
+    if future.done():
+        return
+    try:
+        if ok:
+            future.set_result(payload)
+        else:
+            future.set_exception(payload if isinstance(payload, BaseException) else RuntimeError(payload))
+    except InvalidStateError:
+        pass
+
+
+def _pin_threads(threads, cpus=None):
+    """Batasi thread library numerik (dan opsional CPU affinity) di proses worker."""
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(threads)
+
+    if cpus and hasattr(os, 'sched_setaffinity'):
+        try:
+            os.sched_setaffinity(0, cpus)
+        except OSError:
+            pass
+
+    import cv2
+    cv2.setNumThreads(threads)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+
+def _worker_main(index, options, tasks, results):
+    """Loop proses worker: load model sekali, lalu proses batch dari antrian."""
+    threads = options['threads']
+    cpus = None
+    if options['pin_cpus']:
+        total = os.cpu_count() or 1
+        cpus = {(index * threads + i) % total for i in range(threads)}
+    _pin_threads(threads, cpus)
+
+    from app.services.inference_backends import load_model, top_detection
+
+    try:
+        model = load_model(options['backend'], options['model_dir'], int8=options['int8'])
+    except Exception as e:
+        results.put(('error', index, repr(e)))
+        results.close()
+        results.join_thread()
+        raise SystemExit(LOAD_FAILED_EXIT)
+    results.put(('ready', index, os.getpid()))
+
+    while True:
+        item = tasks.get()
+        if item is None:
+            break
+        task_id, images = item
+        try:
+            output = model(images, conf=options['conf'], verbose=False)
+            results.put((task_id, True, [top_detection(model, result) for result in output]))
+        except Exception as e:
+            results.put((task_id, False, repr(e)))
+
+
+class InferencePool:
+    """Pool proses inferensi. Setiap proses memegang satu salinan model.
+
+    Request Flask hanya mengirim batch frame ke antrian dan menunggu `Future`,
+    sehingga inferensi yang lambat tidak memblokir thread web untuk route lain.
+    Tiap worker punya antrian sendiri, jadi jika prosesnya mati (OOM, segfault)
+    batch yang sedang ditanganinya langsung digagalkan dan worker dijalankan ulang.
+    """
+
+    # Jeda pengecekan proses worker yang mati (detik)
+    MONITOR_INTERVAL = 1.0
+
+    def __init__(self, workers, backend, model_dir, int8=False, threads=1, conf=0.60, pin_cpus=False):
+        self.workers = max(1, int(workers))
+        self.options = {
+            'backend': backend,
+            'model_dir': model_dir,
+            'int8': int8,
+            'threads': max(1, int(threads)),
+            'conf': conf,
+            'pin_cpus': pin_cpus,
+        }
+
+        # spawn: worker tidak mewarisi state Flask/koneksi database dari proses induk
+        self._ctx = mp.get_context('spawn')
+        self._results = self._ctx.Queue()
+        self._queues = [None] * self.workers
+        self._processes = [None] * self.workers
+
+        self._ids = itertools.count()
+        self._pending = {}
+        # task_id -> index worker yang menerimanya
+        self._assigned = {}
+        self._ready = set()
+        self._load_failed = set()
+        # Worker mati yang sudah ditangani tetapi tidak dijalankan ulang
+        self._stopped = set()
+        self._lock = threading.Lock()
+        self._closing = False
+        self.errors = []
+        self.completed = 0
+        self.restarts = 0
+
+        for index in range(self.workers):
+            self._start_worker(index)
+        self._dispatcher = threading.Thread(target=self._dispatch, name='inference-pool-results', daemon=True)
+        self._dispatcher.start()
+        self._monitor = threading.Thread(target=self._watch, name='inference-pool-monitor', daemon=True)
+        self._monitor.start()
+
+    def _start_worker(self, index):
+        tasks = self._ctx.Queue()
+        process = self._ctx.Process(target=_worker_main, args=(index, self.options, tasks, self._results),
+                                    name=f'inference-worker-{index}', daemon=True)
+        process.start()
+        self._queues[index] = tasks
+        self._processes[index] = process
+
+    @property
+    def ready(self):
+        return bool(self._ready)
+
+    @property
+    def ready_workers(self):
+        return len(self._ready)
+
+    @property
+    def pids(self):
+        return [process.pid for process in self._processes]
+
+    def submit(self, images):
+        """Kirim satu batch frame ke worker. Mengembalikan `Future` berisi list deteksi."""
+        future = Future()
+        with self._lock:
+            candidates = [index for index in range(self.workers) if index not in self._load_failed]
+            if not candidates:
+                future.set_exception(RuntimeError('Tidak ada inference worker yang berhasil memuat model'))
+                return future
+            # Worker yang sudah siap dengan batch paling sedikit
+            load = {index: 0 for index in candidates}
+            for assigned in self._assigned.values():
+                if assigned in load:
+                    load[assigned] += 1
+            index = min(candidates, key=lambda i: (i not in self._ready, load[i]))
+            task_id = next(self._ids)
+            self._pending[task_id] = future
+            self._assigned[task_id] = index
+            self._queues[index].put((task_id, images))
+        return future
+
+    def run_batch(self, images):
+        return self.submit(images).result()
+
+    def _dispatch(self):
+        while True:
+            try:
+                message = self._results.get()
+            except (EOFError, OSError):
+                break
+
+            kind = message[0]
+            if kind == 'ready':
+                with self._lock:
+                    # Pesan dari proses lama yang sudah diganti diabaikan
+                    if self._processes[message[1]].pid == message[2]:
+                        self._ready.add(message[1])
+                continue
+            if kind == 'error':
+                with self._lock:
+                    self._load_failed.add(message[1])
+                self.errors.append(message[2])
+                print(f"Inference worker {message[1]} gagal load model: {message[2]}")
+                continue
+
+            task_id, ok, payload = message
+            with self._lock:
+                future = self._pending.pop(task_id, None)
+                self._assigned.pop(task_id, None)
+                self.completed += 1
+            if future is not None:
+                _resolve(future, ok, payload)
+
+    def _watch(self):
+        """Gagalkan batch milik worker yang mati lalu jalankan worker pengganti."""
+        while not self._closing:
+            time.sleep(self.MONITOR_INTERVAL)
+            for index, process in enumerate(self._processes):
+                if process.is_alive() or self._closing:
+                    continue
+                with self._lock:
+                    if self._processes[index] is not process or index in self._stopped:
+                        continue
+                    self._ready.discard(index)
+                    lost = [task_id for task_id, assigned in self._assigned.items() if assigned == index]
+                    futures = [self._pending.pop(task_id) for task_id in lost if task_id in self._pending]
+                    for task_id in lost:
+                        del self._assigned[task_id]
+                    # Worker yang gagal load model tidak dijalankan ulang terus-menerus
+                    if process.exitcode == LOAD_FAILED_EXIT:
+                        self._load_failed.add(index)
+                    restart = index not in self._load_failed
+                    if restart:
+                        self._start_worker(index)
+                        self.restarts += 1
+                    else:
+                        self._stopped.add(index)
+                error = RuntimeError(f'Inference worker {index} berhenti (exit code {process.exitcode})')
+                self.errors.append(str(error))
+                print(f"{error}; {len(futures)} batch digagalkan" + (', worker dijalankan ulang' if restart else ''))
+                for future in futures:
+                    _resolve(future, False, error)
+
+    def stats(self):
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            'mode': 'pool',
+            'workers': self.workers,
+            'alive_workers': sum(1 for p in self._processes if p.is_alive()),
+            'ready_workers': self.ready_workers,
+            'restarts': self.restarts,
+            'threads_per_worker': self.options['threads'],
+            'pending_batches': pending,
+            'completed_batches': self.completed,
+            'errors': self.errors[-5:],
+        }
+
+    def close(self):
+        self._closing = True
+        for tasks in self._queues:
+            tasks.put(None)
+        for process in self._processes:
+            process.join(timeout=5)
+
+
+# ========= Mode terpisah: worker pool di belakang Unix socket =========
+
+def worker_authkey(secret_key):
+    """SECRET_KEY -> authkey koneksi API <-> `flask ai-worker`.
+
+    Koneksi tanpa authkey bisa dipakai proses lokal mana pun untuk mengirim
+    pickle ke worker, jadi SECRET_KEY kosong ditolak sejak awal.
+    """
+    if not secret_key:
+        raise ValueError('SECRET_KEY wajib diisi untuk AI_WORKER_SOCKET (dipakai sebagai authkey worker)')
+    return secret_key.encode() if isinstance(secret_key, str) else bytes(secret_key)
+
+
+def serve(pool, socket_path, authkey):
+    """Layani batch inferensi dari proses API lain lewat Unix socket (blocking).
+
+    Dipakai oleh perintah `flask ai-worker`, sehingga jumlah proses API dan
+    proses inferensi bisa diatur terpisah.
+    """
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
+    with Listener(socket_path, family='AF_UNIX', authkey=authkey) as listener:
+        while True:
+            try:
+                conn = listener.accept()
+            except Exception as e:
+                print(f"Inference worker: koneksi ditolak ({e})")
+                continue
+            threading.Thread(target=_serve_connection, args=(pool, conn), daemon=True).start()
+
+
+def _serve_connection(pool, conn):
+    send_lock = threading.Lock()
+
+    def reply(task_id, future):
+        error = future.exception()
+        message = (task_id, False, repr(error)) if error else (task_id, True, future.result())
+        with send_lock:
+            try:
+                conn.send(message)
+            except (OSError, EOFError):
+                pass
+
+    with conn:
+        while True:
+            try:
+                task_id, images = conn.recv()
+            except (EOFError, OSError):
+                break
+            pool.submit(images).add_done_callback(lambda future, task_id=task_id: reply(task_id, future))
+
+
+class RemoteInferenceClient:
+    """Client untuk `serve`: proses API tidak memuat model sama sekali."""
+
+    def __init__(self, socket_path, authkey):
+        self.socket_path = socket_path
+        self.authkey = authkey
+        self._conn = None
+        self._ids = itertools.count()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.completed = 0
+
+    @property
+    def ready(self):
+        """True jika worker benar-benar bisa dihubungi (koneksi dibuka bila belum ada)."""
+        with self._lock:
+            try:
+                self._connect()
+            except (OSError, EOFError, AuthenticationError):
+                return False
+        return True
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = Client(self.socket_path, family='AF_UNIX', authkey=self.authkey)
+            threading.Thread(target=self._read, args=(self._conn,), name='inference-client', daemon=True).start()
+        return self._conn
+
+    def submit(self, images):
+        future = Future()
+        with self._lock:
+            task_id = next(self._ids)
+            self._pending[task_id] = future
+            try:
+                self._connect().send((task_id, images))
+            except (OSError, EOFError, AuthenticationError) as e:
+                self._pending.pop(task_id, None)
+                self._conn = None
+                future.set_exception(ConnectionError(f'Inference worker tidak dapat dihubungi: {e}'))
+        return future
+
+    def run_batch(self, images):
+        return self.submit(images).result()
+
+    def _read(self, conn):
+        while True:
+            try:
+                task_id, ok, payload = conn.recv()
+            except (EOFError, OSError) as e:
+                self._fail_all(conn, e)
+                return
+            with self._lock:
+                future = self._pending.pop(task_id, None)
+                self.completed += 1
+            if future is not None:
+                _resolve(future, ok, payload)
+
+    def _fail_all(self, conn, error):
+        """Koneksi putus: gagalkan semua request yang menunggu, sambung ulang di submit berikutnya."""
+        with self._lock:
+            if self._conn is conn:
+                self._conn = None
+            pending, self._pending = self._pending, {}
+        error = ConnectionError(f'Koneksi ke inference worker terputus: {error}')
+        for future in pending.values():
+            _resolve(future, False, error)
+
+    def stats(self):
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            'mode': 'remote',
+            'socket': self.socket_path,
+            'connected': self._conn is not None,
+            'pending_batches': pending,
+            'completed_batches': self.completed,
+        }
@@ -0,0 +1,68 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from flask import abort, current_app, send_from_directory
+from werkzeug.security import safe_join
+
+# Nama file upload adalah SHA-256 isinya (MediaStore), atau pada upload lama
+# memuat timestamp: "<id/teks>_<unix-time>_<nama asli>" (juga folder hasil
+# transcoding video). Isi file dengan nama seperti ini tidak pernah berubah;
+# upload baru selalu mendapat nama baru.
+_IMMUTABLE = re.compile(r'_\d{9,}_|(^|/)[0-9a-f]{64}[./_]')
+
+SENDFILE_MODES = ('none', 'x-accel', 'x-sendfile')
+
+
+def is_immutable(filename):
+    return bool(_IMMUTABLE.search(filename))
+
+
+def send_media(filename):
+    """Pengganti view `static` bawaan Flask.
+
+    - Range request (seek video) dijawab 206 oleh werkzeug, HEAD & If-None-Match
+      / If-Modified-Since juga didukung. Tanpa Range, body dikirim lewat
+      `wsgi.file_wrapper` sehingga gunicorn memakai sendfile() (zero-copy).
+    - File upload (nama hash/timestamp) mendapat `Cache-Control: public, max-age=1 tahun,
+      immutable`; file lain MEDIA_MAX_AGE detik.
+    - MEDIA_SENDFILE=x-accel: hanya header X-Accel-Redirect yang dikirim dan
+      nginx yang membaca file (termasuk Range); x-sendfile untuk Apache/lighttpd.
+      Worker Python tidak ikut mengalirkan byte video sama sekali.
+    """
+    app = current_app
+    # Folder berawalan titik berisi file setengah jadi (upload & transcoding)
+    if any(part.startswith('.') for part in filename.split('/')):
+        abort(404)
+    immutable = is_immutable(filename)
+    max_age = app.config['MEDIA_IMMUTABLE_MAX_AGE'] if immutable else app.config['MEDIA_MAX_AGE']
+
+    if app.config['MEDIA_SENDFILE'] == 'x-accel':
+        path = safe_join(app.static_folder, filename)
+        if path is None or not os.path.isfile(path):
+            abort(404)
+        response = app.response_class()
+        response.headers['X-Accel-Redirect'] = app.config['MEDIA_ACCEL_PREFIX'].rstrip('/') + '/' + quote(filename)
+        response.mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        response.cache_control.max_age = max_age
+    else:
+        # USE_X_SENDFILE diisi init_app untuk mode x-sendfile
+        response = send_from_directory(app.static_folder, filename, max_age=max_age)
+        # werkzeug hanya menambahkan header ini di respons 206; player butuh tahu sejak awal
+        if response.status_code == 200:
+            response.headers.setdefault('Accept-Ranges', 'bytes')
+
+    response.cache_control.public = True
+    if immutable:
+        response.cache_control.immutable = True
+    return response
+
+
+def init_app(app):
+    """Sajikan /static/... lewat send_media; url_for('static', ...) tetap sama."""
+    mode = app.config['MEDIA_SENDFILE']
+    if mode not in SENDFILE_MODES:
+        raise ValueError(f"MEDIA_SENDFILE tidak dikenal: {mode}")
+    app.config['USE_X_SENDFILE'] = mode == 'x-sendfile'
+    app.view_functions['static'] = send_media
@@ -0,0 +1,269 @@
+import hashlib
+import os
+import shutil
+import time
+from urllib.parse import unquote, urlsplit
+
+from werkzeug.utils import secure_filename
+
+from app.services.uploads import MB, UploadStream, save_upload
+
+# Folder di bawah static/ yang isinya dikelola MediaStore (dan dibersihkan media-gc)
+COLLECTIONS = ('videos', 'foto_profile', 'info_images')
+
+
+def _sha256(file):
+    """SHA-256 isi FileStorage. Upload yang di-stream sudah di-hash selama parsing."""
+    stream = file.stream
+    if isinstance(stream, UploadStream):
+        # Sekaligus cek magic bytes file yang sangat kecil (lihat UploadStream.finish)
+        stream.finish()
+        return stream.sha256
+    digest = hashlib.sha256()
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(MB), b''):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+def _variant_urls(variants):
+    return [v['src'] for v in variants or () if isinstance(v, dict) and v.get('src')]
+
+
+class MediaStore:
+    """Penyimpanan media berdasarkan isi file (content-addressed).
+
+    File disimpan sebagai `static/<koleksi>/<sha[:2]>/<sha256>.<ext>`, jadi file
+    yang sama persis hanya disimpan sekali walau diupload berkali-kali. Jumlah
+    pemakai sebuah file dihitung langsung dari kolom database yang menunjuk ke
+    sana (User.profile_pic_url, KosaKata.video_file_path/video_poster_path,
+    Information.image_url, plus kolom JSON rendition/thumbnail), bukan dari
+    counter terpisah yang bisa melenceng.
+
+    Route tidak menghapus file sendiri: setelah commit, URL lama diserahkan
+    ke `release()`, yang hanya menghapus jika tidak ada baris lain yang masih
+    memakainya. Sisa yang tertinggal (commit gagal, proses mati di tengah
+    jalan) dibersihkan `collect_garbage()` / `flask media-gc`.
+    """
+
+    def __init__(self):
+        self.root = None
+        self.url_prefix = '/static'
+        self.min_age = 3600
+
+    def init_app(self, app):
+        self.root = app.static_folder
+        self.url_prefix = app.static_url_path
+        self.min_age = app.config['MEDIA_GC_MIN_AGE']
+
+    # --- Path & URL ---
+
+    def url(self, rel):
+        return f'{self.url_prefix}/{rel}'
+
+    def relpath(self, url):
+        """'/static/videos/ab/x.mp4' atau 'http://host/static/...' -> 'videos/ab/x.mp4'.
+
+        None jika URL bukan file media yang dikelola di sini.
+        """
+        if not url:
+            return None
+        path = unquote(urlsplit(url).path)
+        prefix = f'{self.url_prefix}/'
+        if not path.startswith(prefix):
+            return None
+        rel = path[len(prefix):]
+        parts = rel.split('/')
+        if parts[0] not in COLLECTIONS or any(part in ('', '.', '..') or part.startswith('.') for part in parts):
+            return None
+        return rel
+
+    def disk_path(self, rel):
+        return os.path.join(self.root, *rel.split('/'))
+
+    def _unit_path(self, rel):
+        """File yang dihapus bersama `rel`: hasil transcoding ada di folder
+        bernama sama dengan file-nya (`<stem>/<stem>.mp4`), selain itu file itu sendiri."""
+        path = self.disk_path(rel)
+        parent = os.path.dirname(path)
+        stem = os.path.splitext(os.path.basename(path))[0]
+        if os.path.basename(parent) == stem and os.path.dirname(os.path.relpath(parent, self.root)):
+            return parent
+        return path
+
+    # --- Simpan ---
+
+    def put(self, file, collection):
+        """Simpan FileStorage ke `collection` berdasarkan hash isinya.
+
+        Mengembalikan {'url', 'sha256', 'size', 'deduplicated'}. Jika isi yang
+        sama sudah ada, file upload dibuang dan file lama dipakai ulang.
+        """
+        if collection not in COLLECTIONS:
+            raise ValueError(f'Koleksi media tidak dikenal: {collection}')
+        sha = _sha256(file)
+        ext = os.path.splitext(secure_filename(file.filename or ''))[1].lower()
+        rel = f'{collection}/{sha[:2]}/{sha}{ext}'
+        path = self.disk_path(rel)
+
+        if os.path.isfile(path):
+            # Disentuh agar release()/GC lain tidak menghapusnya sebelum request ini commit
+            os.utime(path)
+            return {'url': self.url(rel), 'sha256': sha, 'size': os.path.getsize(path), 'deduplicated': True}
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        saved = save_upload(file, path)
+        return {'url': self.url(rel), 'sha256': sha, 'size': saved['size'], 'deduplicated': False}
+
+    # --- Referensi ---
+
+    def _reference_columns(self):
+        from app.models.information_model import Information
+        from app.models.kosa_kata_model import KosaKata
+        from app.models.user_model import User
+
+        return (User.profile_pic_url, KosaKata.video_file_path, KosaKata.video_poster_path, Information.image_url)
+
+    def _variant_columns(self):
+        """Kolom JSON berisi daftar {'src', ...} hasil transcoding / thumbnail."""
+        from app.models.information_model import Information
+        from app.models.kosa_kata_model import KosaKata
+        from app.models.user_model import User
+
+        return (KosaKata.video_renditions, User.profile_pic_variants, Information.image_variants)
+
+    def same_content(self, column, url):
+        """Filter SQL: `column` menunjuk ke isi yang sama dengan `url`
+        (file aslinya atau folder hasil transcoding-nya)."""
+        from app.extensions import db
+
+        rel = self.relpath(url)
+        stem = self.url(os.path.splitext(rel)[0]) if rel else url
+        return db.or_(column.contains(f'{stem}.', autoescape=True), column.contains(f'{stem}/', autoescape=True))
+
+    def references(self, url):
+        """Jumlah baris database yang menunjuk ke file `url`."""
+        from app.extensions import db
+
+        rel = self.relpath(url)
+        if not rel:
+            return 0
+        suffix = self.url(rel)
+        return sum(
+            db.session.execute(db.select(db.func.count()).where(column.endswith(suffix, autoescape=True))).scalar()
+            for column in self._reference_columns()
+        )
+
+    def referenced_paths(self):
+        """Semua file media (relatif ke static/) yang dipakai database."""
+        from app.extensions import db
+
+        urls = []
+        for column in self._reference_columns():
+            urls.extend(db.session.execute(db.select(column).where(column.isnot(None))).scalars())
+        for column in self._variant_columns():
+            for variants in db.session.execute(db.select(column).where(column.isnot(None))).scalars():
+                urls.extend(_variant_urls(variants))
+        return {rel for rel in map(self.relpath, urls) if rel}
+
+    # --- Hapus ---
+
+    def release(self, *urls, min_age=None):
+        """Hapus file (dan folder rendition-nya) yang sudah tidak dipakai baris mana pun.
+
+        Dipanggil SETELAH commit. File yang baru disentuh (< `min_age`, default
+        MEDIA_GC_MIN_AGE; mis. sedang dipakai ulang upload lain yang belum
+        commit) dibiarkan untuk media-gc. Mengembalikan jumlah byte yang dibebaskan.
+        """
+        from flask import current_app
+
+        min_age = self.min_age if min_age is None else min_age
+        freed = 0
+        for url in urls:
+            rel = self.relpath(url)
+            if not rel or self.references(url):
+                continue
+            target = self._unit_path(rel)
+            try:
+                if time.time() - os.path.getmtime(target) < min_age:
+                    continue
+                freed += self._remove(target)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                current_app.logger.warning('Gagal menghapus media %s (dibersihkan media-gc): %s', rel, e)
+        return freed
+
+    def _remove(self, path):
+        if os.path.isdir(path):
+            size = sum(os.path.getsize(os.path.join(dirpath, name))
+                       for dirpath, _, names in os.walk(path) for name in names)
+            shutil.rmtree(path)
+            return size
+        size = os.path.getsize(path)
+        os.remove(path)
+        return size
+
+    def collect_garbage(self, dry_run=False, min_age=None):
+        """Cocokkan isi folder media dengan database dan hapus file yatim.
+
+        File yang lebih muda dari `min_age` detik dilewati (upload/transcoding
+        yang belum commit). Folder berawalan titik (upload sementara, staging
+        transcoding) tidak disentuh. Juga melaporkan file yang dirujuk
+        database tetapi tidak ada di disk.
+        """
+        min_age = self.min_age if min_age is None else min_age
+        referenced = self.referenced_paths()
+        now = time.time()
+        report = {'dry_run': dry_run, 'scanned_files': 0, 'scanned_bytes': 0, 'referenced_files': len(referenced),
+                  'orphan_files': 0, 'reclaimed_bytes': 0, 'skipped_recent': 0, 'removed_dirs': 0, 'orphans': [],
+                  'missing': []}
+
+        for collection in COLLECTIONS:
+            base = os.path.join(self.root, collection)
+            for dirpath, dirnames, filenames in os.walk(base):
+                dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+                for name in filenames:
+                    if name.startswith('.'):
+                        continue
+                    path = os.path.join(dirpath, name)
+                    rel = os.path.relpath(path, self.root).replace(os.sep, '/')
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    report['scanned_files'] += 1
+                    report['scanned_bytes'] += stat.st_size
+                    if rel in referenced:
+                        continue
+                    if now - stat.st_mtime < min_age:
+                        report['skipped_recent'] += 1
+                        continue
+                    report['orphan_files'] += 1
+                    report['reclaimed_bytes'] += stat.st_size
+                    report['orphans'].append(rel)
+                    if not dry_run:
+                        try:
+                            os.remove(path)
+                        except FileNotFoundError:
+                            pass
+
+            if not dry_run:
+                # Folder shard/rendition yang kosong; yang baru dibuat bisa jadi sedang diisi put()
+                for dirpath, dirnames, filenames in os.walk(base, topdown=False):
+                    if os.path.normpath(dirpath) == os.path.normpath(base) or \
+                            any(part.startswith('.') for part in os.path.relpath(dirpath, base).split(os.sep)):
+                        continue
+                    try:
+                        if not os.listdir(dirpath) and now - os.path.getmtime(dirpath) >= min_age:
+                            os.rmdir(dirpath)
+                            report['removed_dirs'] += 1
+                    except OSError:
+                        pass
+
+        report['missing'] = sorted(rel for rel in referenced if not os.path.isfile(self.disk_path(rel)))
+        return report
+
+
+media_store = MediaStore()
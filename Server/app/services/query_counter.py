@@ -0,0 +1,118 @@
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_installed = False
+
+
+def _enabled(app):
+    # Dicek per request: app.run(debug=True) / `flask run --debug` baru
+    # mengaktifkan debug setelah create_app() (dan init_app ini) selesai
+    return app.debug or app.config['QUERY_COUNTER']
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and _enabled(current_app):
+        g.query_count = g.get('query_count', 0) + 1
+
+
+def init_app(app):
+    """Hitung query SQL per request (mode debug atau QUERY_COUNTER=true).
+
+    Jumlahnya dikirim di header `X-Query-Count`, dan request yang melebihi
+    QUERY_COUNT_WARN query dicatat ke log agar N+1 cepat kelihatan.
+    """
+    global _installed
+    if not _installed:
+        event.listen(Engine, 'before_cursor_execute', _count_query)
+        _installed = True
+
+    @app.after_request
+    def add_query_count_header(response):
+        if not _enabled(app):
+            return response
+        count = g.get('query_count', 0)
+        response.headers['X-Query-Count'] = str(count)
+        limit = app.config['QUERY_COUNT_WARN']
+        if limit and count > limit:
+            app.logger.warning('%s %s menjalankan %d query SQL', request.method, request.path, count)
+        return response
+
+
+# ========= Cek skala query terhadap jumlah baris =========
+
+# Endpoint list publik/admin yang dicek oleh `flask check-query-scaling`
+SCALING_ENDPOINTS = (
+    '/api/kosa-kata/',
+    '/api/kosa-kata/?limit=20',
+    '/api/feedback/',
+    '/api/information/',
+    '/api/users/',
+)
+
+
+def seed_rows(rows):
+    """Isi database (kosong) dengan `rows` baris per tabel, masing-masing dengan relasi terisi."""
+    from app.extensions import db
+    from app.models.feedback_model import Feedback
+    from app.models.information_model import Information
+    from app.models.kosa_kata_model import KosaKata
+    from app.models.user_model import User
+
+    start = User.query.count()
+    users = []
+    for i in range(start, start + rows):
+        user = User(full_name=f'User {i}', email=f'user{i}@example.com', user_type='Umum',
+                    phone_number=f'08{i:010d}', role='Admin' if i == 0 else 'User')
+        user.password_hash = 'x'
+        users.append(user)
+    db.session.add_all(users)
+    db.session.flush()
+
+    offset = KosaKata.query.count()
+    for i, user in enumerate(users):
+        db.session.add(KosaKata(text=f'kata {offset + i}', video_file_path=f'/static/videos/{offset + i}.mp4',
+                                added_by_admin_id=user.id))
+        db.session.add(Feedback(user_id=user.id, message=f'Feedback {i}'))
+        db.session.add(Information(title=f'Info {i}', content='-', created_by_id=user.id, updated_by_id=users[0].id))
+    db.session.commit()
+
+
+def check_query_scaling(app, sizes=(5, 50), endpoints=SCALING_ENDPOINTS):
+    """Jalankan tiap endpoint pada beberapa ukuran data dan bandingkan jumlah query.
+
+    `app` harus memakai database kosong (misal SQLite sementara). Mengembalikan
+    (hasil, masalah): hasil = {endpoint: [jumlah query per ukuran]}, masalah =
+    daftar endpoint yang jumlah query-nya ikut naik bersama jumlah baris.
+    """
+    from flask_jwt_extended import create_access_token
+    from app.extensions import db
+    from app.models.user_model import User
+    from app.services.auth import role_claims
+
+    results = {endpoint: [] for endpoint in endpoints}
+    client = app.test_client()
+    seeded = 0
+    for size in sizes:
+        with app.app_context():
+            if seeded == 0:
+                db.create_all()
+            seed_rows(size - seeded)
+            seeded = size
+            admin = User.query.filter_by(role='Admin').first()
+            token = create_access_token(identity=str(admin.id), additional_claims=role_claims(admin))
+        headers = {'Authorization': f'Bearer {token}'}
+        for endpoint in endpoints:
+            response = client.get(endpoint, headers=headers)
+            count = int(response.headers.get('X-Query-Count', -1))
+            if response.status_code != 200:
+                count = -1
+            results[endpoint].append(count)
+
+    problems = []
+    for endpoint, counts in results.items():
+        if -1 in counts:
+            problems.append(f'{endpoint}: request gagal atau query tidak terhitung ({counts})')
+        elif len(set(counts)) > 1:
+            problems.append(f'{endpoint}: jumlah query naik bersama jumlah baris {dict(zip(sizes, counts))}')
+    return results, problems
@@ -0,0 +1,172 @@
+import re
+
+from sqlalchemy import event
+
+# (method, path, body JSON) yang dicek oleh `flask check-query-plans`.
+# "{cursor}" diganti next_cursor dari halaman pertama list kosa kata.
+PLAN_ENDPOINTS = (
+    ('GET', '/api/kosa-kata/', None),
+    ('GET', '/api/kosa-kata/?limit=20', None),
+    ('GET', '/api/kosa-kata/?limit=20&cursor={cursor}', None),
+    ('GET', '/api/kosa-kata/?category=Lainnya&limit=20', None),
+    ('GET', '/api/kosa-kata/?q=kata&limit=20', None),
+    ('GET', '/api/kosa-kata/1', None),
+    ('GET', '/api/feedback/', None),
+    ('GET', '/api/feedback/1', None),
+    ('GET', '/api/information/', None),
+    ('GET', '/api/information/1', None),
+    ('GET', '/api/users/', None),
+    ('POST', '/api/users/login', {'email': '0812-0000-0000', 'password': 'x'}),
+    ('POST', '/api/users/login', {'email': 'user1@example.com', 'password': 'x'}),
+)
+
+# Query yang membaca seluruh tabel tanpa WHERE/ORDER BY (list penuh, COUNT,
+# GROUP BY untuk statistik) memang harus scan; yang dicek hanya query yang
+# sebenarnya bisa dibantu index.
+_NEEDS_INDEX = re.compile(r'\b(WHERE|ORDER BY)\b', re.IGNORECASE)
+_SQLITE_TABLE_SCAN = re.compile(r'^SCAN (\w+)$')
+_WHERE = re.compile(r'\bWHERE\b', re.IGNORECASE)
+_ORDER_BY = re.compile(r'\bORDER BY\b', re.IGNORECASE)
+
+
+def explain(conn, statement, parameters):
+    """Jalankan EXPLAIN untuk satu statement. Mengembalikan (baris plan, daftar masalah)."""
+    dialect = conn.dialect.name
+    if dialect == 'sqlite':
+        rows = conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).fetchall()
+        plan = [row[-1] for row in rows]
+        # SCAN tanpa index yang langsung memenuhi ORDER BY adalah urutan primary
+        # key (rowid), sama seperti type=index di MySQL. Hanya dibebaskan untuk
+        # list tanpa WHERE dan hanya untuk tabel terluar (baris plan pertama);
+        # query yang difilter tetap harus memakai index.
+        ordered_walk = bool(_ORDER_BY.search(statement)) and not _WHERE.search(statement) and \
+            not any(detail.startswith('USE TEMP B-TREE FOR ORDER BY') for detail in plan)
+        problems = []
+        for index, detail in enumerate(plan):
+            match = _SQLITE_TABLE_SCAN.match(detail)
+            if match and not (ordered_walk and index == 0):
+                problems.append(f'full table scan pada {match.group(1)}')
+            elif detail.startswith('USE TEMP B-TREE FOR ORDER BY') and not plan[0].startswith('SEARCH'):
+                # Sort setelah SEARCH lewat index hanya mengurutkan baris yang lolos filter
+                problems.append('ORDER BY tanpa index (sort di memori)')
+        return plan, problems
+
+    if dialect in ('mysql', 'mariadb'):
+        result = conn.exec_driver_sql('EXPLAIN ' + statement, parameters)
+        keys = list(result.keys())
+        rows = [dict(zip(keys, row)) for row in result.fetchall()]
+        plan = [f"{row['table']}: type={row['type']} key={row['key']} extra={row.get('Extra')}" for row in rows]
+        problems = [f"full table scan pada {row['table']}" for row in rows if row['type'] == 'ALL']
+        # filesort setelah akses lewat index (range/ref) hanya mengurutkan baris yang lolos filter
+        problems += [f"ORDER BY tanpa index pada {row['table']} (filesort)"
+                     for row in rows if 'filesort' in (row.get('Extra') or '') and row['type'] in ('ALL', 'index')]
+        return plan, problems
+
+    if dialect == 'postgresql':
+        plan = [row[0] for row in conn.exec_driver_sql('EXPLAIN ' + statement, parameters).fetchall()]
+        problems = [line.strip() for line in plan if 'Seq Scan on' in line]
+        return plan, problems
+
+    return [], [f'EXPLAIN untuk dialect {dialect} belum didukung']
+
+
+def check_cursor_pages(client, headers, path='/api/kosa-kata/?limit=20'):
+    """Ikuti next_cursor sampai habis; tiap halaman harus berisi id baru.
+
+    Data hasil seed dibuat dalam satu commit (created_at sama persis), kasus
+    yang membuat cursor berbasis waktu mengulang halaman yang sama.
+    Mengembalikan daftar masalah (kosong jika pagination benar).
+    """
+    seen = set()
+    url = path
+    for _ in range(10000):
+        body = client.get(url, headers=headers).get_json()
+        ids = [item['id'] for item in body['items']]
+        repeated = seen.intersection(ids)
+        if repeated:
+            return [f'halaman {url} mengulang id {sorted(repeated)[:5]} dari halaman sebelumnya']
+        seen.update(ids)
+        if not body.get('has_more'):
+            return []
+        if not ids or not body.get('next_cursor'):
+            return [f'halaman {url} kosong/tanpa next_cursor padahal has_more=True']
+        url = f"{path}&cursor={body['next_cursor']}"
+    return [f'pagination {path} tidak berhenti']
+
+
+def check_query_plans(app, rows=500, endpoints=PLAN_ENDPOINTS):
+    """Rekam query SELECT tiap endpoint lalu EXPLAIN satu per satu.
+
+    `app` harus memakai database kosong (SQLite sementara atau database lokal)
+    karena tabelnya dibuat dan diisi `rows` baris per tabel. Di MySQL/PostgreSQL
+    optimizer tetap memilih full scan untuk tabel yang sangat kecil, jadi
+    gunakan `rows` yang cukup besar di sana.
+
+    Mengembalikan list dict {endpoint, status, queries: [{sql, plan, problems}]};
+    entri terakhir berisi hasil check_cursor_pages di key `problems`.
+    """
+    from flask_jwt_extended import create_access_token
+    from app.extensions import db
+    from app.models.user_model import User
+    from app.services.auth import role_claims
+    from app.services.query_counter import seed_rows
+
+    with app.app_context():
+        db.create_all()
+        seed_rows(rows)
+        admin = User.query.filter_by(role='Admin').first()
+        token = create_access_token(identity=str(admin.id), additional_claims=role_claims(admin))
+        engine = db.engine
+
+    captured = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            captured.append((statement, parameters))
+
+    client = app.test_client()
+    headers = {'Authorization': f'Bearer {token}'}
+    cursor = client.get('/api/kosa-kata/?limit=20', headers=headers).get_json().get('next_cursor') or ''
+
+    report = []
+    for method, path, body in endpoints:
+        path = path.replace('{cursor}', cursor)
+        captured.clear()
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            response = client.open(path, method=method, json=body, headers=headers)
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+
+        queries = []
+        with engine.connect() as conn:
+            for statement, parameters in list(captured):
+                if _NEEDS_INDEX.search(statement):
+                    plan, problems = explain(conn, statement, parameters)
+                else:
+                    plan, problems = ['(tanpa WHERE/ORDER BY, tidak dicek)'], []
+                queries.append({'sql': ' '.join(statement.split()), 'plan': plan, 'problems': problems})
+        report.append({'endpoint': f'{method} {path}', 'status': response.status_code, 'queries': queries})
+
+    report.append({'endpoint': 'GET /api/kosa-kata/?limit=20 (semua halaman cursor)', 'status': 200, 'queries': [],
+                   'problems': check_cursor_pages(client, headers)})
+    return report
+
+
+def format_plans(report, verbose=False):
+    lines = []
+    for entry in report:
+        flagged = [problem for query in entry['queries'] for problem in query['problems']]
+        mark = 'SCAN' if flagged else 'FAIL' if entry.get('problems') else 'ok'
+        lines.append(f"[{mark:>4}] {entry['endpoint']} -> {entry['status']}, {len(entry['queries'])} query")
+        for problem in entry.get('problems', ()):
+            lines.append(f'           ! {problem}')
+        for query in entry['queries']:
+            if not (verbose or query['problems']):
+                continue
+            lines.append(f"         {query['sql'][:160]}")
+            for detail in query['plan']:
+                lines.append(f'           | {detail}')
+            for problem in query['problems']:
+                lines.append(f'           ! {problem}')
+    return '\n'.join(lines)
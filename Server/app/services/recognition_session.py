@@ -0,0 +1,147 @@
+import threading
+import time
+from collections import Counter, deque
+
+from app.services.frame_preprocess import dhash, hamming
+
+
+class RecognitionSession:
+    """State pengenalan isyarat untuk satu client (satu kamera).
+
+    - Menyimpan jendela geser (sliding window) label hasil deteksi terakhir.
+    - Label dianggap stabil jika muncul minimal `min_votes` kali di jendela
+      (majority voting). Label stabil hanya berganti jika label lain (atau
+      "tidak ada gerakan") juga mencapai `min_votes` (hysteresis), sehingga
+      tampilan tidak berkedip.
+    - Setiap kali label stabil berganti ke sebuah kata, kata itu di-commit ke
+      kalimat. Kata yang sama hanya di-commit ulang setelah tangan dilepas.
+    - Frame yang perceptual hash-nya (dHash) sama atau hampir sama dengan
+      frame terakhir yang diinferensi tidak perlu diinferensi, hasil deteksi
+      terakhir dipakai ulang.
+    - Posisi tangan terakhir disimpan agar frame berikutnya bisa di-crop (ROI).
+    """
+
+    def __init__(self, window=5, min_votes=3, hash_distance=6, max_words=50, roi_max_misses=3):
+        self.window = max(1, int(window))
+        self.min_votes = max(1, min(int(min_votes), self.window))
+        self.hash_distance = int(hash_distance)
+        self.max_words = max(1, int(max_words))
+        self.roi_max_misses = int(roi_max_misses)
+
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Kosongkan jendela, label stabil dan kalimat."""
+        self._labels = deque(maxlen=self.window)
+        self._last_hash = None
+        self.last_detection = None
+        self.hand_box = None
+        self._misses = 0
+        self.stable = None
+        self.words = deque(maxlen=self.max_words)
+
+        self.frames = 0
+        self.skipped = 0
+
+    # ========= Deteksi perubahan frame =========
+
+    def is_similar(self, img):
+        """True jika `img` nyaris sama dengan frame terakhir yang diinferensi
+        (inferensi bisa dilewati).
+
+        Hash hanya diganti jika frame ini akan diinferensi, sehingga gerakan
+        pelan yang berubah sedikit demi sedikit tetap terdeteksi.
+        """
+        if self.hash_distance < 0:
+            return False
+
+        current = dhash(img)
+        if self._last_hash is not None and hamming(current, self._last_hash) <= self.hash_distance:
+            return True
+        self._last_hash = current
+        return False
+
+    def roi_box(self):
+        """Box tangan terakhir untuk crop ROI, atau None jika tangan sudah lama tidak terlihat."""
+        if self.hand_box is None or self._misses >= self.roi_max_misses:
+            return None
+        return self.hand_box
+
+    # ========= Voting & kalimat =========
+
+    def observe(self, detection, skipped=False):
+        """Masukkan hasil deteksi satu frame. Mengembalikan kata yang baru di-commit (atau None)."""
+        self.frames += 1
+        if skipped:
+            self.skipped += 1
+        self.last_detection = detection
+        self._labels.append(detection['text'] if detection else None)
+
+        if detection and detection.get('box'):
+            self.hand_box = detection['box']
+            self._misses = 0
+        elif not skipped:
+            self._misses += 1
+
+        label, votes = Counter(self._labels).most_common(1)[0]
+        if votes < self.min_votes or label == self.stable:
+            # Belum ada mayoritas baru: pertahankan label stabil sebelumnya
+            return None
+
+        self.stable = label
+        if label is None:
+            return None
+
+        self.words.append(label)
+        return label
+
+    @property
+    def sentence(self):
+        return ' '.join(self.words)
+
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'skipped_inferences': self.skipped,
+        }
+
+
+class SessionStore:
+    """Registry sesi pengenalan per `session_id` (untuk endpoint HTTP), dengan TTL."""
+
+    def __init__(self, ttl=300, max_sessions=1000, **session_options):
+        self.ttl = float(ttl)
+        self.max_sessions = int(max_sessions)
+        self.session_options = session_options
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id):
+        """Ambil sesi yang ada atau buat sesi baru."""
+        now = time.monotonic()
+        with self._lock:
+            self._purge(now)
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                if len(self._sessions) >= self.max_sessions:
+                    # Buang sesi yang paling lama tidak dipakai
+                    oldest = min(self._sessions, key=lambda key: self._sessions[key][1])
+                    del self._sessions[oldest]
+                entry = [RecognitionSession(**self.session_options), now]
+                self._sessions[session_id] = entry
+            entry[1] = now
+            return entry[0]
+
+    def discard(self, session_id):
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+    def _purge(self, now):
+        expired = [key for key, (_, last_seen) in self._sessions.items() if now - last_seen > self.ttl]
+        for key in expired:
+            del self._sessions[key]
@@ -0,0 +1,326 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, request
+
+
+class LRUBackend:
+    """Cache in-process dengan batas jumlah entri dan total ukuran (byte), LRU eviction."""
+
+    name = 'memory'
+
+    def __init__(self, max_entries=1024, max_bytes=32 * 1024 * 1024):
+        self.max_entries = int(max_entries)
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self._tags = {}
+        # tag -> waktu (monotonic) sampai kapan hasil route bertag itu tidak di-cache
+        self._held = {}
+        self.bytes = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at, _ = entry
+            if expires_at and expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl, tags=()):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            expires_at = time.monotonic() + ttl if ttl else None
+            self._data[key] = (value, expires_at, tuple(tags))
+            self.bytes += len(value)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while self._data and (len(self._data) > self.max_entries or self.bytes > self.max_bytes):
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+    def invalidate_tags(self, tags, hold=0):
+        with self._lock:
+            removed = 0
+            for tag in tags:
+                if hold:
+                    self._held[tag] = time.monotonic() + hold
+                for key in list(self._tags.pop(tag, ())):
+                    if key in self._data:
+                        self._remove(key)
+                        removed += 1
+            return removed
+
+    def held(self, tags):
+        now = time.monotonic()
+        with self._lock:
+            return any(self._held.get(tag, 0) > now for tag in tags)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._tags.clear()
+            self._held.clear()
+            self.bytes = 0
+
+    def _remove(self, key):
+        value, _, tags = self._data.pop(key)
+        self.bytes -= len(value)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def stats(self):
+        return {
+            'entries': len(self._data),
+            'bytes': self.bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'evictions': self.evictions,
+        }
+
+
+class RedisBackend:
+    """Cache bersama antar proses di Redis (atau server kompatibel Redis).
+
+    Tiap tag disimpan sebagai set berisi key yang memakainya, sehingga
+    invalidasi berlaku untuk semua worker sekaligus. `client` boleh diisi
+    objek lain dengan API redis-py (misal fakeredis) untuk pengujian lokal.
+    """
+
+    name = 'redis'
+
+    def __init__(self, url=None, prefix='bahasaku', client=None):
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError('CACHE_BACKEND=redis membutuhkan paket redis (pip install redis)')
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+        self.evictions = 0
+
+    def _key(self, key):
+        return f'{self.prefix}:cache:{key}'
+
+    def _tag(self, tag):
+        return f'{self.prefix}:tag:{tag}'
+
+    def _hold(self, tag):
+        return f'{self.prefix}:hold:{tag}'
+
+    def get(self, key):
+        return self.client.get(self._key(key))
+
+    def set(self, key, value, ttl, tags=()):
+        pipe = self.client.pipeline()
+        pipe.set(self._key(key), value, ex=int(ttl) if ttl else None)
+        for tag in tags:
+            pipe.sadd(self._tag(tag), key)
+            if ttl:
+                # Set tag tidak perlu hidup lebih lama dari entri terpanjangnya
+                pipe.expire(self._tag(tag), int(ttl) * 2)
+        pipe.execute()
+
+    def invalidate_tags(self, tags, hold=0):
+        removed = 0
+        for tag in tags:
+            if hold:
+                # Berlaku untuk semua worker, bukan hanya proses yang menulis
+                self.client.set(self._hold(tag), 1, px=max(1, int(hold * 1000)))
+            keys = self.client.smembers(self._tag(tag))
+            if keys:
+                removed += self.client.delete(*[self._key(k.decode() if isinstance(k, bytes) else k) for k in keys])
+            self.client.delete(self._tag(tag))
+        return removed
+
+    def held(self, tags):
+        return bool(tags) and self.client.exists(*[self._hold(tag) for tag in tags]) > 0
+
+    def clear(self):
+        for key in self.client.scan_iter(f'{self.prefix}:*'):
+            self.client.delete(key)
+
+    def stats(self):
+        return {'evictions': self.evictions}
+
+
+class NullBackend:
+    """Cache nonaktif (CACHE_BACKEND=null)."""
+
+    name = 'null'
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl, tags=()):
+        pass
+
+    def invalidate_tags(self, tags, hold=0):
+        return 0
+
+    def held(self, tags):
+        return False
+
+    def clear(self):
+        pass
+
+    def stats(self):
+        return {}
+
+
+class ResponseCache:
+    """Cache respons GET untuk route list/detail, dengan invalidasi berbasis tag.
+
+    Dipakai sebagai decorator di bawah decorator auth:
+
+        @bp.route('/')
+        @cache.cached(tags=('kosa_kata',))
+        def list_kosa_kata(): ...
+
+    Hanya respons 200 yang disimpan (body, status & header). Saat hit,
+    header ETag/Last-Modified ikut dipulihkan dan If-None-Match tetap
+    dijawab 304. Handler create/update/delete memanggil
+    `cache.invalidate(<tag>)` setelah commit. Jika ada replika database,
+    selama `replica_lag` detik setelah invalidasi route bertag itu membaca
+    dari primary dan hasilnya tidak disimpan, agar body lama dari replika
+    yang tertinggal tidak masuk cache.
+    """
+
+    def __init__(self, app=None):
+        self.backend = NullBackend()
+        self.default_ttl = 60
+        self.replica_lag = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.invalidations = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app, backend=None):
+        config = app.config
+        self.default_ttl = float(config['CACHE_DEFAULT_TTL'])
+        self.replica_lag = float(config['CACHE_REPLICA_LAG']) if config['DATABASE_REPLICA_URLS'] else 0
+        if backend is not None:
+            self.backend = backend
+        elif config['CACHE_BACKEND'] == 'memory':
+            self.backend = LRUBackend(config['CACHE_MAX_ENTRIES'], config['CACHE_MAX_BYTES'])
+        elif config['CACHE_BACKEND'] == 'redis':
+            self.backend = RedisBackend(config['CACHE_REDIS_URL'], prefix=config['CACHE_KEY_PREFIX'])
+        elif config['CACHE_BACKEND'] == 'null':
+            self.backend = NullBackend()
+        else:
+            raise ValueError(f"CACHE_BACKEND tidak dikenal: {config['CACHE_BACKEND']}")
+        app.extensions['response_cache'] = self
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def cached(self, tags=(), ttl=None):
+        """Decorator untuk route GET. Key = endpoint + path lengkap (termasuk query string)."""
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                if request.method != 'GET':
+                    return current_app.ensure_sync(fn)(*args, **kwargs)
+
+                key = f'{request.endpoint}:{request.full_path}'
+                try:
+                    raw = self.backend.get(key)
+                except Exception as e:
+                    # Cache bermasalah (misal Redis mati) tidak boleh menjatuhkan endpoint
+                    current_app.logger.warning('Cache get gagal: %s', e)
+                    raw = None
+
+                if raw is not None:
+                    self._count('hits')
+                    body, status, headers = pickle.loads(raw)
+                    response = current_app.response_class(body, status=status, headers=headers)
+                    response.headers['X-Cache'] = 'HIT'
+                    return response.make_conditional(request)
+
+                self._count('misses')
+                if self._held(tags):
+                    from app.services.db_routing import use_primary
+
+                    use_primary()
+                    response = current_app.make_response(current_app.ensure_sync(fn)(*args, **kwargs))
+                    response.headers['X-Cache'] = 'BYPASS'
+                    return response
+
+                response = current_app.make_response(current_app.ensure_sync(fn)(*args, **kwargs))
+                # Invalidasi bisa terjadi selagi handler membaca dari replika
+                if response.status_code == 200 and not response.direct_passthrough and not self._held(tags):
+                    headers = [(k, v) for k, v in response.headers.items() if k.lower() not in ('set-cookie', 'content-length')]
+                    raw = pickle.dumps((response.get_data(), response.status_code, headers), protocol=pickle.HIGHEST_PROTOCOL)
+                    try:
+                        self.backend.set(key, raw, self.default_ttl if ttl is None else ttl, tags)
+                        self._count('sets')
+                    except Exception as e:
+                        current_app.logger.warning('Cache set gagal: %s', e)
+                response.headers['X-Cache'] = 'MISS'
+                return response
+            return wrapper
+        return decorator
+
+    def _held(self, tags):
+        if not self.replica_lag:
+            return False
+        try:
+            return self.backend.held(tags)
+        except Exception as e:
+            current_app.logger.warning('Cache get gagal: %s', e)
+            return True
+
+    def invalidate(self, *tags):
+        """Buang semua respons yang memakai salah satu tag (panggil setelah commit).
+
+        Versi tag di database (bagian dari ETag, lihat http_cache) ikut dinaikkan.
+        """
+        from app.services.http_cache import bump_versions
+
+        try:
+            bump_versions(*tags)
+        except Exception as e:
+            current_app.logger.warning('Versi cache gagal dinaikkan: %s', e)
+        try:
+            removed = self.backend.invalidate_tags(tags, hold=self.replica_lag)
+        except Exception as e:
+            current_app.logger.warning('Invalidasi cache gagal: %s', e)
+            return 0
+        self._count('invalidations')
+        return removed
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'backend': self.backend.name,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            'sets': self.sets,
+            'invalidations': self.invalidations,
+            'default_ttl': self.default_ttl,
+            **self.backend.stats(),
+        }
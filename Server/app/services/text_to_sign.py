@@ -0,0 +1,87 @@
+import re
+
+from app.services.vocab_index import normalize
+
+# Kata (huruf/angka), termasuk kata ulang dengan tanda hubung seperti "anak-anak"
+_TOKEN_RE = re.compile(r"[^\W_]+(?:-[^\W_]+)*")
+
+WORD = 'word'
+PHRASE = 'phrase'
+LETTER = 'letter'
+
+
+def tokenize(text, vocabulary=None):
+    """Pecah kalimat menjadi token huruf kecil, tanda baca dibuang.
+
+    Kata ulang ("anak-anak") dipertahankan utuh jika ada di `vocabulary`,
+    jika tidak dipecah menjadi kata-katanya ("anak", "anak").
+    """
+    tokens = []
+    for match in _TOKEN_RE.finditer(normalize(text)):
+        token = match.group(0)
+        if '-' in token and (vocabulary is None or token not in vocabulary):
+            tokens.extend(part for part in token.split('-') if part)
+        else:
+            tokens.append(token)
+    return tokens
+
+
+def _entry(token, detail, kind, source=None):
+    return {
+        'token': token,
+        'type': kind,
+        'source': source or token,
+        'kosa_kata_id': detail['id'],
+        'text': detail['text'],
+        'video_file_path': detail['video_file_path'],
+        'video_poster_path': detail.get('video_poster_path'),
+        'video_renditions': detail.get('video_renditions') or [],
+    }
+
+
+def translate(text, vocabulary, max_phrase_words=None):
+    """Terjemahkan kalimat ke urutan video isyarat.
+
+    `vocabulary` adalah dict {teks ternormalisasi: detail KosaKata}. Frasa
+    dicocokkan dengan longest-match lebih dulu ("selamat pagi" sebelum
+    "selamat"). Kata yang tidak ada dieja per huruf (fingerspelling) memakai
+    kosa kata satu huruf. Kata yang dieja dicatat di `fingerspelled`, huruf
+    yang juga tidak punya video dicatat di `missing`.
+    """
+    if max_phrase_words is None:
+        max_phrase_words = max((key.count(' ') + 1 for key in vocabulary), default=1)
+
+    tokens = tokenize(text, vocabulary)
+    playlist = []
+    fingerspelled = []
+    missing = []
+    matched_words = 0
+
+    i = 0
+    while i < len(tokens):
+        for size in range(min(max_phrase_words, len(tokens) - i), 0, -1):
+            phrase = ' '.join(tokens[i:i + size])
+            detail = vocabulary.get(phrase)
+            if detail:
+                playlist.append(_entry(phrase, detail, PHRASE if size > 1 else WORD))
+                matched_words += size
+                i += size
+                break
+        else:
+            word = tokens[i]
+            fingerspelled.append(word)
+            for letter in word:
+                detail = vocabulary.get(letter)
+                if detail:
+                    playlist.append(_entry(letter, detail, LETTER, source=word))
+                elif letter not in missing:
+                    missing.append(letter)
+            i += 1
+
+    return {
+        'tokens': tokens,
+        'playlist': playlist,
+        'fingerspelled': fingerspelled,
+        'missing': missing,
+        'coverage': round(matched_words / len(tokens), 4) if tokens else 1.0,
+    }
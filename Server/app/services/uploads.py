@@ -0,0 +1,204 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from functools import wraps
+
+from flask import Request, current_app, jsonify, request
+from werkzeug.exceptions import RequestEntityTooLarge, UnsupportedMediaType
+
+# Cukup untuk mengenali semua signature di bawah
+HEAD_BYTES = 16
+MB = 1024 * 1024
+
+
+def _is_video(head):
+    return (
+        head[4:8] in (b'ftyp', b'moov', b'mdat', b'wide', b'free')  # MP4 / MOV
+        or (head[:4] == b'RIFF' and head[8:12] == b'AVI ')           # AVI
+        or head[:4] == b'\x1a\x45\xdf\xa3'                            # MKV / WebM (EBML)
+    )
+
+
+def _is_image(head):
+    return (
+        head[:3] == b'\xff\xd8\xff'                                   # JPEG
+        or head[:8] == b'\x89PNG\r\n\x1a\n'                          # PNG
+        or head[:6] in (b'GIF87a', b'GIF89a')                         # GIF
+        or (head[:4] == b'RIFF' and head[8:12] == b'WEBP')           # WebP
+    )
+
+
+# Jenis upload -> (pengecek magic bytes, pesan error)
+UPLOAD_KINDS = {
+    'video': (_is_video, 'Isi file bukan video mp4/mov/avi/mkv/webm.'),
+    'image': (_is_image, 'Isi file bukan gambar jpg/png/gif/webp.'),
+}
+
+
+def _too_large_message(policy):
+    return f'Ukuran file melebihi batas {round(policy.max_bytes / MB, 1):g} MB.'
+
+
+class UploadPolicy:
+    """Aturan upload satu endpoint: jenis isi file dan ukuran maksimal per file (byte)."""
+
+    def __init__(self, kind, max_bytes, tmp_dir):
+        self.kind = kind
+        self.max_bytes = int(max_bytes)
+        self.tmp_dir = tmp_dir
+        self.check, self.error = UPLOAD_KINDS[kind]
+
+    @property
+    def max_request_bytes(self):
+        # Sisa untuk field form biasa & boundary multipart
+        return self.max_bytes + MB
+
+
+class UploadStream:
+    """Tujuan tulis file upload selama request di-parse (pengganti SpooledTemporaryFile werkzeug).
+
+    Langsung ditulis ke file sementara di UPLOAD_TMP_DIR per chunk (memori tetap
+    kecil berapa pun ukurannya), di-hash SHA-256 sambil jalan, dan ditolak
+    sedini mungkin: 415 begitu byte pertama bukan jenis yang diizinkan, 413
+    begitu ukurannya melewati batas. `save_upload()` memindahkannya ke tujuan
+    akhir dengan rename atomik; jika tidak dipindah, file dihapus saat close.
+    """
+
+    def __init__(self, policy):
+        os.makedirs(policy.tmp_dir, exist_ok=True)
+        self.policy = policy
+        self._file = tempfile.NamedTemporaryFile(dir=policy.tmp_dir, prefix='upload-', suffix='.part', delete=False)
+        self.name = self._file.name
+        self._hash = hashlib.sha256()
+        self._head = b''
+        self.size = 0
+        self.moved = False
+
+    def write(self, data):
+        self.size += len(data)
+        if self.size > self.policy.max_bytes:
+            self.discard()
+            raise RequestEntityTooLarge(_too_large_message(self.policy))
+        if len(self._head) < HEAD_BYTES:
+            self._head += data[:HEAD_BYTES - len(self._head)]
+            if len(self._head) >= HEAD_BYTES:
+                self._check_head()
+        self._hash.update(data)
+        return self._file.write(data)
+
+    def _check_head(self):
+        if not self.policy.check(self._head):
+            self.discard()
+            raise UnsupportedMediaType(self.policy.error)
+
+    @property
+    def sha256(self):
+        return self._hash.hexdigest()
+
+    def finish(self):
+        """Pastikan file lengkap di disk; dipanggil sebelum dipindah."""
+        if len(self._head) < HEAD_BYTES:
+            self._check_head()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def discard(self):
+        self.close()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+        if not self.moved:
+            try:
+                os.remove(self.name)
+            except OSError:
+                pass
+
+    def __getattr__(self, name):
+        # read/seek/tell/readline dst. untuk FileStorage
+        return getattr(self._file, name)
+
+
+class UploadRequest(Request):
+    """Request Flask yang mengalirkan file upload ke UploadStream jika endpoint memakai @streamed_upload."""
+
+    # Field form non-file (teks) tetap dibatasi kecil
+    max_form_memory_size = MB
+    upload_policy = None
+
+    @property
+    def max_content_length(self):
+        if self.upload_policy is not None:
+            return self.upload_policy.max_request_bytes
+        return super().max_content_length
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if self.upload_policy is None:
+            return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+        stream = UploadStream(self.upload_policy)
+        self.__dict__.setdefault('_upload_streams', []).append(stream)
+        return stream
+
+    def close(self):
+        super().close()
+        # Termasuk stream dari parsing yang gagal di tengah jalan (tidak masuk request.files)
+        for stream in self.__dict__.get('_upload_streams', ()):
+            stream.close()
+
+
+def streamed_upload(kind, limit_key):
+    """Decorator route upload (di bawah decorator auth, sebelum request.files dibaca).
+
+        @streamed_upload('video', 'UPLOAD_MAX_VIDEO_BYTES')
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            config = current_app.config
+            request.upload_policy = UploadPolicy(kind, config[limit_key], config['UPLOAD_TMP_DIR'])
+            return current_app.ensure_sync(fn)(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def save_upload(file, path):
+    """Simpan FileStorage ke `path`. Mengembalikan {'size', 'sha256'} (None jika tidak di-stream)."""
+    stream = file.stream
+    if not isinstance(stream, UploadStream):
+        file.save(path)
+        return {'size': os.path.getsize(path), 'sha256': None}
+
+    stream.finish()
+    try:
+        os.replace(stream.name, path)
+    except OSError:
+        # UPLOAD_TMP_DIR di filesystem lain: salin lalu rename di folder tujuan
+        partial = f'{path}.part'
+        shutil.copyfile(stream.name, partial)
+        os.replace(partial, path)
+        os.remove(stream.name)
+    stream.moved = True
+    return {'size': stream.size, 'sha256': stream.sha256}
+
+
+def init_app(app):
+    app.request_class = UploadRequest
+    if not app.config.get('UPLOAD_TMP_DIR'):
+        # Di dalam static/ agar rename ke folder media tetap di filesystem yang sama
+        # (folder berawalan titik tidak disajikan, lihat media.send_media)
+        app.config['UPLOAD_TMP_DIR'] = os.path.join(app.root_path, 'static', '.uploads')
+
+    def too_large(e):
+        message = e.description
+        if message == RequestEntityTooLarge.description:
+            # Ditolak werkzeug dari header Content-Length, sebelum body dibaca
+            policy = getattr(request, 'upload_policy', None)
+            message = _too_large_message(policy) if policy else 'Ukuran request melebihi batas.'
+        return jsonify({'error': message}), 413
+
+    def unsupported(e):
+        return jsonify({'error': e.description}), 415
+
+    app.register_error_handler(RequestEntityTooLarge, too_large)
+    app.register_error_handler(UnsupportedMediaType, unsupported)
@@ -0,0 +1,260 @@
+import os
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Status video_status KosaKata (None = video asli, belum/tidak diproses)
+PROCESSING = 'processing'
+READY = 'ready'
+FAILED = 'failed'
+
+
+def parse_renditions(value):
+    """"480:800,360:450" -> [(480, 800), (360, 450)] (tinggi piksel, bitrate kbps), terbesar dulu."""
+    renditions = []
+    for part in (value or '').split(','):
+        if part.strip():
+            height, kbps = part.split(':')
+            renditions.append((int(height), int(kbps)))
+    return sorted(renditions, reverse=True)
+
+
+def probe(path):
+    """Ukuran & durasi video lewat OpenCV (tanpa ffprobe)."""
+    import cv2
+
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise ValueError('Video tidak dapat dibuka')
+    try:
+        fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+        frames = capture.get(cv2.CAP_PROP_FRAME_COUNT) or 0
+        return {
+            'width': int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'duration': frames / fps if frames else 0.0,
+        }
+    finally:
+        capture.release()
+
+
+def _even(value):
+    return max(2, int(value) // 2 * 2)
+
+
+def transcode(source, out_dir, stem, ffmpeg='ffmpeg', max_height=720, crf=26, preset='medium',
+              renditions=(), webm=True, keep_audio=False, poster_at=0.5, timeout=900):
+    """Ubah satu upload menjadi video siap web dengan satu proses ffmpeg (decode sekali).
+
+    Hasil di `out_dir/stem/`:
+    - stem.mp4: H.264 (CRF, tinggi maks `max_height`), moov atom di depan
+      (+faststart) sehingga bisa diputar sebelum selesai diunduh
+    - stem.webm: VP9 dengan tinggi yang sama (jika `webm`)
+    - stem_<tinggi>p.mp4: rendition H.264 bitrate rendah, hanya yang lebih kecil dari stem.mp4
+    - stem.jpg: poster dari detik ke-`poster_at`
+
+    Ditulis ke folder sementara lalu di-rename, jadi folder akhir selalu
+    lengkap. Mengembalikan {'renditions': [...], 'poster': nama_file, ...}.
+    """
+    info = probe(source)
+    source_bytes = os.path.getsize(source)
+    main_height = _even(min(max_height, info['height'] or max_height))
+    audio = ['-map', '0:a:0?'] if keep_audio else ['-an']
+
+    outputs = []
+    args = [ffmpeg, '-hide_banner', '-loglevel', 'error', '-nostdin', '-y', '-i', source]
+
+    def video_output(filename, height, codec_args, mime='video/mp4'):
+        args.extend(['-map', '0:v:0', *audio, '-vf', f'scale=-2:{height}', '-pix_fmt', 'yuv420p', *codec_args,
+                     os.path.join(staging, filename)])
+        outputs.append({'file': filename, 'type': mime, 'height': height})
+
+    h264 = ['-c:v', 'libx264', '-preset', preset, '-profile:v', 'main', '-movflags', '+faststart']
+    aac = ['-c:a', 'aac', '-b:a', '96k'] if keep_audio else []
+
+    staging = os.path.join(out_dir, f'.{stem}.partial')
+    final = os.path.join(out_dir, stem)
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    try:
+        if webm:
+            video_output(f'{stem}.webm', main_height,
+                         ['-c:v', 'libvpx-vp9', '-crf', str(crf + 7), '-b:v', '0', '-deadline', 'good',
+                          '-cpu-used', '4', '-row-mt', '1', *(['-c:a', 'libopus', '-b:a', '64k'] if keep_audio else [])],
+                         mime='video/webm')
+        video_output(f'{stem}.mp4', main_height, [*h264, '-crf', str(crf), *aac])
+        for height, kbps in renditions:
+            if height < main_height:
+                height = _even(height)
+                video_output(f'{stem}_{height}p.mp4', height,
+                             [*h264, '-b:v', f'{kbps}k', '-maxrate', f'{int(kbps * 1.5)}k',
+                              '-bufsize', f'{kbps * 2}k', *aac])
+
+        poster = f'{stem}.jpg'
+        seek = min(poster_at, info['duration'] / 2) if info['duration'] else 0
+        args.extend(['-map', '0:v:0', '-ss', f'{seek:.3f}', '-frames:v', '1', '-vf', f'scale=-2:{main_height}',
+                     '-q:v', '4', os.path.join(staging, poster)])
+
+        started = time.perf_counter()
+        completed = subprocess.run(args, capture_output=True, text=True, timeout=timeout)
+        if completed.returncode != 0:
+            raise RuntimeError(f'ffmpeg gagal ({completed.returncode}): {completed.stderr.strip()[-500:]}')
+
+        for output in outputs:
+            size = os.path.getsize(os.path.join(staging, output['file']))
+            output['bytes'] = size
+            output['kbps'] = round(size * 8 / 1000.0 / info['duration']) if info['duration'] else None
+
+        shutil.rmtree(final, ignore_errors=True)
+        os.replace(staging, final)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    return {
+        'renditions': outputs,
+        'poster': poster,
+        'source_bytes': source_bytes,
+        'duration': round(info['duration'], 3),
+        'seconds': round(time.perf_counter() - started, 2),
+    }
+
+
+class VideoIngestor:
+    """Transcode video kosa kata di background thread setelah upload.
+
+    Route create/update menyimpan file asli seperti biasa (langsung bisa
+    diputar), mengisi `video_status = processing`, lalu memanggil
+    `submit()` setelah commit. Setelah selesai, semua baris KosaKata yang
+    memakai file itu menunjuk ke MP4 faststart dan `video_renditions` /
+    `video_poster_path` terisi; file asli dihapus. Jika video diganti/dihapus
+    selama proses, hasilnya dibuang.
+    Tanpa ffmpeg (atau VIDEO_TRANSCODE=false) video disajikan apa adanya.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.enabled = False
+        self.options = {}
+        self._executor = None
+        self._lock = threading.Lock()
+        self.processed = 0
+        self.failed = 0
+
+    def init_app(self, app):
+        config = app.config
+        self.app = app
+        ffmpeg = shutil.which(config['FFMPEG_BIN'])
+        self.enabled = bool(config['VIDEO_TRANSCODE'] and ffmpeg)
+        if config['VIDEO_TRANSCODE'] and not ffmpeg:
+            app.logger.warning('ffmpeg (%s) tidak ditemukan; video kosa kata disajikan tanpa transcoding',
+                               config['FFMPEG_BIN'])
+        self.options = {
+            'ffmpeg': ffmpeg,
+            'max_height': config['VIDEO_MAX_HEIGHT'],
+            'crf': config['VIDEO_CRF'],
+            'preset': config['VIDEO_PRESET'],
+            'renditions': parse_renditions(config['VIDEO_RENDITIONS']),
+            'webm': config['VIDEO_WEBM'],
+            'keep_audio': config['VIDEO_KEEP_AUDIO'],
+            'poster_at': config['VIDEO_POSTER_AT'],
+            'timeout': config['VIDEO_TRANSCODE_TIMEOUT'],
+        }
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=max(1, config['VIDEO_INGEST_CONCURRENCY']),
+                                                    thread_name_prefix='video-ingest')
+
+    def initial_status(self):
+        """Nilai video_status untuk video yang baru diupload."""
+        return PROCESSING if self.enabled else None
+
+    def submit(self, item_id, video_url):
+        """Jadwalkan transcoding (panggil setelah commit). False jika transcoding nonaktif."""
+        if not self.enabled:
+            return False
+        self._executor.submit(self._run_in_context, item_id, video_url)
+        return True
+
+    def _run_in_context(self, item_id, video_url):
+        with self.app.app_context():
+            try:
+                self.process(item_id, video_url)
+            except Exception as e:
+                self.app.logger.exception('Ingest video kosa kata %s gagal: %s', item_id, e)
+
+    def process(self, item_id, video_url):
+        """Transcode sekarang (di thread ini). Butuh app context. Mengembalikan status akhir."""
+        from app.services.media_store import media_store
+
+        rel = media_store.relpath(video_url)
+        source = media_store.disk_path(rel) if rel else video_url
+        stem = os.path.splitext(os.path.basename(source))[0]
+        out_dir = os.path.dirname(source)
+
+        try:
+            result = transcode(source, out_dir, stem, **self.options)
+        except Exception as e:
+            self.failed += 1
+            self.app.logger.warning('Transcoding %s (kosa kata %s) gagal: %s', video_url, item_id, e)
+            self._apply(video_url, {'video_status': FAILED})
+            return FAILED
+
+        prefix = f"{video_url.rsplit('/', 1)[0]}/{stem}"
+        renditions = [
+            {'src': f"{prefix}/{output['file']}", 'type': output['type'], 'height': output['height'],
+             'kbps': output['kbps'], 'bytes': output['bytes']}
+            for output in result['renditions']
+        ]
+        main = next(r for r in renditions if r['src'].endswith(f'/{stem}.mp4'))
+        applied = self._apply(video_url, {
+            'video_file_path': main['src'],
+            'video_poster_path': f"{prefix}/{result['poster']}",
+            'video_renditions': renditions,
+            'video_status': READY,
+        })
+        if not applied:
+            shutil.rmtree(os.path.join(out_dir, stem), ignore_errors=True)
+            return None
+
+        self.processed += 1
+        try:
+            # Upload lain dengan isi sama bisa saja baru saja menunjuk ke file asli ini
+            if not media_store.references(video_url):
+                os.remove(source)
+        except OSError:
+            pass
+        self.app.logger.info('Video %s: %d -> %d byte dalam %.1f s', video_url, result['source_bytes'],
+                             main['bytes'], result['seconds'])
+        return READY
+
+    def _apply(self, video_url, values):
+        """Simpan hasil ke semua baris KosaKata yang masih memakai `video_url`
+        (upload dengan isi sama berbagi satu file, lihat MediaStore)."""
+        from app.extensions import cache, db
+        from app.models.kosa_kata_model import KosaKata
+        from app.services.vocab_cache import vocab_cache
+
+        updated = db.session.execute(
+            db.update(KosaKata).where(KosaKata.video_file_path == video_url).values(**values)
+        ).rowcount
+        if not updated:
+            db.session.rollback()
+            return False
+        db.session.commit()
+        vocab_cache.invalidate()
+        cache.invalidate('kosa_kata')
+        return True
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'processed': self.processed,
+            'failed': self.failed,
+            'renditions': [f'{h}p@{k}k' for h, k in self.options.get('renditions', ())],
+        }
+
+
+video_ingestor = VideoIngestor()
@@ -0,0 +1,238 @@
+import datetime
+import os
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from sqlalchemy import delete, update
+
+from app.extensions import db
+from app.models.transcription_job_model import TranscriptionJob
+
+# Status job transkripsi
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def build_transcript(samples, sample_interval, min_frames=2):
+    """Gabungkan deteksi per-sampel menjadi segmen berurutan.
+
+    `samples` adalah list (timestamp_detik, detection|None) yang sudah urut.
+    Sampel berturut-turut dengan label sama digabung menjadi satu segmen;
+    segmen yang lebih pendek dari `min_frames` sampel dibuang (kedipan).
+    """
+    segments = []
+    current = None
+    for timestamp, detection in samples:
+        label = detection['text'] if detection else None
+        if current and label == current['label']:
+            current['end'] = round(timestamp + sample_interval, 3)
+            current['frames'] += 1
+            current['confidence'] = max(current['confidence'], detection['confidence'])
+            continue
+
+        if current:
+            segments.append(current)
+        current = None
+        if label is not None:
+            current = {
+                'label': label,
+                'start': round(timestamp, 3),
+                'end': round(timestamp + sample_interval, 3),
+                'frames': 1,
+                'confidence': detection['confidence'],
+            }
+    if current:
+        segments.append(current)
+
+    segments = [seg for seg in segments if seg['frames'] >= min_frames]
+
+    # Segmen berlabel sama yang terpisah oleh kedipan pendek digabung lagi
+    merged = []
+    for seg in segments:
+        if merged and merged[-1]['label'] == seg['label']:
+            merged[-1]['end'] = seg['end']
+            merged[-1]['frames'] += seg['frames']
+            merged[-1]['confidence'] = max(merged[-1]['confidence'], seg['confidence'])
+        else:
+            merged.append(seg)
+
+    for seg in merged:
+        seg['confidence'] = round(seg['confidence'], 4)
+    return merged
+
+
+def transcribe_video(path, submit_frame, sample_fps=2.0, max_side=640, max_in_flight=32,
+                     min_frames=2, on_progress=None, frame_timeout=None):
+    """Transkripsi video secara streaming: decode -> sampling -> inferensi -> segmen.
+
+    Frame dibaca satu per satu dengan OpenCV; frame yang tidak disampling hanya
+    di-`grab()` (tanpa decode penuh). Paling banyak `max_in_flight` frame
+    menunggu hasil inferensi sekaligus, sehingga memori tetap terbatas
+    berapa pun panjang videonya. `submit_frame(img)` harus mengembalikan `Future`.
+
+    Jika hasil satu frame belum ada setelah `frame_timeout` detik, TimeoutError
+    di-raise. Saat gagal, frame yang masih menunggu dibatalkan.
+    """
+    import cv2
+
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise ValueError('Video tidak dapat dibuka')
+
+    try:
+        fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+        total_frames = int(capture.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        step = max(1, int(round(fps / sample_fps))) if sample_fps > 0 else 1
+        sample_interval = step / fps
+
+        samples = []
+        pending = deque()
+        index = 0
+
+        def take():
+            timestamp, future = pending.popleft()
+            try:
+                samples.append((timestamp, future.result(timeout=frame_timeout)))
+            except FutureTimeoutError:
+                future.cancel()
+                raise TimeoutError(f'Inferensi frame {timestamp:.2f} s tidak selesai dalam {frame_timeout:g} detik')
+
+        def collect(block):
+            while pending and (block or pending[0][1].done()):
+                take()
+
+        while True:
+            if index % step == 0:
+                ok, frame = capture.read()
+                if not ok:
+                    break
+                height, width = frame.shape[:2]
+                scale = max_side / float(max(height, width)) if max_side else 1.0
+                if scale < 1.0:
+                    frame = cv2.resize(frame, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+                pending.append((index / fps, submit_frame(frame)))
+                if len(pending) >= max_in_flight:
+                    collect(block=False)
+                    if len(pending) >= max_in_flight:
+                        take()
+            else:
+                if not capture.grab():
+                    break
+            index += 1
+            if on_progress and index % 50 == 0:
+                on_progress(index, total_frames)
+
+        collect(block=True)
+        if on_progress:
+            on_progress(index, total_frames)
+    except BaseException:
+        # Frame yang belum diproses tidak perlu diinferensi lagi
+        for _, future in pending:
+            future.cancel()
+        raise
+    finally:
+        capture.release()
+
+    segments = build_transcript(samples, sample_interval, min_frames=min_frames)
+    return {
+        'duration': round(index / fps, 3),
+        'fps': round(fps, 3),
+        'sample_fps': round(fps / step, 3),
+        'sampled_frames': len(samples),
+        'segments': segments,
+        'text': ' '.join(seg['label'] for seg in segments),
+    }
+
+
+def _now():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+class JobManager:
+    """Job transkripsi video dengan eksekusi di background thread proses ini.
+
+    Status job disimpan di tabel `transcription_jobs`, sehingga GET status bisa
+    dilayani worker gunicorn mana pun. Video tetap diproses oleh worker yang
+    menerima upload-nya (file ada di disk worker itu).
+    """
+
+    # Jeda minimum antar penyimpanan progress ke database (detik)
+    PROGRESS_INTERVAL = 1.0
+
+    def __init__(self, app, max_concurrent=2, ttl=3600):
+        self.app = app
+        self._executor = ThreadPoolExecutor(max_workers=max(1, int(max_concurrent)), thread_name_prefix='video-job')
+        self.ttl = float(ttl)
+
+    def submit(self, path, owner_id, submit_frame, **options):
+        """Simpan job baru (commit) lalu jadwalkan di background. Butuh app context."""
+        job = TranscriptionJob(id=uuid.uuid4().hex, owner_id=owner_id, status=QUEUED, progress=0.0, frames_read=0,
+                               options=dict(options), created_at=_now())
+        # Job selesai yang sudah lewat ttl dibuang di transaksi yang sama
+        db.session.execute(delete(TranscriptionJob).where(
+            TranscriptionJob.finished_at < _now() - datetime.timedelta(seconds=self.ttl)))
+        db.session.add(job)
+        db.session.commit()
+        data = job.to_dict()
+        self._executor.submit(self._run_in_context, job.id, path, submit_frame, options)
+        return data
+
+    def get(self, job_id):
+        """Dict status job, atau None jika tidak ada / sudah kedaluwarsa."""
+        job = db.session.get(TranscriptionJob, job_id)
+        if job is None:
+            return None
+        data = job.to_dict()
+        if data['finished_at'] and time.time() - data['finished_at'] > self.ttl:
+            return None
+        return data
+
+    def _run_in_context(self, job_id, path, submit_frame, options):
+        with self.app.app_context():
+            self._run(job_id, path, submit_frame, options)
+
+    def _run(self, job_id, path, submit_frame, options):
+        self._update(job_id, status=RUNNING, started_at=_now())
+        latest = {}
+        saved_at = [0.0]
+
+        def progress(frames_read, total_frames):
+            latest['frames_read'] = frames_read
+            if total_frames:
+                latest['progress'] = round(min(1.0, frames_read / total_frames) * 100.0, 1)
+            if time.monotonic() - saved_at[0] >= self.PROGRESS_INTERVAL:
+                saved_at[0] = time.monotonic()
+                try:
+                    self._update(job_id, **latest)
+                except Exception as e:
+                    # Progress hanya informasi; job tetap jalan
+                    print(f"Progress video job {job_id} tidak tersimpan: {e}")
+
+        try:
+            result = transcribe_video(path, submit_frame, on_progress=progress, **options)
+            self._update(job_id, **dict(latest, result=result, progress=100.0, status=DONE, finished_at=_now()))
+        except Exception as e:
+            print(f"Video job {job_id} gagal: {e}")
+            try:
+                self._update(job_id, **dict(latest, error=str(e), status=FAILED, finished_at=_now()))
+            except Exception as db_error:
+                print(f"Status video job {job_id} tidak tersimpan: {db_error}")
+        finally:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _update(job_id, **values):
+        try:
+            db.session.execute(update(TranscriptionJob).where(TranscriptionJob.id == job_id).values(**values))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
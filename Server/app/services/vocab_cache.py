@@ -0,0 +1,102 @@
+import threading
+import time
+
+from sqlalchemy.orm import joinedload
+
+from app.models.kosa_kata_model import KosaKata
+from app.services.vocab_index import VocabularyIndex, normalize
+
+
+class VocabularyCache:
+    """Index in-memory: label (huruf kecil) -> payload `KosaKata.to_detail_dict()`.
+
+    Kosa kata jarang berubah, sedangkan endpoint prediksi mencocokkan label
+    beberapa kali per detik per user. Index dibangun dengan satu query (admin
+    ikut di-join), lalu dipakai tanpa SQL sampai di-invalidate oleh handler
+    create/update/delete kosa kata. TTL menjaga proses lain (worker gunicorn
+    lain) tetap mendapat perubahan meskipun tidak menerima invalidasi langsung.
+
+    Index pencarian (awalan & fuzzy) dibangun bersamaan dari data yang sama.
+    """
+
+    def __init__(self, ttl=300):
+        self.ttl = float(ttl)
+        self._lock = threading.Lock()
+        # (by_text, index, loaded_at) diganti sekaligus; None = perlu dibangun ulang.
+        # Pembaca mengambil satu snapshot sehingga invalidate() dari thread lain
+        # tidak bisa mengosongkannya di tengah jalan.
+        self._state = None
+        self.loads = 0
+        self.build_ms = None
+        self.hits = 0
+        self.misses = 0
+
+    def init_app(self, app):
+        self.ttl = float(app.config['VOCAB_CACHE_TTL'])
+
+    @staticmethod
+    def normalize(text):
+        return normalize(text)
+
+    def _is_fresh(self, state):
+        return state is not None and (self.ttl <= 0 or time.monotonic() - state[2] < self.ttl)
+
+    def _ensure_loaded(self):
+        """Snapshot (by_text, index, loaded_at) yang masih berlaku."""
+        state = self._state
+        if self._is_fresh(state):
+            return state
+        with self._lock:
+            state = self._state
+            if not self._is_fresh(state):
+                started = time.perf_counter()
+                items = KosaKata.query.options(joinedload(KosaKata.added_by_admin)).all()
+                details = [item.to_detail_dict() for item in items]
+                by_text = {self.normalize(detail['text']): detail for detail in details}
+                state = (by_text, VocabularyIndex(details), time.monotonic())
+                self._state = state
+                self.build_ms = round((time.perf_counter() - started) * 1000.0, 2)
+                self.loads += 1
+            return state
+
+    def warm(self):
+        """Bangun index sekarang (dipanggil saat warmup). Mengembalikan jumlah kosa kata."""
+        self.invalidate()
+        return len(self._ensure_loaded()[0])
+
+    def get(self, label):
+        """Detail KosaKata untuk label (tidak peka huruf besar/kecil), atau None."""
+        detail = self._ensure_loaded()[0].get(self.normalize(label))
+        if detail is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return detail
+
+    def entries(self):
+        """Snapshot index {teks ternormalisasi: detail}; jangan diubah oleh pemanggil."""
+        return self._ensure_loaded()[0]
+
+    def search(self, query, category=None, limit=10, max_distance=None):
+        """Pencarian awalan/fuzzy; lihat `VocabularyIndex.search`."""
+        return self._ensure_loaded()[1].search(query, category=category, limit=limit, max_distance=max_distance)
+
+    def invalidate(self):
+        """Tandai index kedaluwarsa; dibangun ulang pada pemakaian berikutnya."""
+        with self._lock:
+            self._state = None
+
+    def stats(self):
+        state = self._state
+        return {
+            'entries': len(state[0]) if state is not None else 0,
+            'loaded': state is not None,
+            'loads': self.loads,
+            'build_ms': self.build_ms,
+            'hits': self.hits,
+            'misses': self.misses,
+            'ttl': self.ttl,
+        }
+
+
+vocab_cache = VocabularyCache()
@@ -0,0 +1,161 @@
+import bisect
+from collections import defaultdict
+
+# Urutan peringkat jenis kecocokan (kecil = lebih relevan)
+EXACT = 'exact'
+PREFIX = 'prefix'
+WORD_PREFIX = 'word_prefix'
+FUZZY = 'fuzzy'
+_RANK = {EXACT: 0, PREFIX: 1, WORD_PREFIX: 2, FUZZY: 3}
+
+
+def normalize(text):
+    return ' '.join((text or '').lower().split())
+
+
+def trigrams(text):
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def default_distance(query):
+    """Toleransi typo bawaan: kata pendek harus persis, kata panjang boleh 2 salah ketik."""
+    if len(query) < 3:
+        return 0
+    return 1 if len(query) <= 5 else 2
+
+
+def prefix_distance(query, text, max_distance):
+    """Jarak Levenshtein terkecil antara `query` dan awalan mana pun dari `text`.
+
+    Teks itu sendiri juga termasuk awalannya, jadi kata yang sama persis
+    bernilai 0 dan "selamt" berjarak 1 dari "selamat pagi" (typeahead).
+    Hasil dibatasi `max_distance + 1`; awalan yang lebih panjang dari
+    `len(query) + max_distance` tidak mungkin lolos sehingga tidak dihitung.
+    """
+    limit = max_distance + 1
+    m = len(query)
+    previous = list(range(m + 1))
+    best = previous[m]
+    for i, char in enumerate(text[:m + max_distance], 1):
+        current = [i] * (m + 1)
+        row_min = i
+        left = i
+        for j in range(1, m + 1):
+            # min() builtin terlalu mahal di loop terdalam; bandingkan manual
+            value = previous[j - 1] + (query[j - 1] != char)
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if left + 1 < value:
+                value = left + 1
+            current[j] = left = value
+            if value < row_min:
+                row_min = value
+        if current[m] < best:
+            best = current[m]
+        previous = current
+        if row_min >= limit:
+            # Baris berikutnya tidak mungkin lebih kecil dari minimum baris ini
+            break
+    return min(best, limit)
+
+
+class VocabularyIndex:
+    """Index pencarian kosa kata in-memory: awalan, awalan per kata, dan fuzzy (edit distance).
+
+    - Awalan: bisect pada daftar teks yang sudah diurutkan, O(log n + hasil).
+    - Awalan per kata: sama, pada daftar kata di dalam frasa ("pagi" -> "selamat pagi").
+    - Fuzzy: kandidat dipilih lewat trigram yang sama (q-gram filter), baru
+      dihitung edit distance-nya, sehingga tidak perlu membandingkan semua kosa kata.
+
+    Index bersifat immutable; dibangun ulang utuh setiap kali kosa kata berubah.
+    """
+
+    def __init__(self, items):
+        self._entries = []
+        for item in items:
+            key = normalize(item.get('text'))
+            if key:
+                self._entries.append((key, item))
+
+        self._keys = sorted((key, idx) for idx, (key, _) in enumerate(self._entries))
+        self._words = sorted(
+            (word, idx)
+            for idx, (key, _) in enumerate(self._entries)
+            for word in set(key.split()[1:])
+        )
+        self._grams = defaultdict(list)
+        for idx, (key, _) in enumerate(self._entries):
+            for gram in trigrams(key):
+                self._grams[gram].append(idx)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _scan_prefix(sorted_pairs, query):
+        start = bisect.bisect_left(sorted_pairs, (query,))
+        for key, idx in sorted_pairs[start:]:
+            if not key.startswith(query):
+                break
+            yield key, idx
+
+    def _fuzzy_candidates(self, query, max_distance):
+        grams = trigrams(query)
+        counts = defaultdict(int)
+        for gram in grams:
+            for idx in self._grams.get(gram, ()):
+                counts[idx] += 1
+        # Satu edit merusak paling banyak 3 trigram; -1 untuk trigram penutup
+        # yang tidak ada saat yang dicocokkan hanya awalan teks. Untuk query
+        # >= 5 huruf minimal 2 trigram harus sama, agar kandidat typeahead
+        # tetap sedikit (sedikit recall dikorbankan untuk typo yang sangat berat).
+        floor = 2 if len(query) >= 5 else 1
+        needed = max(floor, len(grams) - 3 * max_distance - 1)
+        return [idx for idx, count in counts.items() if count >= needed]
+
+    def search(self, query, category=None, limit=10, max_distance=None):
+        """Cari kosa kata untuk `query`, hasil terurut dari yang paling relevan.
+
+        Mengembalikan list (item, jenis_kecocokan, jarak). `category` membatasi
+        hasil ke satu kategori (tidak peka huruf besar/kecil).
+        """
+        query = normalize(query)
+        if not query:
+            return []
+        if max_distance is None:
+            max_distance = default_distance(query)
+        category = category.lower() if category else None
+
+        matches = {}
+
+        def add(idx, kind, distance=0):
+            if category and (self._entries[idx][1].get('category') or '').lower() != category:
+                return
+            previous = matches.get(idx)
+            if previous is None or (_RANK[kind], distance) < (_RANK[previous[0]], previous[1]):
+                matches[idx] = (kind, distance)
+
+        for key, idx in self._scan_prefix(self._keys, query):
+            add(idx, EXACT if key == query else PREFIX)
+        for _, idx in self._scan_prefix(self._words, query):
+            add(idx, WORD_PREFIX)
+
+        # Fuzzy hanya jika hasil belum cukup, dimulai dari toleransi terkecil:
+        # filter trigram untuk jarak 1 jauh lebih ketat daripada untuk jarak 2.
+        for distance in range(1, max_distance + 1):
+            if len(matches) >= limit:
+                break
+            for idx in self._fuzzy_candidates(query, distance):
+                if idx in matches:
+                    continue
+                found = prefix_distance(query, self._entries[idx][0], distance)
+                if found <= distance:
+                    add(idx, FUZZY, found)
+
+        ranked = []
+        for idx, (kind, distance) in matches.items():
+            key, item = self._entries[idx]
+            ranked.append(((_RANK[kind], distance, len(key), key), item, kind, distance))
+        ranked.sort(key=lambda row: row[0])
+        return [(item, kind, distance) for _, item, kind, distance in ranked[:limit]]
@@ -0,0 +1,44 @@
+"""Add transcription_jobs table for video transcription job status
+
+Revision ID: 4b7e19c2f5a8
+Revises: d81b6e3f0a27
+Create Date: 2026-10-19 00:06:52.731044
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b7e19c2f5a8'
+down_revision = 'd81b6e3f0a27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('transcription_jobs',
+    sa.Column('id', sa.String(length=32), nullable=False),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('progress', sa.Float(), nullable=False),
+    sa.Column('frames_read', sa.Integer(), nullable=False),
+    sa.Column('options', sa.JSON(), nullable=True),
+    sa.Column('result', sa.JSON(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('transcription_jobs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_transcription_jobs_finished_at'), ['finished_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_transcription_jobs_owner_id'), ['owner_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('transcription_jobs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_transcription_jobs_owner_id'))
+        batch_op.drop_index(batch_op.f('ix_transcription_jobs_finished_at'))
+
+    op.drop_table('transcription_jobs')
@@ -0,0 +1,30 @@
+"""Add cache_versions table for ETag versioning
+
+Revision ID: 5e2b8c07d9f4
+Revises: a3d9e7c41b25
+Create Date: 2026-10-18 21:48:03.905617
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2b8c07d9f4'
+down_revision = 'a3d9e7c41b25'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Baris per tag dibuat saat invalidasi pertama (lihat http_cache.bump_versions)
+    op.create_table('cache_versions',
+    sa.Column('tag', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.PrimaryKeyConstraint('tag')
+    )
+
+
+def downgrade():
+    op.drop_table('cache_versions')
@@ -0,0 +1,33 @@
+"""Add role_revocations table shared by all workers
+
+Revision ID: 9c4f2a7d1e63
+Revises: 5e2b8c07d9f4
+Create Date: 2026-10-18 23:12:40.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c4f2a7d1e63'
+down_revision = '5e2b8c07d9f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('role_revocations',
+    sa.Column('user_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('revoked_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    with op.batch_alter_table('role_revocations', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_role_revocations_revoked_at'), ['revoked_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('role_revocations', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_role_revocations_revoked_at'))
+
+    op.drop_table('role_revocations')
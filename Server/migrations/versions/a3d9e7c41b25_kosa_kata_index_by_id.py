@@ -0,0 +1,32 @@
+"""Index kosa_kata list by id instead of created_at
+
+Revision ID: a3d9e7c41b25
+Revises: fc1a96014e66
+Create Date: 2026-10-18 21:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3d9e7c41b25'
+down_revision = 'fc1a96014e66'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # List & cursor sekarang diurutkan pada id; primary key sudah cukup untuk
+    # list tanpa filter, filter ?category= butuh (category, id)
+    with op.batch_alter_table('kosa_kata', schema=None) as batch_op:
+        batch_op.drop_index('ix_kosa_kata_category_created_at')
+        batch_op.drop_index('ix_kosa_kata_created_at')
+        batch_op.create_index('ix_kosa_kata_category_id', ['category', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('kosa_kata', schema=None) as batch_op:
+        batch_op.drop_index('ix_kosa_kata_category_id')
+        batch_op.create_index('ix_kosa_kata_created_at', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_kosa_kata_category_created_at', ['category', 'created_at'], unique=False)
@@ -0,0 +1,29 @@
+"""Add updated_at column to kosa_kata
+
+Revision ID: bf59296554f8
+Revises: 622571a63b90
+Create Date: 2026-10-18 15:20:41.508213
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'bf59296554f8'
+down_revision = '622571a63b90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('kosa_kata', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True))
+
+    # Baris lama: anggap terakhir diubah saat dibuat
+    op.execute('UPDATE kosa_kata SET updated_at = created_at')
+
+
+def downgrade():
+    with op.batch_alter_table('kosa_kata', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
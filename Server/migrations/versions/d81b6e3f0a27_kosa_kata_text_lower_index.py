@@ -0,0 +1,25 @@
+"""Index lower(kosa_kata.text) for the ?q= prefix filter
+
+Revision ID: d81b6e3f0a27
+Revises: 9c4f2a7d1e63
+Create Date: 2026-10-18 23:41:09.274615
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd81b6e3f0a27'
+down_revision = '9c4f2a7d1e63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Index ekspresi (MySQL >= 8.0.13, PostgreSQL, SQLite)
+    op.create_index('ix_kosa_kata_text_lower', 'kosa_kata', [sa.func.lower(sa.column('text'))], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_kosa_kata_text_lower', table_name='kosa_kata')
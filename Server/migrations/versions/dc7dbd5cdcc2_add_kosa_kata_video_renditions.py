@@ -0,0 +1,31 @@
+"""Add video transcoding columns to kosa_kata
+
+Revision ID: dc7dbd5cdcc2
+Revises: fc80d374818e
+Create Date: 2026-10-18 17:02:48.120337
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'dc7dbd5cdcc2'
+down_revision = 'fc80d374818e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Video lama tetap NULL (disajikan apa adanya); proses dengan `flask video-ingest`
+    with op.batch_alter_table('kosa_kata', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('video_status', sa.String(length=20), nullable=True))
+        batch_op.add_column(sa.Column('video_poster_path', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('video_renditions', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('kosa_kata', schema=None) as batch_op:
+        batch_op.drop_column('video_renditions')
+        batch_op.drop_column('video_poster_path')
+        batch_op.drop_column('video_status')
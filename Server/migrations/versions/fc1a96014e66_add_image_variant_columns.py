@@ -0,0 +1,33 @@
+"""Add thumbnail variant columns to users and information
+
+Revision ID: fc1a96014e66
+Revises: dc7dbd5cdcc2
+Create Date: 2026-10-18 19:41:06.532118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'fc1a96014e66'
+down_revision = 'dc7dbd5cdcc2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Gambar lama tetap NULL (disajikan apa adanya); proses dengan `flask image-ingest`
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('profile_pic_variants', sa.JSON(), nullable=True))
+
+    with op.batch_alter_table('information', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('image_variants', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('information', schema=None) as batch_op:
+        batch_op.drop_column('image_variants')
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('profile_pic_variants')
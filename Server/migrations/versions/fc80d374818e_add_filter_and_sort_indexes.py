@@ -0,0 +1,88 @@
+"""Add indexes for filter/sort columns and normalized phone number
+
+Revision ID: fc80d374818e
+Revises: bf59296554f8
+Create Date: 2026-10-18 16:05:12.411505
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'fc80d374818e'
+down_revision = 'bf59296554f8'
+branch_labels = None
+depends_on = None
+
+
+def _normalize(value):
+    # Salinan normalize_phone (app/models/user_model.py) saat migration ini dibuat
+    digits = ''.join(ch for ch in (value or '') if ch.isdigit())
+    if not digits:
+        return None
+    if digits.startswith('0'):
+        digits = '62' + digits[1:]
+    elif digits.startswith('8'):
+        digits = '62' + digits
+    return digits[:20]
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('phone_number_normalized', sa.String(length=20), nullable=True))
+
+    # Isi dari phone_number. Nomor yang sama (setelah dinormalisasi) dipakai
+    # lebih dari satu user: hanya user pertama yang diisi agar unique index
+    # bisa dibuat; user lain login dengan email sampai nomornya diperbaiki.
+    conn = op.get_bind()
+    users = sa.table('users', sa.column('id', sa.Integer), sa.column('phone_number', sa.String),
+                     sa.column('phone_number_normalized', sa.String))
+    seen = set()
+    rows = conn.execute(sa.select(users.c.id, users.c.phone_number)
+                        .where(users.c.phone_number.isnot(None)).order_by(users.c.id)).fetchall()
+    for user_id, phone in rows:
+        normalized = _normalize(phone)
+        if normalized is None:
+            continue
+        if normalized in seen:
+            print(f'users.id={user_id}: nomor telepon {phone!r} duplikat, phone_number_normalized dikosongkan')
+            continue
+        seen.add(normalized)
+        conn.execute(users.update().where(users.c.id == user_id).values(phone_number_normalized=normalized))
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_users_phone_number_normalized'), ['phone_number_normalized'], unique=True)
+
+    with op.batch_alter_table('feedback', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_feedback_created_at'), ['created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_feedback_status'), ['status'], unique=False)
+        batch_op.create_index(batch_op.f('ix_feedback_user_id'), ['user_id'], unique=False)
+
+    with op.batch_alter_table('kosa_kata', schema=None) as batch_op:
+        batch_op.create_index('ix_kosa_kata_created_at', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_kosa_kata_category_created_at', ['category', 'created_at'], unique=False)
+
+    with op.batch_alter_table('information', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_information_created_at'), ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('information', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_information_created_at'))
+
+    with op.batch_alter_table('kosa_kata', schema=None) as batch_op:
+        batch_op.drop_index('ix_kosa_kata_category_created_at')
+        batch_op.drop_index('ix_kosa_kata_created_at')
+
+    with op.batch_alter_table('feedback', schema=None) as batch_op:
+        # MySQL memakai index ini untuk foreign key user_id (index otomatisnya
+        # sudah diganti), sehingga tidak boleh di-drop di sana
+        if op.get_bind().dialect.name != 'mysql':
+            batch_op.drop_index(batch_op.f('ix_feedback_user_id'))
+        batch_op.drop_index(batch_op.f('ix_feedback_status'))
+        batch_op.drop_index(batch_op.f('ix_feedback_created_at'))
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_phone_number_normalized'))
+        batch_op.drop_column('phone_number_normalized')
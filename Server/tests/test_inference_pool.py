@@ -0,0 +1,62 @@
+import time
+
+import pytest
+
+from app.services import inference_pool
+from app.services.inference_batcher import InferenceBatcher
+from app.services.inference_pool import InferencePool
+
+
+def _fake_worker(index, options, tasks, results):
+    """Pengganti `_worker_main` tanpa model: frame 'slow' baru dijawab setelah 1 detik."""
+    import os
+    results.put(('ready', index, os.getpid()))
+    while True:
+        item = tasks.get()
+        if item is None:
+            break
+        task_id, images = item
+        if 'slow' in images:
+            time.sleep(1.0)
+        results.put((task_id, True, [f'label-{image}' for image in images]))
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(inference_pool, '_worker_main', _fake_worker)
+    pool = InferencePool(workers=1, backend='fake', model_dir='')
+    deadline = time.monotonic() + 30
+    while not pool.ready and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert pool.ready
+    yield pool
+    pool.close()
+
+
+def _wait_completed(pool, count, timeout=10):
+    deadline = time.monotonic() + timeout
+    while pool.completed < count and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert pool.completed >= count
+
+
+def test_late_answer_after_batch_timeout_keeps_pool_working(pool):
+    batcher = InferenceBatcher(submit_batch=pool.submit, max_batch_size=1, max_wait_ms=0,
+                               max_in_flight=2, batch_timeout=0.2)
+
+    with pytest.raises(TimeoutError):
+        batcher.submit('slow').result(timeout=5)
+
+    # Worker menjawab batch yang sudah kena timeout
+    _wait_completed(pool, 1)
+    assert pool._dispatcher.is_alive()
+
+    assert batcher.submit('fast').result(timeout=5) == 'label-fast'
+
+
+def test_late_answer_for_cancelled_future_is_ignored(pool):
+    pool.submit(['slow']).cancel()
+    _wait_completed(pool, 1)
+    assert pool._dispatcher.is_alive()
+
+    assert pool.submit(['fast']).result(timeout=5) == ['label-fast']
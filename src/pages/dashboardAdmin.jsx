@@ -60,37 +60,16 @@ const DashboardAdmin = () => {
                     'Authorization': `Bearer ${token}`
                 };
 
-                // Fetch Users
-                const usersResponse = await fetch(`${API_BASE_URL}/users/`, { method: 'GET', headers });
-                if (usersResponse.ok) {
-                    const usersData = await usersResponse.json();
-                    const onlyUsers = usersData.filter(u => (u.role || '').toLowerCase() === 'user');
-                    const onlyAdmins = usersData.filter(u => (u.role || '').toLowerCase() === 'admin');
-                    
-                    setUsersCount(onlyUsers.length);
-                    setAdminsCount(onlyAdmins.length);
-                }
-
-                // Fetch Vocab
-                const vocabResponse = await fetch(`${API_BASE_URL}/kosa-kata/`, { method: 'GET', headers });
-                if (vocabResponse.ok) {
-                    const vocabData = await vocabResponse.json();
-                    setVocabCount(vocabData.length);
-                }
-
-                // Fetch Feedback
-                const feedbackResponse = await fetch(`${API_BASE_URL}/feedback/`, { method: 'GET', headers });
-                if (feedbackResponse.ok) {
-                    const feedbackData = await feedbackResponse.json();
-                    setFeedbackCount(feedbackData.length);
-                    setRecentFeedbacks(feedbackData.slice(0, 5));
-                }
-
-                // --- FETCH INFO COUNT (BARU) ---
-                const infoResponse = await fetch(`${API_BASE_URL}/information/`, { method: 'GET', headers });
-                if (infoResponse.ok) {
-                    const infoData = await infoResponse.json();
-                    setInfoCount(infoData.length);
+                // Semua angka ringkasan diambil sekaligus dari /api/stats (dihitung di server)
+                const statsResponse = await fetch(`${API_BASE_URL}/stats/`, { method: 'GET', headers });
+                if (statsResponse.ok) {
+                    const stats = await statsResponse.json();
+                    setUsersCount(stats.users.by_role.User || 0);
+                    setAdminsCount(stats.users.by_role.Admin || 0);
+                    setVocabCount(stats.kosa_kata.total);
+                    setFeedbackCount(stats.feedback.total);
+                    setRecentFeedbacks(stats.feedback.recent);
+                    setInfoCount(stats.information.total);
                 }
 
             } catch (err) {
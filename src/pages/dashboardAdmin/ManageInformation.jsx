@@ -4,6 +4,34 @@ import { FaPlus, FaTrash, FaEdit } from 'react-icons/fa'; // Tambah FaEdit
 import SearchInput from './SearchInput';
 
 const API_BASE_URL = 'http://localhost:8080/api';
+const MEDIA_BASE_URL = 'http://localhost:8080';
+
+// Varian terkecil yang masih tajam di lebar tampilan (x2 untuk layar retina):
+// JPEG sebagai <img>, AVIF/WebP dengan ukuran sama sebagai <source> (file terkecil dulu).
+// Gambar yang belum selesai diproses hanya punya image_url.
+function pickImageSources(info, displayWidth) {
+    const variants = info.image_variants || [];
+    if (variants.length === 0) return { src: info.image_url, sources: [] };
+
+    const widths = [...new Set(variants.map((v) => v.width))].sort((a, b) => a - b);
+    const width = widths.find((w) => w >= displayWidth * 2) || widths[widths.length - 1];
+    const atWidth = variants.filter((v) => v.width === width);
+    const fallback = atWidth.find((v) => v.type === 'image/jpeg') || atWidth[0];
+    const sources = atWidth.filter((v) => v !== fallback && v.bytes < fallback.bytes).sort((a, b) => a.bytes - b.bytes);
+    return { src: fallback.src, sources };
+}
+
+function InfoThumbnail({ info }) {
+    const { src, sources } = pickImageSources(info, 80);
+    return (
+        <picture>
+            {sources.map((source) => (
+                <source key={source.src} srcSet={`${MEDIA_BASE_URL}${source.src}`} type={source.type} />
+            ))}
+            <Image src={`${MEDIA_BASE_URL}${src}`} thumbnail loading="lazy" style={{width:'80px', height:'60px', objectFit:'cover'}} />
+        </picture>
+    );
+}
 
 const ManageInformation = memo(({ searchTerm, setSearchTerm }) => {
     const [infos, setInfos] = useState([]);
@@ -147,9 +175,7 @@ const ManageInformation = memo(({ searchTerm, setSearchTerm }) => {
                             <tr key={info.id}>
                                 <td>{index + 1}</td>
                                 <td>
-                                    {info.image_url ? (
-                                        <Image src={`http://localhost:8080${info.image_url}`} thumbnail style={{width:'80px', height:'60px', objectFit:'cover'}} />
-                                    ) : '-'}
+                                    {info.image_url ? <InfoThumbnail info={info} /> : '-'}
                                 </td>
                                 <td>
                                     <strong>{info.title}</strong><br/>
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import Navbar from '../components/navbar';
 import Footer from '../components/footer';
@@ -7,53 +7,86 @@ import { FaPlayCircle, FaFileUpload, FaKeyboard } from 'react-icons/fa';
 import './css/text-to-video.css';
 
 const API_BASE_URL = 'http://localhost:8080/api';
+const MEDIA_BASE_URL = 'http://localhost:8080';
+
+// Koneksi lambat / hemat data memakai rendition kecil (maks 360p)
+function preferredMaxHeight() {
+    const connection = navigator.connection;
+    if (connection && (connection.saveData || /2g|3g/.test(connection.effectiveType || ''))) return 360;
+    return 720;
+}
+
+// Rendition dengan resolusi tertinggi yang tidak melebihi tinggi maksimal; jika ada
+// WebM dan MP4 di resolusi itu, file terkecil dicoba dulu (browser memilih <source>
+// pertama yang bisa diputar). Video yang belum selesai ditranscode hanya punya video_file_path.
+function pickSources(entry) {
+    const renditions = entry.video_renditions || [];
+    if (renditions.length === 0) return [{ src: entry.video_file_path, type: 'video/mp4' }];
+
+    const maxHeight = preferredMaxHeight();
+    const fitting = renditions.filter((r) => r.height <= maxHeight);
+    const pool = fitting.length > 0 ? fitting : renditions;
+    const height = fitting.length > 0
+        ? Math.max(...pool.map((r) => r.height))
+        : Math.min(...pool.map((r) => r.height));
+    const sources = pool.filter((r) => r.height === height).sort((a, b) => a.bytes - b.bytes);
+    // MP4 utama sebagai cadangan terakhir untuk browser yang tidak bisa memutar sumber di atas
+    const fallback = renditions.find((r) => r.src === entry.video_file_path);
+    if (fallback && !sources.includes(fallback)) sources.push(fallback);
+    return sources;
+}
 
 function TextToVideo() {
     const [showModal, setShowModal] = useState(true); // Tampilkan modal di awal
     const [inputText, setInputText] = useState('');
-    const [videoSrc, setVideoSrc] = useState(null);
+    const [playlist, setPlaylist] = useState([]);
+    const [currentIndex, setCurrentIndex] = useState(0);
     const [isLoading, setIsLoading] = useState(false);
-    const [vocabs, setVocabs] = useState([]);
     const [showNotFoundModal, setShowNotFoundModal] = useState(false);
     const [notFoundText, setNotFoundText] = useState('');
     const navigate = useNavigate();
 
-    // Fetch kosakata dari API saat komponen mount
-    useEffect(() => {
-        const fetchVocabs = async () => {
-            try {
-                const response = await fetch(`${API_BASE_URL}/kosa-kata/`);
-                if (response.ok) {
-                    const data = await response.json();
-                    setVocabs(data);
-                }
-            } catch (error) {
-                console.error('Error fetching vocabs:', error);
-            }
-        };
-        fetchVocabs();
-    }, []);
+    const currentVideo = playlist[currentIndex];
+    const videoSources = currentVideo ? pickSources(currentVideo) : [];
+    const videoSrc = videoSources.length > 0 ? `${MEDIA_BASE_URL}${videoSources[0].src}` : null;
 
-    const handleTextSubmit = (e) => {
+    // Satu request per kalimat: server mengembalikan urutan video (frasa, kata, atau ejaan huruf)
+    const handleTextSubmit = async (e) => {
         e.preventDefault();
-        const trimmedText = inputText.trim().toLowerCase();
+        const trimmedText = inputText.trim();
         if (!trimmedText) return;
 
         setShowModal(false);
         setIsLoading(true);
 
-        // Cari kosakata yang cocok
-        const matchedVocab = vocabs.find(vocab => vocab.text.toLowerCase() === trimmedText);
+        try {
+            const response = await fetch(`${API_BASE_URL}/kosa-kata/translate`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ text: trimmedText }),
+            });
+            const data = await response.json();
+            if (!response.ok) throw new Error(data.error);
 
-        setTimeout(() => {
-            if (matchedVocab) {
-                setVideoSrc(`http://localhost:8080${matchedVocab.video_file_path}`);
-            } else {
-                setNotFoundText(inputText);
+            setPlaylist(data.playlist);
+            setCurrentIndex(0);
+            if (data.fingerspelled.length > 0) {
+                setNotFoundText(data.fingerspelled.join(', '));
                 setShowNotFoundModal(true);
             }
+        } catch (error) {
+            console.error('Error translating text:', error);
+            setPlaylist([]);
+            setNotFoundText(inputText);
+            setShowNotFoundModal(true);
+        } finally {
             setIsLoading(false);
-        }, 2000);
+        }
+    };
+
+    // Putar video berikutnya; kembali ke awal setelah video terakhir
+    const handleVideoEnded = () => {
+        setCurrentIndex((index) => (playlist.length > 0 ? (index + 1) % playlist.length : 0));
     };
 
     const handleReport = () => {
@@ -82,10 +115,27 @@ function TextToVideo() {
                                             </div>
                                         ) : videoSrc ? (
                                             <div className="video-wrapper">
-                                                <video controls autoPlay loop muted className="translated-video">
-                                                    <source src={videoSrc} type="video/mp4" />
+                                                <video
+                                                    key={`${currentIndex}-${videoSrc}`}
+                                                    controls
+                                                    autoPlay
+                                                    muted
+                                                    loop={playlist.length === 1}
+                                                    onEnded={handleVideoEnded}
+                                                    poster={currentVideo.video_poster_path ? `${MEDIA_BASE_URL}${currentVideo.video_poster_path}` : undefined}
+                                                    className="translated-video"
+                                                >
+                                                    {videoSources.map((source) => (
+                                                        <source key={source.src} src={`${MEDIA_BASE_URL}${source.src}`} type={source.type} />
+                                                    ))}
                                                     Browser Anda tidak mendukung tag video.
                                                 </video>
+                                                <p className="mt-2 text-muted">
+                                                    {currentVideo.type === 'letter'
+                                                        ? `${currentVideo.source} (huruf ${currentVideo.text})`
+                                                        : currentVideo.text}
+                                                    {' '}({currentIndex + 1}/{playlist.length})
+                                                </p>
                                             </div>
                                         ) : (
                                             <div className="video-placeholder">
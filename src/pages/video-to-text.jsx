@@ -4,13 +4,13 @@ import Footer from '../components/footer';
 import { Container, Row, Col, Card, Button, Badge } from 'react-bootstrap';
 import { FaVideo, FaStop } from 'react-icons/fa';
 import Webcam from 'react-webcam';
-import axios from 'axios';
 import './css/video-to-text.css';
 
 function VideoToText() {
     const [isCameraOpen, setIsCameraOpen] = useState(false);
     const [translation, setTranslation] = useState('');
     const [dbResult, setDbResult] = useState(null); 
+    const [sentence, setSentence] = useState('');
     const [isProcessing, setIsProcessing] = useState(false);
     
     const webcamRef = useRef(null);
@@ -21,65 +21,81 @@ function VideoToText() {
         facingMode: "user"
     };
 
-    const dataURItoBlob = (dataURI) => {
-        const byteString = atob(dataURI.split(',')[1]);
-        const mimeString = dataURI.split(',')[0].split(':')[1].split(';')[0];
-        const ab = new ArrayBuffer(byteString.length);
-        const ia = new Uint8Array(ab);
-        for (let i = 0; i < byteString.length; i++) {
-            ia[i] = byteString.charCodeAt(i);
-        }
-        return new Blob([ab], { type: mimeString });
-    };
+    const socketRef = useRef(null);
+
+    // Buka satu koneksi WebSocket selama kamera aktif.
+    // Frame dikirim sebagai JPEG biner, hasil prediksi datang sebagai JSON.
+    useEffect(() => {
+        if (!isCameraOpen) return undefined;
+
+        // Ganti port 8080 sesuai konfigurasi docker-compose Anda
+        const socket = new WebSocket('ws://localhost:8080/api/ai/stream');
+        socket.binaryType = 'arraybuffer';
+        socketRef.current = socket;
 
-    const captureAndPredict = useCallback(async () => {
-        if (!webcamRef.current || isProcessing) return;
+        socket.onmessage = (event) => {
+            setIsProcessing(false);
+            try {
+                const { text, found_in_db, db_detail, sentence: assembled, error } = JSON.parse(event.data);
+                if (error) {
+                    console.error("Error predicting sign:", error);
+                    return;
+                }
+                if (assembled !== undefined) {
+                    setSentence(assembled);
+                }
+                if (text) {
+                    setTranslation(text);
+                    if (found_in_db && db_detail) {
+                        setDbResult(db_detail);
+                    }
+                }
+            } catch (error) {
+                console.error("Error parsing prediction:", error);
+            }
+        };
+        socket.onerror = (error) => console.error("WebSocket error:", error);
 
-        const imageSrc = webcamRef.current.getScreenshot();
-        if (!imageSrc) return;
+        return () => {
+            socketRef.current = null;
+            socket.close();
+        };
+    }, [isCameraOpen]);
 
-        try {
-            setIsProcessing(true);
-            const blob = dataURItoBlob(imageSrc);
-            const formData = new FormData();
-            formData.append('image', blob, 'capture.jpg');
+    const captureAndSend = useCallback(() => {
+        const socket = socketRef.current;
+        if (!webcamRef.current || !socket || socket.readyState !== WebSocket.OPEN) return;
 
-            // Ganti port 8080 sesuai konfigurasi docker-compose Anda
-            const response = await axios.post('http://localhost:8080/api/ai/predict', formData, {
-                headers: { 'Content-Type': 'multipart/form-data' },
-            });
+        // Jangan menumpuk frame di buffer kirim jika jaringan lambat
+        if (socket.bufferedAmount > 0) return;
 
-            const { text, found_in_db, db_detail } = response.data;
+        const canvas = webcamRef.current.getCanvas();
+        if (!canvas) return;
 
-            if (text) {
-                setTranslation(text);
-                if (found_in_db && db_detail) {
-                    setDbResult(db_detail);
-                }
-            } 
-            
-        } catch (error) {
-            console.error("Error predicting sign:", error);
-        } finally {
-            setIsProcessing(false);
-        }
-    }, [webcamRef, isProcessing]);
+        canvas.toBlob((blob) => {
+            if (blob && socket.readyState === WebSocket.OPEN) {
+                setIsProcessing(true);
+                socket.send(blob);
+            }
+        }, 'image/jpeg', 0.8);
+    }, [webcamRef]);
 
     useEffect(() => {
         let intervalId;
         if (isCameraOpen) {
             intervalId = setInterval(() => {
-                captureAndPredict();
+                captureAndSend();
             }, 500); // Interval prediksi (ms)
         }
         return () => clearInterval(intervalId);
-    }, [isCameraOpen, captureAndPredict]);
+    }, [isCameraOpen, captureAndSend]);
 
     const toggleCamera = () => {
         if (isCameraOpen) {
             setIsCameraOpen(false);
             setTranslation('');
             setDbResult(null);
+            setSentence('');
         } else {
             setIsCameraOpen(true);
         }
@@ -157,6 +173,9 @@ function VideoToText() {
                                                     <p className="text-muted mt-3 mb-0">
                                                         {translation ? "Gerakan terdeteksi" : "Menunggu gerakan..."}
                                                     </p>
+                                                    {sentence && (
+                                                        <p className="fs-5 mt-3 mb-0 text-dark">{sentence}</p>
+                                                    )}
                                                 </div>
                                             </Card>
                                         </div>